@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Generation Throughput Benchmarks for Setwise
+
+Builds synthetic question banks in every supported format and measures:
+- QuestionFormatConverter.load_questions
+- QuestionManager.validate_questions_file
+- QuizGenerator.generate_quiz_set
+- end-to-end QuizGenerator.generate_quizzes without PDF compilation
+
+Results are written as JSON so later runs can be compared against them:
+
+    python benchmarks/bench_generation.py
+    python benchmarks/bench_generation.py --sizes 100 10000 --compare benchmarks/results/<old>.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+import setwise  # noqa: E402
+from setwise.formats import QuestionFormatConverter  # noqa: E402
+from setwise.question_manager import QuestionManager  # noqa: E402
+from setwise.quiz_generator import QuizGenerator  # noqa: E402
+
+TEMPLATE_DIR = REPO_ROOT / "setwise" / "templates"
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+DEFAULT_SIZES = [100, 10000, 100000]
+FORMATS = {
+    'python': '.py',
+    'yaml': '.yaml',
+    'json': '.json',
+    'csv': '.csv',
+    'markdown': '.md',
+}
+
+
+def make_question_bank(size: int, seed: int = 0):
+    """Create a synthetic bank with `size` questions, 80% MCQ and 20% subjective."""
+    rng = random.Random(seed)
+    num_mcq = size * 4 // 5
+    mcq = []
+    for i in range(num_mcq):
+        a, b = rng.randint(2, 99), rng.randint(2, 99)
+        options = [str(a + b + delta) for delta in (0, 1, -1, 2)]
+        mcq.append({
+            "question": rf"Question {i}: what is $\frac{{{a}}}{{1}} + {b}$ when $x_{{i}}^{{2}} = 0$?",
+            "options": options,
+            "answer": options[0],
+            "marks": rng.randint(1, 3),
+        })
+
+    subjective = []
+    for i in range(size - num_mcq):
+        subjective.append({
+            "question": rf"Question {i}: derive $\int_{{0}}^{{1}} x^{{{i % 7 + 1}}} \, dx$ and explain each step.",
+            "answer": rf"The result is $\frac{{1}}{{{i % 7 + 2}}}$.",
+            "marks": 5,
+        })
+
+    return mcq, subjective
+
+
+def render_markdown_bank(mcq: List[Dict[str, Any]], subjective: List[Dict[str, Any]]) -> str:
+    """Render a bank in the layout MarkdownQuestionParser reads ('## MCQ', '## Subjective')."""
+    lines = ["# Quiz Questions\n\n## MCQ\n\n"]
+    for q in mcq:
+        options = "".join(f"- {option}\n" for option in q['options'])
+        lines.append(f"**{q['question']}**\n{options}*Answer:* {q['answer']}\n\n")
+    lines.append("## Subjective\n\n")
+    for q in subjective:
+        lines.append(f"**{q['question']}**\n{q['answer']}\n\n")
+    return "".join(lines)
+
+
+def write_bank(mcq: List[Dict[str, Any]], subjective: List[Dict[str, Any]], path: Path, fmt: str) -> bool:
+    """Write a synthetic bank in the given format, so that it loads back in full."""
+    if fmt == 'markdown':
+        path.write_text(render_markdown_bank(mcq, subjective), encoding='utf-8')
+        return True
+    return QuestionFormatConverter.save_questions(mcq, subjective, str(path), fmt)
+
+
+def time_call(func: Callable[[], Any], repeat: int) -> float:
+    """Return the best wall-clock time of `repeat` calls, in seconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmarks(sizes: List[int], formats: List[str], repeat: int, sets: int,
+                   template: str, work_dir: Path) -> List[Dict[str, Any]]:
+    """Run every benchmark and return one result record per measurement."""
+    results = []
+
+    def record(benchmark: str, fmt: str, size: int, seconds: Optional[float],
+               items: int, error: Optional[str] = None):
+        entry = {
+            "benchmark": benchmark,
+            "format": fmt,
+            "size": size,
+            "seconds": seconds,
+            "items_per_second": (items / seconds) if seconds else None,
+        }
+        if error:
+            entry["error"] = error
+        results.append(entry)
+        timing = f"{seconds:>9.4f}s" if seconds is not None else f"{'-':>10}"
+        detail = error or f"{entry['items_per_second']:.1f}/s"
+        print(f"  {benchmark:<22}{fmt:<10}{size:>8}  {timing}  {detail}")
+
+    for size in sizes:
+        mcq, subjective = make_question_bank(size)
+        # Large banks are slow to build; fewer repeats keep runs tractable
+        size_repeat = repeat if size <= 10000 else 1
+
+        for fmt in formats:
+            path = work_dir / f"bank_{size}{FORMATS[fmt]}"
+            if not write_bank(mcq, subjective, path, fmt):
+                record("write_bank", fmt, size, None, size, "could not write bank")
+                continue
+
+            try:
+                loaded_mcq, loaded_subjective = QuestionFormatConverter.load_questions(str(path))
+            except Exception as e:
+                record("load_questions", fmt, size, None, size, str(e)[:80])
+                continue
+            if (len(loaded_mcq), len(loaded_subjective)) != (len(mcq), len(subjective)):
+                # Timings of a bank that did not load in full are not comparable
+                record("load_questions", fmt, size, None, size,
+                       f"loaded {len(loaded_mcq)} mcq and {len(loaded_subjective)} subjective, "
+                       f"expected {len(mcq)} and {len(subjective)}")
+                continue
+            seconds = time_call(lambda: QuestionFormatConverter.load_questions(str(path)), size_repeat)
+            record("load_questions", fmt, size, seconds, size)
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                is_valid, message = QuestionManager.validate_questions_file(str(path))
+                seconds = time.perf_counter() - start
+            record("validate_questions", fmt, size, seconds, size, None if is_valid else message[:80])
+
+            output_dir = work_dir / f"output_{size}_{fmt}"
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    generator = QuizGenerator(template_dir=str(TEMPLATE_DIR), output_dir=str(output_dir),
+                                              questions_file=str(path))
+            except Exception as e:
+                record("generate_quiz_set", fmt, size, None, sets, str(e)[:80])
+                record("generate_quizzes", fmt, size, None, sets, str(e)[:80])
+                continue
+
+            random.seed(0)
+            try:
+                start = time.perf_counter()
+                for set_id in range(1, sets + 1):
+                    generator.generate_quiz_set(set_id, num_mcq=20, num_subjective=5, template_name=template)
+                record("generate_quiz_set", fmt, size, time.perf_counter() - start, sets)
+            except Exception as e:
+                record("generate_quiz_set", fmt, size, None, sets, str(e)[:80])
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                ok = generator.generate_quizzes(num_sets=sets, num_mcq=20, num_subjective=5,
+                                                template_name=template, compile_pdf=False, seed=0)
+                seconds = time.perf_counter() - start
+            if ok:
+                record("generate_quizzes", fmt, size, seconds, sets)
+            else:
+                record("generate_quizzes", fmt, size, None, sets, "some quiz sets failed to generate")
+            shutil.rmtree(output_dir, ignore_errors=True)
+
+    return results
+
+
+def git_revision() -> Optional[str]:
+    """Return the current git commit, if available."""
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                                capture_output=True, text=True, check=False)
+        return result.stdout.strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def compare(current: List[Dict[str, Any]], baseline_path: str, threshold: float) -> bool:
+    """Print a comparison against an earlier results file.
+
+    Returns:
+        True if no measurement regressed by more than `threshold`
+    """
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    def key(entry):
+        return entry["benchmark"], entry["format"], entry["size"]
+
+    old = {key(e): e for e in baseline["results"] if e.get("seconds")}
+    print(f"\nComparison against {baseline_path} (rev {baseline.get('git_revision')}):")
+    print(f"  {'benchmark':<22}{'format':<10}{'size':>8}{'old (s)':>11}{'new (s)':>11}{'ratio':>8}")
+
+    ok = True
+    for entry in current:
+        previous = old.get(key(entry))
+        if previous is None or not entry.get("seconds"):
+            continue
+        ratio = entry["seconds"] / previous["seconds"]
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  REGRESSION"
+            ok = False
+        print(f"  {entry['benchmark']:<22}{entry['format']:<10}{entry['size']:>8}"
+              f"{previous['seconds']:>11.4f}{entry['seconds']:>11.4f}{ratio:>8.2f}{flag}")
+    return ok
+
+
+def main():
+    """Command-line entry point for the benchmark suite."""
+    parser = argparse.ArgumentParser(description="Benchmark Setwise question loading and quiz generation")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Question bank sizes to benchmark")
+    parser.add_argument("--formats", nargs="+", choices=list(FORMATS), default=list(FORMATS),
+                        help="Question file formats to benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="Repeats per timing (best is kept)")
+    parser.add_argument("--sets", type=int, default=20, help="Quiz sets per generation benchmark")
+    parser.add_argument("--template", default="minimal", help="Template used for generation")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/bench_<timestamp>.json)")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Relative slowdown reported as a regression when comparing")
+    args = parser.parse_args()
+
+    print(f"Setwise {setwise.__version__} benchmarks on Python {platform.python_version()}")
+    work_dir = Path(tempfile.mkdtemp(prefix="setwise_bench_"))
+    try:
+        results = run_benchmarks(args.sizes, args.formats, args.repeat, args.sets, args.template, work_dir)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_revision": git_revision(),
+        "setwise_version": setwise.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"bench_{datetime.now():%Y%m%d_%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare and not compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
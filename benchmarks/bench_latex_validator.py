@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+LaTeX Validator Benchmarks for Setwise
+
+Times LaTeXValidator.validate_question_dict over synthetic question banks
+and checks the rate against a budget (by default, 10,000 questions within
+a second):
+
+    python benchmarks/bench_latex_validator.py
+    python benchmarks/bench_latex_validator.py --sizes 10000 --repeat 1 --budget 2.0
+"""
+
+import argparse
+import json
+import platform
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+from bench_generation import RESULTS_DIR, git_revision, make_question_bank, time_call
+
+import setwise  # noqa: E402
+from setwise.latex_validator import LaTeXValidator  # noqa: E402
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+
+def validate_bank(questions: List[Dict[str, Any]]) -> None:
+    """Validate every question the way QuestionManager does."""
+    for question in questions:
+        LaTeXValidator.validate_question_dict(question)
+
+
+def run_benchmarks(sizes: List[int], repeat: int) -> List[Dict[str, Any]]:
+    """Time validation of each bank size; return one record per measurement."""
+    results = []
+    print(f"  {'size':>8}{'seconds':>10}{'per 10k (s)':>13}")
+
+    for size in sizes:
+        mcq, subjective = make_question_bank(size)
+        questions = mcq + subjective
+        seconds = time_call(lambda: validate_bank(questions), repeat)
+        per_10k = seconds * 10000 / size
+        results.append({"size": size, "seconds": seconds, "seconds_per_10k": per_10k})
+        print(f"  {size:>8}{seconds:>10.3f}{per_10k:>13.3f}")
+
+    return results
+
+
+def main():
+    """Command-line entry point for the LaTeX validator benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark LaTeX validation of question banks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Question bank sizes to benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="Repeats per timing (best is kept)")
+    parser.add_argument("--budget", type=float, default=1.0,
+                        help="Seconds allowed per 10,000 questions before the run fails")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/latex_<timestamp>.json)")
+    args = parser.parse_args()
+
+    print(f"Setwise {setwise.__version__} on Python {platform.python_version()}")
+    results = run_benchmarks(args.sizes, args.repeat)
+
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_revision": git_revision(),
+        "setwise_version": setwise.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "budget_seconds_per_10k": args.budget,
+        "results": results,
+    }
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"latex_{datetime.now():%Y%m%d_%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}")
+
+    slow = [entry["size"] for entry in results if entry["seconds_per_10k"] > args.budget]
+    if slow:
+        print(f"Validation exceeded {args.budget}s per 10,000 questions for sizes {slow}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Markdown Parser Benchmarks for Setwise
+
+Times MarkdownQuestionParser against the regular-expression loader it
+replaced, and checks that both return the same questions. Two layouts are
+measured:
+
+- plain: multi-megabyte banks in the documented layout
+- inline-bold: subjective answers using **bold** text with no closing
+  '**' line after it, where the regex loader rescans to the end of the
+  section for every '**' and slows down quadratically
+
+    python benchmarks/bench_markdown.py
+    python benchmarks/bench_markdown.py --sizes 10000 50000 --bold-sizes 1000 --repeat 1
+"""
+
+import argparse
+import io
+import json
+import platform
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from bench_generation import RESULTS_DIR, git_revision, make_question_bank, render_markdown_bank, time_call
+
+import setwise  # noqa: E402
+from setwise.formats import MarkdownQuestionParser  # noqa: E402
+
+DEFAULT_SIZES = [10000, 50000, 100000]
+# The regex loader is quadratic on this layout; keep it to sizes it finishes
+DEFAULT_BOLD_SIZES = [1000, 2000, 4000]
+
+
+def regex_load_markdown(content: str) -> Tuple[List[Dict], List[Dict]]:
+    """The regular-expression loader MarkdownQuestionParser replaced."""
+    mcq = []
+    subjective = []
+
+    mcq_match = re.search(r'## MCQ\s*\n(.*?)(?=## |$)', content, re.DOTALL)
+    if mcq_match:
+        question_pattern = r'\*\*(.*?)\*\*\n((?:- .*\n)*)\*Answer:\* (.*?)(?:\n|$)'
+        for match in re.finditer(question_pattern, mcq_match.group(1)):
+            question = match.group(1).strip()
+            answer = match.group(3).strip()
+            options = [line.strip()[2:] for line in match.group(2).strip().split('\n')
+                       if line.strip().startswith('- ')]
+            if question and options and answer:
+                mcq.append({'question': question, 'options': options, 'answer': answer, 'marks': 1})
+
+    subj_match = re.search(r'## Subjective\s*\n(.*?)(?=## |$)', content, re.DOTALL)
+    if subj_match:
+        question_pattern = r'\*\*(.*?)\*\*\n(.*?)(?=\*\*|$)'
+        for match in re.finditer(question_pattern, subj_match.group(1), re.DOTALL):
+            question = match.group(1).strip()
+            if question:
+                subjective.append({'question': question, 'answer': match.group(2).strip(), 'marks': 5})
+
+    return mcq, subjective
+
+
+def make_markdown_bank(size: int, inline_bold: bool = False) -> str:
+    """Render a synthetic bank in the layout the Markdown loader reads."""
+    content = render_markdown_bank(*make_question_bank(size))
+    if inline_bold:
+        content += "Notes: " + "the **key** step, " * size + "\n"
+    return content
+
+
+def run_benchmarks(sizes: List[int], bold_sizes: List[int], repeat: int) -> List[Dict[str, Any]]:
+    """Time both parsers on each layout and size; return one record per measurement."""
+    results = []
+    print(f"  {'layout':<12}{'size':>8}{'MB':>8}{'regex (s)':>12}{'parser (s)':>12}{'speedup':>9}")
+
+    cases = [('plain', size) for size in sizes] + [('inline-bold', size) for size in bold_sizes]
+    for layout, size in cases:
+        content = make_markdown_bank(size, inline_bold=layout == 'inline-bold')
+        expected = regex_load_markdown(content)
+        if MarkdownQuestionParser().parse(io.StringIO(content)) != expected:
+            raise AssertionError(f"Parsers disagree on the {layout} bank of {size}")
+
+        regex_seconds = time_call(lambda: regex_load_markdown(content), repeat)
+        parser_seconds = time_call(lambda: MarkdownQuestionParser().parse(io.StringIO(content)), repeat)
+        megabytes = len(content.encode('utf-8')) / 1e6
+        results.append({
+            "layout": layout,
+            "size": size,
+            "megabytes": megabytes,
+            "regex_seconds": regex_seconds,
+            "parser_seconds": parser_seconds,
+        })
+        print(f"  {layout:<12}{size:>8}{megabytes:>8.1f}{regex_seconds:>12.3f}{parser_seconds:>12.3f}"
+              f"{regex_seconds / parser_seconds:>8.1f}x")
+
+    return results
+
+
+def main():
+    """Command-line entry point for the Markdown parser benchmark."""
+    parser = argparse.ArgumentParser(description="Compare the Markdown question parser with the old regex loader")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Question bank sizes to benchmark")
+    parser.add_argument("--bold-sizes", type=int, nargs="+", default=DEFAULT_BOLD_SIZES,
+                        help="Bank sizes for the inline-bold layout")
+    parser.add_argument("--repeat", type=int, default=3, help="Repeats per timing (best is kept)")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/markdown_<timestamp>.json)")
+    args = parser.parse_args()
+
+    print(f"Setwise {setwise.__version__} on Python {platform.python_version()}")
+    results = run_benchmarks(args.sizes, args.bold_sizes, args.repeat)
+    print("\nBoth parsers returned identical questions")
+
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_revision": git_revision(),
+        "setwise_version": setwise.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"markdown_{datetime.now():%Y%m%d_%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
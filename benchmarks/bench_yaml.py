@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+YAML Backend Benchmarks for Setwise
+
+Compares PyYAML's pure-Python SafeLoader/SafeDumper with libyaml's
+CSafeLoader/CSafeDumper on synthetic question banks, and checks that the
+documents either backend dumps load back to the same questions with both.
+The documents are equivalent rather than byte-identical: the backends
+differ in how they escape some characters and fold long strings.
+
+    python benchmarks/bench_yaml.py
+    python benchmarks/bench_yaml.py --sizes 1000 100000 --repeat 1
+"""
+
+import argparse
+import json
+import platform
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+import yaml
+
+from bench_generation import RESULTS_DIR, git_revision, make_question_bank, time_call
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+BACKENDS = {'python': (yaml.SafeLoader, yaml.SafeDumper)}
+if yaml.__with_libyaml__:
+    BACKENDS['libyaml'] = (yaml.CSafeLoader, yaml.CSafeDumper)
+
+
+def dump(data: Dict[str, Any], dumper) -> str:
+    """Dump a bank the way QuestionFormatConverter._save_yaml does."""
+    return yaml.dump(data, Dumper=dumper, default_flow_style=False, allow_unicode=True)
+
+
+def run_benchmarks(sizes: List[int], repeat: int) -> List[Dict[str, Any]]:
+    """Time loading and dumping with every backend; return one record per measurement."""
+    results = []
+    print(f"  {'size':>8}  {'backend':<9}{'dump (s)':>10}{'load (s)':>10}{'MB':>8}")
+
+    for size in sizes:
+        mcq, subjective = make_question_bank(size)
+        data = {'mcq': mcq, 'subjective': subjective}
+        documents = {}
+
+        for backend, (loader, dumper) in BACKENDS.items():
+            documents[backend] = document = dump(data, dumper)
+            loaded = yaml.load(document, Loader=loader)
+            if loaded != data:
+                raise AssertionError(f"{backend} backend did not round-trip a bank of {size}")
+
+            dump_seconds = time_call(lambda: dump(data, dumper), repeat)
+            load_seconds = time_call(lambda: yaml.load(document, Loader=loader), repeat)
+            megabytes = len(document.encode('utf-8')) / 1e6
+            results.append({
+                "backend": backend,
+                "size": size,
+                "dump_seconds": dump_seconds,
+                "load_seconds": load_seconds,
+                "megabytes": megabytes,
+            })
+            print(f"  {size:>8}  {backend:<9}{dump_seconds:>10.3f}{load_seconds:>10.3f}{megabytes:>8.1f}")
+
+        for backend, document in documents.items():
+            for loader, _ in BACKENDS.values():
+                if yaml.load(document, Loader=loader) != data:
+                    raise AssertionError(f"{backend} document for a bank of {size} loads differently "
+                                         f"with {loader.__name__}")
+
+    return results
+
+
+def main():
+    """Command-line entry point for the YAML backend benchmark."""
+    parser = argparse.ArgumentParser(description="Compare PyYAML's pure-Python and libyaml backends")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Question bank sizes to benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="Repeats per timing (best is kept)")
+    parser.add_argument("--output", help="Results file (default: benchmarks/results/yaml_<timestamp>.json)")
+    args = parser.parse_args()
+
+    print(f"PyYAML {yaml.__version__} on Python {platform.python_version()}")
+    if not yaml.__with_libyaml__:
+        print("libyaml is not available; only the pure-Python backend is measured")
+
+    results = run_benchmarks(args.sizes, args.repeat)
+    print("\nBoth backends produced equivalent documents")
+
+    report = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_revision": git_revision(),
+        "pyyaml": yaml.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"yaml_{datetime.now():%Y%m%d_%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,7 @@ __email__ = "nipunbatra0@gmail.com"
 __description__ = "Professional LaTeX Quiz Generator for Machine Learning Content"
 
 from .quiz_generator import QuizGenerator
+from .question_bank import QuestionBank, QuestionBankRegistry
 
 # Import TemplateManager with fallback
 try:
@@ -18,4 +19,4 @@ try:
 except ImportError:
     from templates.template_config import TemplateManager
 
-__all__ = ["QuizGenerator", "TemplateManager"]
\ No newline at end of file
+__all__ = ["QuizGenerator", "TemplateManager", "QuestionBank", "QuestionBankRegistry"]
\ No newline at end of file
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Question Bank Cache
+
+Keeps a copy of each loaded question bank next to its source file, so that
+building a QuizGenerator (or validating a file) does not have to parse a
+large question file again. A cached bank is used only while the source file
+is unchanged: the modification time and size are checked first, and the
+content hash decides when those differ.
+
+Cache files hold plain literals written with marshal, which (unlike pickle)
+cannot run code when read, so a cache directory inside an untrusted library
+is no more dangerous than the library itself. Banks loaded by executing a
+questions.py file are cached separately and never served to static loads.
+
+Python question files are read statically (parse_questions_module); they
+are only executed when the caller explicitly allows it.
+"""
+
+import os
+import ast
+import gc
+import marshal
+import hashlib
+import tempfile
+import importlib.util
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Bump when the layout of cached banks changes
+CACHE_VERSION = 2
+
+# Directory (next to the question file) that holds cached banks
+CACHE_DIR_NAME = "__setwise_cache__"
+
+# Module-level names a questions.py file defines its bank with
+QUESTION_NAMES = ('mcq', 'subjective', 'quiz_metadata')
+
+
+def read_cache_file(cache_file: Path) -> Optional[Tuple[Dict[str, Any], Any]]:
+    """Read a (header, data) pair written by write_cache_file.
+
+    Returns:
+        The header and data, or None if the file is missing or unreadable
+    """
+    try:
+        with open(cache_file, 'rb') as f:
+            header = marshal.load(f)
+            if not isinstance(header, dict):
+                return None
+            return header, marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+
+def write_cache_file(cache_file: Path, header: Dict[str, Any], data: Any) -> bool:
+    """Atomically write a header and data made of plain literals.
+
+    Failures (read-only directories, values marshal cannot store such as
+    functions) are not errors: the data is simply computed again next time.
+
+    Returns:
+        True if the file was written, False otherwise
+    """
+    try:
+        content = marshal.dumps(header) + marshal.dumps(data)
+        cache_file.parent.mkdir(exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_file.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, cache_file)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except (OSError, ValueError):
+        return False
+    return True
+
+
+class QuestionBankCache:
+    """Cache of loaded question banks, stored beside the source file."""
+
+    @staticmethod
+    def cache_path(source: Path, allow_exec: bool = False) -> Path:
+        """Return where the cached copy of a question file is stored.
+
+        Banks loaded with execution allowed are kept in their own file, so a
+        static load never receives the result of executing a questions.py.
+        """
+        suffix = ".exec.marshal" if allow_exec else ".marshal"
+        return source.parent / CACHE_DIR_NAME / f"{source.name}{suffix}"
+
+    @staticmethod
+    def _file_hash(source: Path) -> str:
+        """Hash the content of a question file."""
+        digest = hashlib.sha256()
+        with open(source, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @classmethod
+    def _header(cls, source: Path) -> Dict[str, Any]:
+        """Describe the current state of a question file."""
+        stat = source.stat()
+        return {
+            'version': CACHE_VERSION,
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'sha256': cls._file_hash(source),
+        }
+
+    @classmethod
+    def load(cls, source: Path, allow_exec: bool = False) -> Optional[Dict[str, Any]]:
+        """Return the cached bank for source, or None if missing or stale."""
+        cached = read_cache_file(cls.cache_path(source, allow_exec))
+        if cached is None:
+            return None
+        header, bank = cached
+        try:
+            stat = source.stat()
+            if header.get('version') != CACHE_VERSION or not isinstance(bank, dict):
+                return None
+            unchanged = (header['mtime_ns'] == stat.st_mtime_ns and
+                         header['size'] == stat.st_size)
+            if not unchanged and header['sha256'] != cls._file_hash(source):
+                return None
+        except (OSError, KeyError):
+            return None
+
+        if not unchanged:
+            # Touched but identical: refresh the header so the next check is a stat
+            cls.store(source, bank, allow_exec=allow_exec)
+        return bank
+
+    @classmethod
+    def store(cls, source: Path, bank: Dict[str, Any],
+              header: Optional[Dict[str, Any]] = None, allow_exec: bool = False) -> bool:
+        """Write a loaded bank to the cache.
+
+        Failures (read-only directories, values that are not plain literals)
+        are not errors: the bank is simply loaded from source next time.
+
+        Args:
+            source: Question file the bank was loaded from
+            bank: Loaded bank
+            header: State of source when it was loaded (default: its state now)
+            allow_exec: Whether the bank was loaded with execution allowed
+
+        Returns:
+            True if the bank was cached, False otherwise
+        """
+        try:
+            header = header or cls._header(source)
+        except OSError:
+            return False
+        return write_cache_file(cls.cache_path(source, allow_exec), header, bank)
+
+    @classmethod
+    def load_or_build(cls, source: Path, loader: Callable[[Path], Dict[str, Any]],
+                      use_cache: bool = True, allow_exec: bool = False) -> Dict[str, Any]:
+        """Return the bank for source, loading it with loader on a cache miss.
+
+        Args:
+            source: Question file
+            loader: Loads the bank from source when there is no usable cache
+            use_cache: Set to False to always call loader and skip the cache
+            allow_exec: Whether loader may execute source; such banks are
+                cached apart from statically loaded ones
+        """
+        if not use_cache:
+            return loader(source)
+
+        bank = cls.load(source, allow_exec)
+        if bank is None:
+            # Describe the source before loading, so edits made meanwhile invalidate the entry
+            header = cls._header(source)
+            bank = loader(source)
+            cls.store(source, bank, header, allow_exec)
+        return bank
+
+
+def exec_questions_module(source: Path) -> Dict[str, Any]:
+    """Execute a questions.py file and return its mcq, subjective and quiz_metadata.
+
+    Raises:
+        ImportError: If the file cannot be loaded as a module
+    """
+    spec = importlib.util.spec_from_file_location("questions", source)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Could not load module from {source}")
+
+    questions_module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(questions_module)
+
+    return {
+        'mcq': getattr(questions_module, 'mcq', []),
+        'subjective': getattr(questions_module, 'subjective', []),
+        'quiz_metadata': getattr(questions_module, 'quiz_metadata', {}),
+    }
+
+
+def parse_questions_module(source: Path) -> Dict[str, Any]:
+    """Read mcq, subjective and quiz_metadata from a questions.py file without executing it.
+
+    Each name must be assigned a Python literal (strings, numbers, lists,
+    dicts, ...) at the top level of the file, and not be changed by any
+    other statement. Other code in the file is neither run nor checked.
+
+    Raises:
+        SyntaxError: If the file is not valid Python
+        ValueError: If a name is computed or changed by code, so the file
+            can only be loaded by executing it (see exec_questions_module)
+    """
+    with open(source, 'rb') as f:
+        content = f.read()
+
+    # Parsing allocates one object per AST node; collection passes over a
+    # growing tree only cost time, since nothing here is garbage
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        tree = ast.parse(content, filename=str(source))
+        bank = {'mcq': [], 'subjective': [], 'quiz_metadata': {}}
+        for node in tree.body:
+            name = _literal_assignment_target(node)
+            if name is not None:
+                try:
+                    bank[name] = ast.literal_eval(node.value)
+                except ValueError:
+                    raise ValueError(f"{source}, line {node.lineno}: '{name}' is not a literal")
+            elif _mentions_question_names(node):
+                raise ValueError(f"{source}, line {node.lineno}: question data is changed by code")
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return bank
+
+
+def _literal_assignment_target(node: ast.stmt) -> Optional[str]:
+    """Return the question name a statement assigns (name = value), if any."""
+    if isinstance(node, ast.Assign) and len(node.targets) == 1:
+        target = node.targets[0]
+    elif isinstance(node, ast.AnnAssign) and node.value is not None:
+        target = node.target
+    else:
+        return None
+    if isinstance(target, ast.Name) and target.id in QUESTION_NAMES:
+        return target.id
+    return None
+
+
+def _mentions_question_names(node: ast.stmt) -> bool:
+    """Return True if a statement could bind or change a question name.
+
+    Gathering the names into another container (such as
+    example_questions = {'mcq': mcq}) is allowed; any other statement that
+    reads, binds or imports one of them is not.
+    """
+    if _is_plain_alias(node):
+        return False
+    for child in ast.walk(node):
+        if isinstance(child, ast.Name) and child.id in QUESTION_NAMES:
+            return True
+        if isinstance(child, (ast.Import, ast.ImportFrom)):
+            if any((alias.asname or alias.name) in QUESTION_NAMES or alias.name == '*' for alias in child.names):
+                return True
+        if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)) and child.name in QUESTION_NAMES:
+            return True
+    return False
+
+
+def _is_plain_alias(node: ast.stmt) -> bool:
+    """Return True for name = <lists/tuples/dicts of names and constants>."""
+    if isinstance(node, ast.Assign):
+        targets, value = node.targets, node.value
+    elif isinstance(node, ast.AnnAssign) and node.value is not None:
+        targets, value = [node.target], node.value
+    else:
+        return False
+    if not all(isinstance(target, ast.Name) and target.id not in QUESTION_NAMES for target in targets):
+        return False
+    return all(isinstance(child, (ast.Dict, ast.List, ast.Tuple, ast.Set, ast.Name, ast.Constant, ast.Load))
+               for child in ast.walk(value))
+
+
+def load_questions_module(source: Path, allow_exec: bool = False) -> Dict[str, Any]:
+    """Load a questions.py file, statically unless executing it is allowed.
+
+    Args:
+        source: questions.py file
+        allow_exec: Execute files whose questions are built by code instead
+            of failing (only for trusted files)
+
+    Raises:
+        ValueError: If the file needs executing and allow_exec is False
+    """
+    try:
+        return parse_questions_module(source)
+    except ValueError as e:
+        if not allow_exec:
+            raise ValueError(f"{e}; executing questions files must be allowed explicitly "
+                             f"(allow_exec=True, or --allow-exec on the command line)") from e
+    return exec_questions_module(source)
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Content-Addressed PDF Build Cache
+
+Stores compiled quiz PDFs under a hash of the rendered LaTeX, the template it
+came from and any files it includes, so that rerunning a generation with the
+same seed and questions reuses earlier PDFs instead of invoking LaTeX again.
+"""
+
+import os
+import re
+import shutil
+import hashlib
+import tempfile
+import threading
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+
+class BuildCache:
+    """Content-addressed store of compiled PDFs with size-based eviction."""
+
+    # Default upper bound for the total size of cached PDFs (256 MB)
+    DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+    # LaTeX commands that pull external files into a document
+    ASSET_PATTERN = re.compile(r'\\(?:includegraphics|input|include)\s*(?:\[[^\]]*\])?\s*\{([^}]+)\}')
+    ASSET_EXTENSIONS = ['', '.tex', '.pdf', '.png', '.jpg', '.jpeg', '.eps']
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        """Initialize the build cache.
+
+        Args:
+            cache_dir: Directory holding cached PDFs
+            max_bytes: Maximum total size of cached PDFs before eviction
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Total size of cached PDFs, scanned on the first put and then kept
+        # up to date, so that storing an entry does not stat every other one
+        self._total_bytes: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def find_assets(cls, tex_content: str, base_dir: Path) -> List[Path]:
+        """Find existing files referenced by \\includegraphics, \\input or \\include.
+
+        Args:
+            tex_content: Rendered LaTeX source
+            base_dir: Directory LaTeX resolves relative paths against
+
+        Returns:
+            Sorted list of asset paths that exist on disk
+        """
+        assets = set()
+        for match in cls.ASSET_PATTERN.finditer(tex_content):
+            reference = match.group(1).strip()
+            for extension in cls.ASSET_EXTENSIONS:
+                candidate = base_dir / f"{reference}{extension}"
+                if candidate.is_file():
+                    assets.add(candidate)
+                    break
+        return sorted(assets)
+
+    @staticmethod
+    def compute_key(tex_content: str, template_path: Optional[Path] = None,
+                    assets: Iterable[Path] = (), extra: str = "") -> str:
+        """Compute the cache key for a rendered LaTeX document.
+
+        Args:
+            tex_content: Rendered LaTeX source
+            template_path: Template the source was rendered from
+            assets: Files included by the document
+            extra: Compile options that affect the output
+
+        Returns:
+            Hex digest identifying the build
+        """
+        digest = hashlib.sha256()
+        digest.update(tex_content.encode('utf-8'))
+
+        if template_path is not None and Path(template_path).is_file():
+            digest.update(b'\0template\0')
+            digest.update(Path(template_path).read_bytes())
+
+        for asset in assets:
+            digest.update(b'\0asset\0')
+            digest.update(str(asset).encode('utf-8'))
+            digest.update(Path(asset).read_bytes())
+
+        digest.update(b'\0extra\0')
+        digest.update(extra.encode('utf-8'))
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        """Return the path a cached PDF is stored at."""
+        return self.cache_dir / key[:2] / f"{key}.pdf"
+
+    def get(self, key: str, destination: Path) -> bool:
+        """Place a cached PDF at destination, hardlinking when possible.
+
+        Args:
+            key: Cache key from compute_key
+            destination: Where the PDF should appear
+
+        Returns:
+            True on a cache hit, False otherwise
+        """
+        entry = self._entry_path(key)
+        if not entry.exists():
+            return False
+
+        destination = Path(destination)
+        if destination.exists() or destination.is_symlink():
+            destination.unlink()
+
+        try:
+            os.link(entry, destination)
+        except OSError:
+            shutil.copy2(entry, destination)
+
+        # Mark the entry as recently used for eviction
+        os.utime(entry)
+        return True
+
+    def put(self, key: str, pdf_path: Path) -> None:
+        """Store a compiled PDF under key and evict old entries if needed.
+
+        The cache directory is only scanned again once the running total
+        exceeds max_bytes; entries written meanwhile by other processes are
+        counted at that point.
+
+        Args:
+            key: Cache key from compute_key
+            pdf_path: Freshly compiled PDF
+        """
+        if not Path(pdf_path).is_file():
+            return
+
+        entry = self._entry_path(key)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        replaced = entry.stat().st_size if entry.exists() else 0
+
+        # Copy to a temporary name first so readers never see partial files
+        fd, tmp_name = tempfile.mkstemp(suffix='.tmp', dir=entry.parent)
+        os.close(fd)
+        try:
+            shutil.copyfile(pdf_path, tmp_name)
+            os.replace(tmp_name, entry)
+        finally:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(size for _, size, _ in self._scan())
+            else:
+                self._total_bytes += entry.stat().st_size - replaced
+            over_limit = self._total_bytes > self.max_bytes
+        if over_limit:
+            self.evict()
+
+    def _scan(self) -> List[Tuple[float, int, Path]]:
+        """Return (mtime, size, path) for every cached PDF."""
+        entries = []
+        for entry in self.cache_dir.glob('*/*.pdf'):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue  # Evicted meanwhile
+            entries.append((stat.st_mtime, stat.st_size, entry))
+        return entries
+
+    def evict(self) -> int:
+        """Remove least recently used entries until the cache fits max_bytes.
+
+        Returns:
+            Number of entries removed
+        """
+        entries = self._scan()
+        total = sum(size for _, size, _ in entries)
+
+        removed = 0
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            entry.unlink()
+            total -= size
+            removed += 1
+
+        with self._lock:
+            self._total_bytes = total
+        return removed
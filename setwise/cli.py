@@ -7,10 +7,11 @@ import argparse
 import sys
 from pathlib import Path
 
-from .quiz_generator import QuizGenerator
+from .quiz_generator import QuizGenerator, DEFAULT_LATEX_TIMEOUT, DEFAULT_LATEX_MEMORY_MB
 from .question_manager import QuestionManager
 from .latex_validator import LaTeXValidator, LaTeXErrorFixer
 from .formats import QuestionFormatConverter
+from .tex_engine import ENGINES, list_engines
 from .user_guidance import UserGuidance
 
 # Import with fallbacks  
@@ -43,6 +44,7 @@ Examples:
   setwise questions convert questions.py questions.yaml
   setwise questions create-examples --output-dir examples
   setwise list-templates
+  setwise list-engines
         """
     )
     
@@ -57,11 +59,40 @@ Examples:
     gen_parser.add_argument("--template", default="default", help="Template to use")
     gen_parser.add_argument("--output-dir", default="output", help="Output directory")
     gen_parser.add_argument("--no-pdf", action="store_true", help="Skip PDF compilation")
+    gen_parser.add_argument("--jobs", "-j", type=int, default=1,
+                            help="Number of quiz sets to compile in parallel (0 uses all CPUs)")
+    gen_parser.add_argument("--max-passes", type=int, default=2,
+                            help="Maximum LaTeX passes per set (extra passes only run when needed)")
+    gen_parser.add_argument("--precompile-preamble", action="store_true",
+                            help="Precompile the template preamble once and reuse it for every set")
+    gen_parser.add_argument("--no-cache", action="store_true",
+                            help="Always recompile PDFs instead of reusing the build cache")
+    gen_parser.add_argument("--cache-dir", help="Build cache directory (default: <output-dir>/.setwise_cache)")
+    gen_parser.add_argument("--bundle", action="store_true",
+                            help="Render all sets into one document and compile it once")
+    gen_parser.add_argument("--split-bundle", action="store_true",
+                            help="With --bundle, also split the PDF into one file per set (requires pypdf)")
+    gen_parser.add_argument("--latex-timeout", type=float, default=DEFAULT_LATEX_TIMEOUT,
+                            help="Seconds allowed to compile one set before pdflatex is killed (0 disables)")
+    gen_parser.add_argument("--engine", default="pdflatex", choices=["auto", *ENGINES],
+                            help="TeX engine to compile with ('auto' picks the fastest installed)")
+    gen_parser.add_argument("--engine-arg", action="append", default=[], metavar="ARG",
+                            help="Extra flag passed to the TeX engine (repeatable)")
+    gen_parser.add_argument("--latex-memory-limit", type=int, default=DEFAULT_LATEX_MEMORY_MB,
+                            help="Memory limit for each pdflatex process in MB (0 disables)")
+    gen_parser.add_argument("--profile", action="store_true", help="Print time spent in each generation stage")
+    gen_parser.add_argument("--profile-json", help="Write per-stage timings to this JSON file")
+    gen_parser.add_argument("--cprofile", help="Write a cProfile dump of the run to this file")
     gen_parser.add_argument("--questions-file", help="Path to custom questions file (.py, .yaml, .json, .csv, .md)")
+    gen_parser.add_argument("--allow-exec", action="store_true",
+                            help="Execute a Python questions file whose questions are built by code (trusted files only)")
     
     # List templates command
     subparsers.add_parser('list-templates', help='List available templates')
     
+    # List TeX engines command
+    subparsers.add_parser('list-engines', help='List supported TeX engines and which are installed')
+    
     # Generate figures command
     subparsers.add_parser('generate-figures', help='Generate TikZ and matplotlib figures')
     
@@ -75,12 +106,22 @@ Examples:
     # List questions command
     list_q_parser = questions_subparsers.add_parser('list', help='List available question libraries')
     list_q_parser.add_argument('--search-dirs', nargs='+', help='Directories to search for question files')
+    list_q_parser.add_argument('--no-validate', action='store_true',
+                               help='List new or changed files without loading and validating them')
+    list_q_parser.add_argument('--jobs', '-j', type=int, help='Worker processes for validating libraries (default: CPU count)')
+    list_q_parser.add_argument('--allow-exec', action='store_true',
+                               help='Execute Python question files whose questions are built by code (trusted files only)')
     
     # Validate questions command
     validate_q_parser = questions_subparsers.add_parser('validate', help='Validate a questions file')
     validate_q_parser.add_argument('file', help='Path to questions.py file to validate')
     validate_q_parser.add_argument('--verbose', action='store_true', help='Show detailed suggestions and tips')
     validate_q_parser.add_argument('--auto-suggest', action='store_true', help='Provide automatic improvement suggestions')
+    validate_q_parser.add_argument('--jobs', '-j', type=int, help='Worker processes for validating large banks (default: CPU count)')
+    validate_q_parser.add_argument('--no-cache', action='store_true',
+                                   help='Validate every question instead of reusing results for unchanged ones')
+    validate_q_parser.add_argument('--allow-exec', action='store_true',
+                                   help='Execute a Python questions file whose questions are built by code (trusted files only)')
     
     # Create sample command
     sample_q_parser = questions_subparsers.add_parser('create-sample', help='Create a sample questions.py file')
@@ -89,6 +130,8 @@ Examples:
     # Stats command
     stats_q_parser = questions_subparsers.add_parser('stats', help='Show statistics for a questions file')
     stats_q_parser.add_argument('file', help='Path to questions.py file')
+    stats_q_parser.add_argument('--allow-exec', action='store_true',
+                                help='Execute a Python questions file whose questions are built by code (trusted files only)')
     
     # Fix LaTeX command
     fix_q_parser = questions_subparsers.add_parser('fix-latex', help='Automatically fix common LaTeX errors in questions file')
@@ -103,6 +146,8 @@ Examples:
     convert_q_parser = questions_subparsers.add_parser('convert', help='Convert questions between different formats')
     convert_q_parser.add_argument('input', help='Input questions file')
     convert_q_parser.add_argument('output', help='Output file with desired format extension (.py, .yaml, .json, .csv, .md)')
+    convert_q_parser.add_argument('--allow-exec', action='store_true',
+                                  help='Execute a Python input file whose questions are built by code (trusted files only)')
     convert_q_parser.add_argument('--format', choices=['python', 'yaml', 'json', 'csv', 'markdown'], 
                                  help='Override output format detection')
     
@@ -125,10 +170,23 @@ Examples:
         return
     
     if args.command == 'generate':
+        # Optionally profile the whole run, including question loading
+        cprofiler = None
+        if args.cprofile:
+            import cProfile
+            cprofiler = cProfile.Profile()
+            cprofiler.enable()
+        
         # Create quiz generator
         generator = QuizGenerator(
             output_dir=args.output_dir,
-            questions_file=args.questions_file
+            questions_file=args.questions_file,
+            latex_timeout=args.latex_timeout or None,
+            latex_memory_limit_mb=args.latex_memory_limit or None,
+            engine=args.engine,
+            engine_args=args.engine_arg,
+            require_format=args.precompile_preamble,
+            allow_exec=args.allow_exec
         )
         
         # Validate template
@@ -144,9 +202,26 @@ Examples:
             num_subjective=args.subjective,
             template_name=args.template,
             compile_pdf=not args.no_pdf,
-            seed=args.seed
+            seed=args.seed,
+            jobs=args.jobs,
+            max_passes=args.max_passes,
+            precompile_preamble=args.precompile_preamble,
+            use_cache=not args.no_cache,
+            cache_dir=args.cache_dir,
+            bundle=args.bundle,
+            split_bundle=args.split_bundle
         )
         
+        if cprofiler is not None:
+            cprofiler.disable()
+            cprofiler.dump_stats(args.cprofile)
+            print(f"cProfile data written to {args.cprofile}")
+        if args.profile:
+            print(f"\n{generator.profiler.summary_table()}")
+        if args.profile_json:
+            generator.profiler.write_json(args.profile_json)
+            print(f"Profile written to {args.profile_json}")
+        
         if success:
             print(f"\n✅ Successfully generated {args.sets} quiz sets in '{args.output_dir}/'")
         else:
@@ -157,6 +232,9 @@ Examples:
         tm = TemplateManager()
         print(tm.list_templates())
     
+    elif args.command == 'list-engines':
+        print(list_engines())
+    
     elif args.command == 'generate-figures':
         print("Generating figures for ML quiz...")
         generate_figures()
@@ -204,7 +282,8 @@ Examples:
             return
         
         if args.questions_command == 'list':
-            libraries = QuestionManager.list_question_libraries(args.search_dirs)
+            libraries = QuestionManager.list_question_libraries(args.search_dirs, validate=not args.no_validate,
+                                                                jobs=args.jobs, allow_exec=args.allow_exec)
             if not libraries:
                 print("No question libraries found.")
                 return
@@ -212,18 +291,25 @@ Examples:
             print(f"Found {len(libraries)} question libraries:")
             print("-" * 80)
             for lib in libraries:
-                status = "Valid" if lib['valid'] else "Invalid"
+                if lib['valid'] is None:
+                    status = "Not validated"
+                else:
+                    status = "Valid" if lib['valid'] else "Invalid"
                 print(f"Name: {lib['name']}")
                 print(f"Path: {lib['path']}")
                 print(f"Status: {status}")
                 print(f"Info: {lib['info']}")
+                if lib['errors'] > 1:
+                    print(f"Errors: {lib['errors']} questions with problems")
                 print(f"Size: {lib['size']} bytes")
                 print("-" * 80)
         
         elif args.questions_command == 'validate':
-            is_valid, message = QuestionManager.validate_questions_file(args.file)
-            if is_valid:
-                print(f"✅ Valid: {message}")
+            report = QuestionManager.validate_questions_report(args.file, jobs=args.jobs,
+                                                               use_cache=not args.no_cache,
+                                                               allow_exec=args.allow_exec)
+            if report.is_valid:
+                print(f"✅ Valid: {report.message}")
                 
                 # Show additional suggestions for valid files
                 try:
@@ -244,7 +330,7 @@ Examples:
                         
                     if args.verbose:
                         print(f"\n📊 Quick Stats:")
-                        stats = QuestionManager.get_question_stats(args.file)
+                        stats = QuestionManager.get_question_stats(args.file, args.allow_exec)
                         if 'error' not in stats:
                             print(f"   📝 Total questions: {stats['total_questions']}")
                             print(f"   🔢 MCQ: {stats['mcq_count']} ({stats['total_mcq_marks']} marks)")
@@ -256,9 +342,17 @@ Examples:
                         print(f"\n⚠️ Could not generate suggestions: {e}")
             else:
                 # Enhanced error message with guidance
-                enhanced_message = UserGuidance.enhance_error_message(message)
+                enhanced_message = UserGuidance.enhance_error_message(report.message)
                 print(f"❌ Invalid: {enhanced_message}")
                 
+                if len(report.errors) > 1:
+                    shown = report.errors if args.verbose else report.errors[:10]
+                    print(f"\n📋 {len(report.errors)} questions have errors:")
+                    for error in shown:
+                        print(f"   • {error['message']}")
+                    if len(report.errors) > len(shown):
+                        print(f"   ... and {len(report.errors) - len(shown)} more (use --verbose to see all)")
+                
                 if args.verbose:
                     print(f"\n🔍 Troubleshooting tips:")
                     print(f"   • Check file format and syntax")
@@ -276,7 +370,7 @@ Examples:
                 sys.exit(1)
         
         elif args.questions_command == 'stats':
-            stats = QuestionManager.get_question_stats(args.file)
+            stats = QuestionManager.get_question_stats(args.file, args.allow_exec)
             if 'error' in stats:
                 print(f"Error: {stats['error']}")
                 sys.exit(1)
@@ -332,22 +426,20 @@ Examples:
         elif args.questions_command == 'convert':
             # Convert between formats
             try:
-                # Load questions from input format
-                mcq, subjective = QuestionFormatConverter.load_questions(args.input)
-                
                 # Determine output format
                 output_format = args.format
                 if not output_format:
                     output_format = QuestionFormatConverter.detect_format(args.output)
                 
-                # Save in output format
-                success = QuestionFormatConverter.save_questions(mcq, subjective, args.output, output_format)
+                # Stream questions from the input format into the output format
+                counts = QuestionFormatConverter.convert_file(args.input, args.output, output_format,
+                                                              allow_exec=args.allow_exec)
                 
-                if success:
+                if counts:
                     print(f"✅ Successfully converted {args.input} to {args.output} ({output_format} format)")
                     
                     # Show statistics
-                    print(f"📊 Converted {len(mcq)} MCQ and {len(subjective)} subjective questions")
+                    print(f"📊 Converted {counts[0]} MCQ and {counts[1]} subjective questions")
                 else:
                     print(f"❌ Failed to convert {args.input} to {args.output}")
                     sys.exit(1)
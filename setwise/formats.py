@@ -13,9 +13,42 @@ Supports multiple user-friendly formats:
 import yaml
 import json
 import csv
-import re
+import itertools
 from pathlib import Path
-from typing import Dict, List, Any, Tuple, Optional
+from typing import Dict, List, Any, Tuple, Optional, Union, Iterator, Iterable
+
+from .bank_cache import load_questions_module
+
+# Use the fastest parsers available: libyaml's C loader/dumper and orjson.
+# Both YAML paths write semantically equivalent documents: they load to the
+# same data, but the text may differ (escaping of characters outside the
+# Basic Multilingual Plane, folding of long strings).
+try:
+    from yaml import CSafeLoader as YamlLoader, CSafeDumper as YamlDumper
+except ImportError:
+    from yaml import SafeLoader as YamlLoader, SafeDumper as YamlDumper
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Characters read from the start of a CSV file to detect its dialect
+CSV_SNIFF_BYTES = 64 * 1024
+
+# Questions passed to each yaml.dump call when writing YAML banks
+YAML_CHUNK_SIZE = 1000
+
+
+class _QuestionDumper(YamlDumper):
+    """YAML dumper that writes objects shared between questions out in full.
+
+    Banks are dumped a chunk at a time, and every yaml.dump call numbers its
+    anchors from &id001 again, so aliases would clash between chunks.
+    """
+
+    def ignore_aliases(self, data: Any) -> bool:
+        return True
 
 
 class QuestionFormatConverter:
@@ -40,58 +73,103 @@ class QuestionFormatConverter:
         return format_map.get(suffix, 'unknown')
     
     @staticmethod
-    def load_questions(file_path: str) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
-        """Load questions from any supported format."""
+    def load_questions(file_path: str, allow_exec: bool = False) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Load questions from any supported format (see load_bank)."""
+        bank = QuestionFormatConverter.load_bank(file_path, allow_exec)
+        return bank['mcq'], bank['subjective']
+    
+    @staticmethod
+    def load_bank(file_path: Union[str, Path], allow_exec: bool = False) -> Dict[str, Any]:
+        """Load a question bank from any supported format.
+        
+        Every format is normalized to the representation used for Python
+        question files: a dict with 'mcq' and 'subjective' lists and a
+        'quiz_metadata' dict (empty for formats that cannot store it).
+        
+        Python files are read without being executed, which requires their
+        questions to be literals; see load_questions_module.
+        
+        Args:
+            file_path: Questions file
+            allow_exec: Execute Python files whose questions are built by code
+                (only for trusted files)
+        
+        Raises:
+            ValueError: If the format is unsupported or the file is not a question bank
+        """
         format_type = QuestionFormatConverter.detect_format(file_path)
         
         if format_type == 'python':
-            return QuestionFormatConverter._load_python(file_path)
+            bank = load_questions_module(Path(file_path), allow_exec)
         elif format_type == 'yaml':
-            return QuestionFormatConverter._load_yaml(file_path)
+            bank = QuestionFormatConverter._bank_from_data(
+                QuestionFormatConverter._read_yaml(file_path), file_path)
         elif format_type == 'json':
-            return QuestionFormatConverter._load_json(file_path)
+            bank = QuestionFormatConverter._bank_from_data(
+                QuestionFormatConverter._read_json(file_path), file_path)
         elif format_type == 'csv':
-            return QuestionFormatConverter._load_csv(file_path)
+            mcq, subjective = QuestionFormatConverter._load_csv(file_path)
+            bank = {'mcq': mcq, 'subjective': subjective}
         elif format_type == 'markdown':
-            return QuestionFormatConverter._load_markdown(file_path)
+            mcq, subjective = QuestionFormatConverter._load_markdown(file_path)
+            bank = {'mcq': mcq, 'subjective': subjective}
         else:
             raise ValueError(f"Unsupported file format: {format_type}")
+        
+        return {
+            'mcq': bank.get('mcq') or [],
+            'subjective': bank.get('subjective') or [],
+            'quiz_metadata': bank.get('quiz_metadata') or {},
+        }
     
     @staticmethod
-    def _load_python(file_path: str) -> Tuple[List[Dict], List[Dict]]:
-        """Load from Python file (existing functionality)."""
-        import importlib.util
-        
-        spec = importlib.util.spec_from_file_location("questions", file_path)
-        module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
+    def _bank_from_data(data: Any, file_path: str) -> Dict[str, Any]:
+        """Pick the question lists and metadata out of parsed YAML/JSON data."""
+        if data is None:
+            data = {}
+        if not isinstance(data, dict):
+            raise ValueError(f"Expected a mapping with 'mcq' and 'subjective' keys in {file_path}")
         
-        mcq = getattr(module, 'mcq', [])
-        subjective = getattr(module, 'subjective', [])
-        
-        return mcq, subjective
+        return {
+            'mcq': data.get('mcq', data.get('multiple_choice', [])),
+            'subjective': data.get('subjective', data.get('short_answer', [])),
+            'quiz_metadata': data.get('quiz_metadata', {}),
+        }
+    
+    @staticmethod
+    def _read_yaml(file_path: str) -> Any:
+        """Parse a YAML file, with the C loader when libyaml is available."""
+        with open(file_path, 'rb') as f:
+            return yaml.load(f, Loader=YamlLoader)
+    
+    @staticmethod
+    def _read_json(file_path: str) -> Any:
+        """Parse a JSON file, with orjson when it is installed."""
+        if orjson is not None:
+            with open(file_path, 'rb') as f:
+                return orjson.loads(f.read())
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    @staticmethod
+    def _load_python(file_path: str, allow_exec: bool = False) -> Tuple[List[Dict], List[Dict]]:
+        """Load from Python file, executing it only if allowed."""
+        bank = load_questions_module(Path(file_path), allow_exec)
+        return bank['mcq'], bank['subjective']
     
     @staticmethod
     def _load_yaml(file_path: str) -> Tuple[List[Dict], List[Dict]]:
         """Load from YAML file."""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
-        
-        mcq = data.get('mcq', data.get('multiple_choice', []))
-        subjective = data.get('subjective', data.get('short_answer', []))
-        
-        return mcq, subjective
+        bank = QuestionFormatConverter._bank_from_data(
+            QuestionFormatConverter._read_yaml(file_path), file_path)
+        return bank['mcq'], bank['subjective']
     
     @staticmethod
     def _load_json(file_path: str) -> Tuple[List[Dict], List[Dict]]:
         """Load from JSON file."""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        mcq = data.get('mcq', data.get('multiple_choice', []))
-        subjective = data.get('subjective', data.get('short_answer', []))
-        
-        return mcq, subjective
+        bank = QuestionFormatConverter._bank_from_data(
+            QuestionFormatConverter._read_json(file_path), file_path)
+        return bank['mcq'], bank['subjective']
     
     @staticmethod
     def _load_csv(file_path: str) -> Tuple[List[Dict], List[Dict]]:
@@ -99,114 +177,86 @@ class QuestionFormatConverter:
         mcq = []
         subjective = []
         
+        for question_type, question in QuestionFormatConverter.iter_questions_csv(file_path):
+            if question_type == 'mcq':
+                mcq.append(question)
+            else:
+                subjective.append(question)
+        
+        return mcq, subjective
+    
+    @staticmethod
+    def iter_questions_csv(file_path: Union[str, Path]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Stream questions from a CSV file one row at a time.
+        
+        The dialect is sniffed from the start of the file and the option
+        columns (option1, optionA, ...) are resolved once from the header,
+        so arbitrarily large spreadsheets are read in constant memory.
+        
+        Yields:
+            ('mcq', question) or ('subjective', question) tuples, with the
+            same question dicts as load_questions
+        """
         with open(file_path, 'r', encoding='utf-8', newline='') as f:
-            # Try to detect dialect
-            sample = f.read(1024)
-            f.seek(0)
-            dialect = csv.Sniffer().sniff(sample)
-            
+            dialect = QuestionFormatConverter._sniff_csv_dialect(f)
             reader = csv.DictReader(f, dialect=dialect)
             
+            fieldnames = reader.fieldnames or []
+            option_columns = [name for name in fieldnames if name.lower().startswith('option')]
+            # A bare 'option' column marks every row as MCQ
+            all_mcq = 'option' in fieldnames
+            
             for row in reader:
-                question_type = row.get('type', '').lower()
-                question_text = row.get('question', '')
-                
+                question_text = row.get('question') or ''
                 if not question_text:
                     continue
                 
-                if question_type.startswith('mcq') or 'option' in row:
-                    # Parse MCQ
-                    options = []
-                    answer = row.get('answer', '')
-                    
-                    # Collect options (option1, option2, etc. or optionA, optionB, etc.)
-                    for key, value in row.items():
-                        if key.lower().startswith('option') and value:
-                            options.append(value)
-                    
+                question_type = (row.get('type') or '').lower()
+                if all_mcq or question_type.startswith('mcq'):
+                    options = [row[name] for name in option_columns if row.get(name)]
                     if options:
-                        mcq_item = {
+                        yield 'mcq', {
                             'question': question_text,
                             'options': options,
-                            'answer': answer,
-                            'marks': int(row.get('marks', 1))
+                            'answer': row.get('answer') or '',
+                            'marks': int(row.get('marks') or 1)
                         }
-                        mcq.append(mcq_item)
-                
                 else:
-                    # Treat as subjective
-                    subj_item = {
+                    yield 'subjective', {
                         'question': question_text,
-                        'answer': row.get('answer', row.get('solution', '')),
-                        'marks': int(row.get('marks', 5))
+                        'answer': row.get('answer', row.get('solution')) or '',
+                        'marks': int(row.get('marks') or 5)
                     }
-                    subjective.append(subj_item)
+    
+    @staticmethod
+    def _sniff_csv_dialect(f) -> Any:
+        """Detect the dialect from the first complete lines of an open CSV file."""
+        sample = f.read(CSV_SNIFF_BYTES)
+        f.seek(0)
         
-        return mcq, subjective
+        # Sniff whole lines only; a cut-off last row can confuse the sniffer
+        if len(sample) == CSV_SNIFF_BYTES and '\n' in sample:
+            sample = sample[:sample.rindex('\n') + 1]
+        
+        try:
+            return csv.Sniffer().sniff(sample)
+        except csv.Error:
+            return csv.excel
     
     @staticmethod
     def _load_markdown(file_path: str) -> Tuple[List[Dict], List[Dict]]:
         """Load from Markdown file with structured format."""
         with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        mcq = []
-        subjective = []
-        
-        # Parse MCQ sections
-        mcq_pattern = r'## MCQ\s*\n(.*?)(?=## |$)'
-        mcq_match = re.search(mcq_pattern, content, re.DOTALL)
-        
-        if mcq_match:
-            mcq_section = mcq_match.group(1)
-            # Parse individual MCQ questions
-            question_pattern = r'\*\*(.*?)\*\*\n((?:- .*\n)*)\*Answer:\* (.*?)(?:\n|$)'
-            
-            for match in re.finditer(question_pattern, mcq_section):
-                question = match.group(1).strip()
-                options_text = match.group(2).strip()
-                answer = match.group(3).strip()
-                
-                # Parse options
-                options = []
-                for line in options_text.split('\n'):
-                    if line.strip().startswith('- '):
-                        options.append(line.strip()[2:])
-                
-                if question and options and answer:
-                    mcq.append({
-                        'question': question,
-                        'options': options,
-                        'answer': answer,
-                        'marks': 1
-                    })
-        
-        # Parse Subjective sections
-        subj_pattern = r'## Subjective\s*\n(.*?)(?=## |$)'
-        subj_match = re.search(subj_pattern, content, re.DOTALL)
-        
-        if subj_match:
-            subj_section = subj_match.group(1)
-            # Parse individual subjective questions
-            question_pattern = r'\*\*(.*?)\*\*\n(.*?)(?=\*\*|$)'
-            
-            for match in re.finditer(question_pattern, subj_section, re.DOTALL):
-                question = match.group(1).strip()
-                answer = match.group(2).strip()
-                
-                if question:
-                    subjective.append({
-                        'question': question,
-                        'answer': answer,
-                        'marks': 5
-                    })
-        
-        return mcq, subjective
+            return MarkdownQuestionParser().parse(f)
     
     @staticmethod
-    def save_questions(mcq: List[Dict], subjective: List[Dict], 
+    def save_questions(mcq: Iterable[Dict], subjective: Iterable[Dict], 
                       file_path: str, format_type: str = None) -> bool:
-        """Save questions to specified format."""
+        """Save questions to specified format.
+        
+        Questions may be lists or iterators; each format writes them to the
+        file as they are read, so the output is never built in memory.
+        """
         if format_type is None:
             format_type = QuestionFormatConverter.detect_format(file_path)
         
@@ -228,41 +278,114 @@ class QuestionFormatConverter:
             return False
     
     @staticmethod
-    def _save_yaml(mcq: List[Dict], subjective: List[Dict], file_path: str) -> bool:
+    def convert_file(input_path: str, output_path: str,
+                     format_type: str = None, allow_exec: bool = False) -> Optional[Tuple[int, int]]:
+        """Convert a question file to another format, streaming questions to the output.
+        
+        CSV input is read row by row (once for the MCQs, once for the
+        subjective questions), so CSV banks larger than memory can be
+        converted; other input formats are parsed once. allow_exec is
+        passed to load_bank.
+        
+        Returns:
+            (mcq_count, subjective_count), or None if saving failed
+            
+        Raises:
+            ValueError: If the input and output are the same file
+        """
+        if Path(input_path).resolve() == Path(output_path).resolve():
+            raise ValueError("Input and output must be different files")
+        
+        if QuestionFormatConverter.detect_format(input_path) == 'csv':
+            def questions(kind):
+                return (question for question_type, question
+                        in QuestionFormatConverter.iter_questions_csv(input_path)
+                        if question_type == kind)
+            mcq, subjective = questions('mcq'), questions('subjective')
+        else:
+            mcq, subjective = QuestionFormatConverter.load_questions(input_path, allow_exec)
+        
+        counts = {'mcq': 0, 'subjective': 0}
+        
+        def counted(kind, questions):
+            for question in questions:
+                counts[kind] += 1
+                yield question
+        
+        if not QuestionFormatConverter.save_questions(counted('mcq', mcq), counted('subjective', subjective),
+                                                      output_path, format_type):
+            return None
+        return counts['mcq'], counts['subjective']
+    
+    @staticmethod
+    def _peek(questions: Iterable[Dict]) -> Optional[Iterator[Dict]]:
+        """Return an iterator over questions, or None if there are none."""
+        iterator = iter(questions)
+        try:
+            first = next(iterator)
+        except StopIteration:
+            return None
+        return itertools.chain([first], iterator)
+    
+    @staticmethod
+    def _save_yaml(mcq: Iterable[Dict], subjective: Iterable[Dict], file_path: str) -> bool:
         """Save to YAML format."""
-        data = {
+        metadata = {
             'metadata': {
                 'title': 'Quiz Questions',
                 'format': 'setwise-yaml',
                 'version': '1.0'
-            },
-            'mcq': mcq,
-            'subjective': subjective
+            }
         }
         
+        # Top-level keys in the sorted order yaml.dump would write them
         with open(file_path, 'w', encoding='utf-8') as f:
-            yaml.dump(data, f, default_flow_style=False, allow_unicode=True)
+            QuestionFormatConverter._write_yaml_list(f, 'mcq', mcq)
+            yaml.dump(metadata, f, Dumper=_QuestionDumper, default_flow_style=False, allow_unicode=True)
+            QuestionFormatConverter._write_yaml_list(f, 'subjective', subjective)
         return True
     
     @staticmethod
-    def _save_json(mcq: List[Dict], subjective: List[Dict], file_path: str) -> bool:
+    def _write_yaml_list(f, key: str, questions: Iterable[Dict]) -> None:
+        """Write a top-level YAML list, dumping the questions a chunk at a time."""
+        iterator = iter(questions)
+        chunk = list(itertools.islice(iterator, YAML_CHUNK_SIZE))
+        if not chunk:
+            f.write(f"{key}: []\n")
+            return
+        
+        f.write(f"{key}:\n")
+        while chunk:
+            yaml.dump(chunk, f, Dumper=_QuestionDumper, default_flow_style=False, allow_unicode=True)
+            chunk = list(itertools.islice(iterator, YAML_CHUNK_SIZE))
+    
+    @staticmethod
+    def _save_json(mcq: Iterable[Dict], subjective: Iterable[Dict], file_path: str) -> bool:
         """Save to JSON format."""
-        data = {
-            'metadata': {
-                'title': 'Quiz Questions',
-                'format': 'setwise-json',
-                'version': '1.0'
-            },
-            'mcq': mcq,
-            'subjective': subjective
+        metadata = {
+            'title': 'Quiz Questions',
+            'format': 'setwise-json',
+            'version': '1.0'
         }
         
+        def encode(value: Any, level: int) -> str:
+            # Indent a value as json.dump(indent=2) would at this nesting level
+            return json.dumps(value, indent=2, ensure_ascii=False).replace('\n', '\n' + '  ' * level)
+        
         with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.write('{\n  "metadata": ' + encode(metadata, 1))
+            for key, questions in (('mcq', mcq), ('subjective', subjective)):
+                f.write(f',\n  "{key}": ')
+                separator = '[\n    '
+                for q in questions:
+                    f.write(separator + encode(q, 2))
+                    separator = ',\n    '
+                f.write('[]' if separator == '[\n    ' else '\n  ]')
+            f.write('\n}')
         return True
     
     @staticmethod
-    def _save_csv(mcq: List[Dict], subjective: List[Dict], file_path: str) -> bool:
+    def _save_csv(mcq: Iterable[Dict], subjective: Iterable[Dict], file_path: str) -> bool:
         """Save to CSV format."""
         with open(file_path, 'w', encoding='utf-8', newline='') as f:
             writer = csv.writer(f)
@@ -296,42 +419,210 @@ class QuestionFormatConverter:
         return True
     
     @staticmethod
-    def _save_markdown(mcq: List[Dict], subjective: List[Dict], file_path: str) -> bool:
+    def _save_markdown(mcq: Iterable[Dict], subjective: Iterable[Dict], file_path: str) -> bool:
         """Save to Markdown format."""
-        content = "# Quiz Questions\n\n"
-        
-        if mcq:
-            content += "## MCQ Questions\n\n"
-            for i, q in enumerate(mcq, 1):
-                content += f"**{i}. {q.get('question', '')}**\n\n"
-                for option in q.get('options', []):
-                    content += f"- {option}\n"
-                content += f"\n*Answer:* {q.get('answer', '')}\n"
-                content += f"*Marks:* {q.get('marks', 1)}\n\n"
-        
-        if subjective:
-            content += "## Subjective Questions\n\n"
-            for i, q in enumerate(subjective, 1):
-                content += f"**{i}. {q.get('question', '')}**\n\n"
-                content += f"{q.get('answer', '')}\n\n"
-                content += f"*Marks:* {q.get('marks', 5)}\n\n"
-        
         with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+            f.write("# Quiz Questions\n\n")
+            
+            mcq = QuestionFormatConverter._peek(mcq)
+            if mcq:
+                f.write("## MCQ Questions\n\n")
+                for i, q in enumerate(mcq, 1):
+                    f.write(f"**{i}. {q.get('question', '')}**\n\n")
+                    for option in q.get('options', []):
+                        f.write(f"- {option}\n")
+                    f.write(f"\n*Answer:* {q.get('answer', '')}\n")
+                    f.write(f"*Marks:* {q.get('marks', 1)}\n\n")
+            
+            subjective = QuestionFormatConverter._peek(subjective)
+            if subjective:
+                f.write("## Subjective Questions\n\n")
+                for i, q in enumerate(subjective, 1):
+                    f.write(f"**{i}. {q.get('question', '')}**\n\n")
+                    f.write(f"{q.get('answer', '')}\n\n")
+                    f.write(f"*Marks:* {q.get('marks', 5)}\n\n")
         return True
     
     @staticmethod
-    def _save_python(mcq: List[Dict], subjective: List[Dict], file_path: str) -> bool:
-        """Save to Python format."""
-        content = '"""\nQuiz Questions\nGenerated by Setwise\n"""\n\n'
-        content += f"mcq = {repr(mcq)}\n\n"
-        content += f"subjective = {repr(subjective)}\n"
-        
+    def _save_python(mcq: Iterable[Dict], subjective: Iterable[Dict], file_path: str) -> bool:
+        """Save to Python format, one question per line."""
         with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+            f.write('"""\nQuiz Questions\nGenerated by Setwise\n"""\n\n')
+            for name, questions in (('mcq', mcq), ('subjective', subjective)):
+                if name == 'subjective':
+                    f.write("\n")
+                f.write(f"{name} = [\n")
+                for q in questions:
+                    f.write(f"    {q!r},\n")
+                f.write("]\n")
         return True
 
 
+class MarkdownQuestionParser:
+    """Single-pass, line-oriented parser for Markdown question files.
+    
+    Questions are read from the first '## MCQ' and '## Subjective' sections;
+    a section ends at the next '## ' or at the end of the file::
+    
+        ## MCQ
+        **What is $2 + 2$?**
+        - 3
+        - 4
+        *Answer:* 4
+        
+        ## Subjective
+        **Explain gravity.**
+        Gravity attracts objects with mass.
+    
+    An MCQ block is a line ending in '**question**', its '- option' lines
+    and an '*Answer:* ' line. A subjective question runs from '**' to the
+    first line ending in '**' (it may span lines); its answer is the text up
+    to the next '**'. Each line is looked at a bounded number of times, so
+    parsing is linear in the size of the file.
+    """
+    
+    SECTION_END = '## '
+    HEADINGS = {'## MCQ': 'mcq', '## Subjective': 'subjective'}
+    ANSWER_PREFIX = '*Answer:* '
+    
+    def __init__(self):
+        self.mcq = []
+        self.subjective = []
+        self._section = None
+        self._seen_sections = set()
+        # MCQ block being read: its question (None between blocks) and options
+        self._mcq_question = None
+        self._options = []
+        # Subjective question being read: 'seek', 'question' or 'answer'
+        self._state = 'seek'
+        self._question = ''
+        self._parts = []
+    
+    def parse(self, lines: Iterable[str]) -> Tuple[List[Dict], List[Dict]]:
+        """Parse an iterable of lines (such as an open file) into (mcq, subjective)."""
+        feed = None
+        for line in self._section_lines(lines):
+            cut = line.find(self.SECTION_END)
+            if cut == -1:
+                if feed is not None:
+                    feed(line)
+                continue
+            
+            # '## ' anywhere ends the current section, mid-line included
+            if feed is not None:
+                feed(line[:cut])
+                self._end_section()
+                feed = None
+            
+            if line.endswith('\n'):
+                heading = line.rstrip()
+                for title, section in self.HEADINGS.items():
+                    if heading.endswith(title) and section not in self._seen_sections:
+                        self._seen_sections.add(section)
+                        self._section = section
+                        feed = self._feed_mcq if section == 'mcq' else self._feed_subjective
+        
+        if self._section is not None:
+            self._end_section()
+        return self.mcq, self.subjective
+    
+    @staticmethod
+    def _section_lines(lines: Iterable[str]) -> Iterator[str]:
+        """Yield lines unchanged, except that the final newline of the file is dropped."""
+        previous = None
+        for line in lines:
+            if previous is not None:
+                yield previous
+            previous = line
+        if previous is not None:
+            yield previous[:-1] if previous.endswith('\n') else previous
+    
+    def _end_section(self) -> None:
+        """Finish the current section, dropping any incomplete MCQ block."""
+        if self._section == 'subjective' and self._state == 'answer':
+            self._add_subjective()
+        self._mcq_question = None
+        self._options = []
+        self._state = 'seek'
+        self._parts = []
+        self._section = None
+    
+    def _feed_mcq(self, line: str) -> None:
+        """Advance the MCQ block state machine by one line."""
+        if self._mcq_question is not None:
+            if line.startswith('- ') and line.endswith('\n'):
+                option = line.strip()
+                if option.startswith('- '):
+                    self._options.append(option[2:])
+                return
+            
+            question, options = self._mcq_question, self._options
+            self._mcq_question, self._options = None, []
+            if line.startswith(self.ANSWER_PREFIX):
+                answer = line[len(self.ANSWER_PREFIX):].strip()
+                if question and options and answer:
+                    self.mcq.append({
+                        'question': question,
+                        'options': options,
+                        'answer': answer,
+                        'marks': 1
+                    })
+                return
+            # Incomplete block: this line may start the next one
+        
+        # A question line ends in '**' and holds a '**' before that
+        if line.endswith('**\n'):
+            start = line.find('**')
+            end = len(line) - 3
+            if start + 2 <= end:
+                self._mcq_question = line[start + 2:end].strip()
+    
+    def _feed_subjective(self, line: str) -> None:
+        """Advance the subjective question state machine through one line."""
+        pos = 0
+        while True:
+            if self._state == 'seek':
+                start = line.find('**', pos)
+                if start == -1:
+                    return
+                self._state = 'question'
+                self._parts = []
+                pos = start + 2
+            
+            if self._state == 'question':
+                end = len(line) - 3
+                if line.endswith('**\n') and end >= pos:
+                    self._parts.append(line[pos:end])
+                    self._question = ''.join(self._parts)
+                    self._state = 'answer'
+                    self._parts = []
+                else:
+                    self._parts.append(line[pos:])
+                return
+            
+            # Answer: runs until the next '**', which opens the next question
+            end = line.find('**', pos)
+            if end == -1:
+                self._parts.append(line[pos:])
+                return
+            self._parts.append(line[pos:end])
+            self._add_subjective()
+            pos = end
+    
+    def _add_subjective(self) -> None:
+        """Store the subjective question just read."""
+        question = self._question.strip()
+        answer = ''.join(self._parts).strip()
+        self._state = 'seek'
+        self._parts = []
+        if question:
+            self.subjective.append({
+                'question': question,
+                'answer': answer,
+                'marks': 5
+            })
+
+
 def create_example_files():
     """Create example files in different formats."""
     # Sample data
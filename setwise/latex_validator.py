@@ -7,9 +7,29 @@ and providing helpful error messages for users.
 """
 
 import re
+from bisect import bisect_left
+from collections import Counter
 from typing import List, Dict, Tuple, Optional
 from pathlib import Path
 
+# Tokens of the validation pass: braces, $ and the start of \begin{ / \end{
+LATEX_TOKEN_PATTERN = re.compile(r'[{}$]|\\(begin|end)\{')
+
+# Text without any of these characters cannot produce a validation error
+LATEX_SPECIAL_PATTERN = re.compile(r'[{}$\\^_]')
+
+INCOMPLETE_FRAC_PATTERN = re.compile(r'\\frac\{[^}]*\}\{?\}?$')
+INVALID_MATH_CHARS_PATTERN = re.compile(r'[&%#]')
+
+# Math written outside $...$: (pattern, substring it needs, description)
+BARE_MATH_PATTERNS = [
+    (re.compile(r'\b[a-zA-Z]\^[0-9+]'), '^', "variable with superscript"),
+    (re.compile(r'\b[a-zA-Z]_[0-9+]'), '_', "variable with subscript"),
+    (re.compile(r'\\frac\{[^}]*\}\{[^}]*\}'), '\\frac', "fraction"),
+    (re.compile(r'\\sqrt\{[^}]*\}'), '\\sqrt', "square root"),
+    (re.compile(r'\\sum|\\int|\\lim'), '\\', "mathematical operator"),
+]
+
 
 class LaTeXValidator:
     """Validator for LaTeX syntax in quiz questions."""
@@ -69,61 +89,90 @@ class LaTeXValidator:
             Tuple of (is_valid, list_of_errors)
         """
         errors = []
+        if not LATEX_SPECIAL_PATTERN.search(text):
+            return True, errors
+        
+        # One pass over braces, $ and environment starts
+        dollars = []
+        begin_envs = []
+        end_envs = []
+        envs = {'begin': begin_envs, 'end': end_envs}
+        # Environments are matched like re.findall: no overlap with the previous match
+        env_resume = {'begin': 0, 'end': 0}
+        brace_depth = 0
+        unmatched_close = None
+        
+        for match in LATEX_TOKEN_PATTERN.finditer(text):
+            token = match.group()
+            if token == '$':
+                dollars.append(match.start())
+                continue
+            
+            kind = match.group(1)
+            if kind is not None:
+                # The name runs to the next '}' and must not be empty
+                name_start = match.end()
+                if match.start() >= env_resume[kind]:
+                    name_end = text.find('}', name_start)
+                    if name_end > name_start:
+                        envs[kind].append(text[name_start:name_end])
+                        env_resume[kind] = name_end + 1
+                token = '{'
+            
+            if unmatched_close is None:
+                if token == '{':
+                    brace_depth += 1
+                else:
+                    brace_depth -= 1
+                    if brace_depth < 0:
+                        unmatched_close = match.start()
         
         # Check for unmatched $ delimiters
-        dollar_count = text.count('$')
-        if dollar_count % 2 != 0:
+        if len(dollars) % 2 != 0:
             errors.append("Unmatched $ delimiters - every $ must have a closing $")
         
         # Check for unmatched braces
-        brace_depth = 0
-        for i, char in enumerate(text):
-            if char == '{':
-                brace_depth += 1
-            elif char == '}':
-                brace_depth -= 1
-                if brace_depth < 0:
-                    errors.append(f"Unmatched closing brace at position {i}")
-                    break
-        
-        if brace_depth > 0:
+        if unmatched_close is not None:
+            errors.append(f"Unmatched closing brace at position {unmatched_close}")
+        elif brace_depth > 0:
             errors.append(f"Unmatched opening braces - missing {brace_depth} closing braces")
         
         # Check for unmatched \begin{} and \end{}
-        begin_envs = re.findall(r'\\begin\{([^}]+)\}', text)
-        end_envs = re.findall(r'\\end\{([^}]+)\}', text)
-        
-        for env in begin_envs:
-            if begin_envs.count(env) != end_envs.count(env):
-                errors.append(f"Unmatched \\begin{{{env}}} environment")
+        if begin_envs:
+            begin_counts = Counter(begin_envs)
+            end_counts = Counter(end_envs)
+            for env in begin_envs:
+                if begin_counts[env] != end_counts[env]:
+                    errors.append(f"Unmatched \\begin{{{env}}} environment")
         
         # Check for common LaTeX errors
-        if re.search(r'\\frac\{[^}]*\}\{?\}?$', text):
+        if '\\frac' in text and INCOMPLETE_FRAC_PATTERN.search(text):
             errors.append("Incomplete \\frac command - needs both numerator and denominator")
         
-        if re.search(r'\\sqrt\{\}', text):
+        if '\\sqrt{}' in text:
             errors.append("Empty \\sqrt command")
         
-        # Check for invalid characters in math mode
-        math_sections = re.findall(r'\$([^$]+)\$', text)
-        for math in math_sections:
-            if re.search(r'[&%#]', math):
-                errors.append(f"Invalid characters (&, %, #) in math mode: {math}")
+        # Check for invalid characters in math mode ($...$ pairs with content)
+        if len(dollars) > 1 and INVALID_MATH_CHARS_PATTERN.search(text):
+            i = 0
+            while i + 1 < len(dollars):
+                start, end = dollars[i], dollars[i + 1]
+                if end == start + 1:
+                    i += 1
+                    continue
+                math = text[start + 1:end]
+                if INVALID_MATH_CHARS_PATTERN.search(math):
+                    errors.append(f"Invalid characters (&, %, #) in math mode: {math}")
+                i += 2
         
         # Check for potential math expressions without $ delimiters
         if not LaTeXValidator._is_in_math_environment(text):
-            math_patterns = [
-                (r'\b[a-zA-Z]\^[0-9+]', "variable with superscript"),
-                (r'\b[a-zA-Z]_[0-9+]', "variable with subscript"), 
-                (r'\\frac\{[^}]*\}\{[^}]*\}', "fraction"),
-                (r'\\sqrt\{[^}]*\}', "square root"),
-                (r'\\sum|\\int|\\lim', "mathematical operator")
-            ]
-            
-            for pattern, description in math_patterns:
-                matches = re.findall(pattern, text)
-                for match in matches:
-                    if not LaTeXValidator._is_in_math_mode(text, match):
+            for pattern, needs, description in BARE_MATH_PATTERNS:
+                if needs not in text:
+                    continue
+                for match in pattern.findall(text):
+                    # In math mode if an odd number of $ precede its first occurrence
+                    if bisect_left(dollars, text.find(match)) % 2 == 0:
                         errors.append(f"Math expression '{match}' ({description}) should be in math mode: ${match}$")
         
         return len(errors) == 0, errors
@@ -163,8 +212,8 @@ class LaTeXValidator:
         fixed_text = text
         
         # Apply common fixes
-        for pattern, replacement in LaTeXValidator.COMMON_FIXES.items():
-            fixed_text = re.sub(pattern, replacement, fixed_text)
+        for pattern, replacement in COMPILED_FIXES:
+            fixed_text = pattern.sub(replacement, fixed_text)
         
         return fixed_text
     
@@ -283,6 +332,11 @@ COMMON MISTAKES:
 """
 
 
+# LaTeXValidator.COMMON_FIXES, compiled once
+COMPILED_FIXES = [(re.compile(pattern), replacement)
+                  for pattern, replacement in LaTeXValidator.COMMON_FIXES.items()]
+
+
 class LaTeXErrorFixer:
     """Automatic LaTeX error fixing utilities."""
     
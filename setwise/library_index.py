@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Question Library Index
+
+Finds question libraries with one pruned walk per search directory and
+remembers what was learned about each file. Entries are keyed by the
+file's path and reused while its modification time and size are unchanged
+(and the validation rules are the same), so listing a large tree again only
+loads and validates the libraries that changed.
+"""
+
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .bank_cache import CACHE_DIR_NAME, read_cache_file, write_cache_file
+from .validation_cache import ValidationCache
+
+# Bump when the layout of index entries changes
+INDEX_VERSION = 1
+
+# Files (inside CACHE_DIR_NAME of a search directory) holding its index,
+# kept apart for listings that executed Python question files
+INDEX_FILE_NAME = "libraries.marshal"
+EXEC_INDEX_FILE_NAME = "libraries-exec.marshal"
+
+# Extensions of question files that can be listed
+LIBRARY_EXTENSIONS = ('.py', '.yaml', '.yml', '.json', '.csv', '.md')
+
+# Directories never searched for question files
+IGNORED_DIRS = frozenset({
+    '.git', '.hg', '.svn', '.tox', '.nox', '.eggs', '.venv', 'venv', 'env',
+    'node_modules', 'site-packages', '__pycache__', CACHE_DIR_NAME,
+    '.mypy_cache', '.pytest_cache', '.ruff_cache', 'build', 'dist',
+})
+
+
+def is_ignored_dir(path: str, name: str) -> bool:
+    """Return True if a directory should not be searched."""
+    if name in IGNORED_DIRS or name.endswith('.egg-info'):
+        return True
+    # Virtual environments under any name
+    return os.path.exists(os.path.join(path, 'pyvenv.cfg'))
+
+
+def is_library_file(name: str) -> bool:
+    """Return True for file names like *questions*.py, *questions*.yaml, ..."""
+    stem, ext = os.path.splitext(name)
+    return ext in LIBRARY_EXTENSIONS and 'questions' in stem
+
+
+def scan_question_files(root: str) -> Iterator[os.DirEntry]:
+    """Yield question files under root, walking the tree once.
+
+    Ignored directories (version control, virtual environments,
+    node_modules, caches) are pruned rather than descended into, and
+    symbolic links to directories are not followed.
+    """
+    pending = [root]
+    while pending:
+        directory = pending.pop()
+        try:
+            with os.scandir(directory) as entries:
+                entries = sorted(entries, key=lambda entry: entry.name)
+        except OSError:
+            continue
+        subdirs = []
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if not is_ignored_dir(entry.path, entry.name):
+                        subdirs.append(entry.path)
+                elif entry.is_file() and is_library_file(entry.name):
+                    yield entry
+            except OSError:
+                continue
+        # Visit subdirectories in name order
+        pending.extend(reversed(subdirs))
+
+
+class LibraryIndex:
+    """Cached library listings for one search directory."""
+
+    def __init__(self, root: Path, allow_exec: bool = False):
+        """Load the index for a search directory, if any.
+
+        Args:
+            root: Search directory
+            allow_exec: Whether libraries are listed with Python files executed
+        """
+        self.root = Path(root)
+        self.allow_exec = allow_exec
+        self.entries: Dict[str, Dict[str, Any]] = self._read()
+        self.changed = False
+
+    @staticmethod
+    def index_path(root: Path, allow_exec: bool = False) -> Path:
+        """Return where the index for a search directory is stored."""
+        return root / CACHE_DIR_NAME / (EXEC_INDEX_FILE_NAME if allow_exec else INDEX_FILE_NAME)
+
+    @staticmethod
+    def _header() -> Dict[str, Any]:
+        """Describe what the indexed entries depend on."""
+        return {'version': INDEX_VERSION, 'rules': ValidationCache.rules_key()}
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        """Return the stored entries, or nothing if missing or outdated."""
+        cached = read_cache_file(self.index_path(self.root, self.allow_exec))
+        if cached is None:
+            return {}
+        header, entries = cached
+        if header != self._header() or not isinstance(entries, dict):
+            return {}
+        return entries
+
+    def lookup(self, path: str, stat: os.stat_result) -> Optional[Dict[str, Any]]:
+        """Return the indexed library for path if the file is unchanged."""
+        record = self.entries.get(path)
+        if record is None or (record['mtime_ns'], record['size']) != (stat.st_mtime_ns, stat.st_size):
+            return None
+        return record['library']
+
+    def record(self, path: str, stat: os.stat_result, library: Dict[str, Any]) -> None:
+        """Remember a library as listed for the file's current state."""
+        self.entries[path] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'library': library}
+        self.changed = True
+
+    def retain(self, paths: Iterable[str]) -> None:
+        """Forget files that were not found by the latest scan."""
+        paths = set(paths)
+        if paths != set(self.entries):
+            self.entries = {path: record for path, record in self.entries.items() if path in paths}
+            self.changed = True
+
+    def save(self) -> bool:
+        """Write the index back into the search directory.
+
+        Failures (such as read-only directories) are not errors: the
+        libraries are simply loaded again next time.
+
+        Returns:
+            True if the index was written, False otherwise
+        """
+        if not self.changed:
+            return True
+
+        if not write_cache_file(self.index_path(self.root, self.allow_exec), self._header(), self.entries):
+            return False
+        self.changed = False
+        return True
+
+
+def search_roots(search_dirs: List[str]) -> List[Path]:
+    """Return the existing search directories, skipping ones inside another.
+
+    A directory inside an earlier one (such as 'examples' after '.') is
+    already covered by that directory's walk, unless the walk prunes it.
+    """
+    def covers(root: Path, path: Path) -> bool:
+        if path == root:
+            return True
+        if root not in path.parents:
+            return False
+        return not any(is_ignored_dir(str(root.joinpath(*path.relative_to(root).parts[:i + 1])), part)
+                       for i, part in enumerate(path.relative_to(root).parts))
+
+    roots: List[Path] = []
+    for search_dir in search_dirs:
+        path = Path(search_dir)
+        if not path.is_dir():
+            continue
+        resolved = path.resolve()
+        if any(covers(root.resolve(), resolved) for root in roots):
+            continue
+        roots = [root for root in roots if not covers(resolved, root.resolve())]
+        roots.append(path)
+    return roots
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Generation Profiling
+
+Lightweight per-stage timing for quiz generation runs, used by
+``setwise generate --profile`` to report where a run spends its time.
+"""
+
+import json
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+
+class StageTimer:
+    """Accumulates wall-clock time per named stage of a generation run."""
+
+    def __init__(self):
+        # name -> [count, total_seconds, max_seconds]
+        self._stages: Dict[str, list] = {}
+        # Compile stages may be timed from worker threads
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time the enclosed block and add it to the named stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float) -> None:
+        """Add one timed occurrence of a stage."""
+        with self._lock:
+            stats = self._stages.setdefault(name, [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += seconds
+            stats[2] = max(stats[2], seconds)
+
+    def reset(self) -> None:
+        """Discard all recorded timings."""
+        with self._lock:
+            self._stages.clear()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return recorded timings as a JSON-serializable dictionary."""
+        with self._lock:
+            stages = {
+                name: {
+                    'count': count,
+                    'total_seconds': total,
+                    'mean_seconds': total / count if count else 0.0,
+                    'max_seconds': maximum
+                }
+                for name, (count, total, maximum) in self._stages.items()
+            }
+        return {
+            'stages': stages,
+            'total_seconds': sum(s['total_seconds'] for s in stages.values())
+        }
+
+    def summary_table(self) -> str:
+        """Return a human-readable table of stages, slowest first."""
+        data = self.to_dict()
+        grand_total = data['total_seconds'] or 1.0
+
+        lines = ["Generation Profile:", "=" * 72]
+        lines.append(f"{'Stage':<28}{'Calls':>8}{'Total (s)':>12}{'Mean (ms)':>12}{'Share':>10}")
+        lines.append("-" * 72)
+        ordered = sorted(data['stages'].items(), key=lambda item: item[1]['total_seconds'], reverse=True)
+        for name, stats in ordered:
+            lines.append(
+                f"{name:<28}{stats['count']:>8}{stats['total_seconds']:>12.3f}"
+                f"{stats['mean_seconds'] * 1000:>12.2f}{stats['total_seconds'] / grand_total:>10.1%}"
+            )
+        lines.append("-" * 72)
+        lines.append(f"{'Total':<28}{'':>8}{data['total_seconds']:>12.3f}")
+        return "\n".join(lines)
+
+    def write_json(self, path: str) -> None:
+        """Write recorded timings to a JSON file."""
+        with open(Path(path), 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Shared Question Banks
+
+A QuestionBank holds the questions and metadata loaded from one questions
+file. The process-wide QuestionBankRegistry keeps recently used banks in
+memory, so that a long-running process (for example a web worker) creating
+many QuizGenerator instances for the same course loads each file only once.
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .bank_cache import QuestionBankCache
+from .formats import QuestionFormatConverter
+
+# Question file formats a bank can be loaded from
+SUPPORTED_FORMATS = ('python', 'yaml', 'json', 'csv', 'markdown')
+
+
+class QuestionBank:
+    """Questions and metadata loaded from a questions file.
+
+    Banks may be shared between QuizGenerator instances and threads, so
+    treat them as read-only.
+    """
+
+    # Questions measured per list when estimating the size of large banks
+    SIZE_SAMPLE = 100
+
+    def __init__(self, mcq: List[Dict[str, Any]], subjective: List[Dict[str, Any]],
+                 quiz_metadata: Optional[Dict[str, Any]] = None,
+                 source: Optional[Path] = None):
+        """Initialize a question bank.
+
+        Args:
+            mcq: Multiple choice questions
+            subjective: Subjective questions
+            quiz_metadata: Quiz metadata from the questions file (optional)
+            source: File the bank was loaded from (optional)
+        """
+        self.mcq = mcq
+        self.subjective = subjective
+        self.quiz_metadata = quiz_metadata or {}
+        self.source = source
+
+    def __repr__(self) -> str:
+        return (f"QuestionBank({len(self.mcq)} mcq, {len(self.subjective)} subjective, "
+                f"source={str(self.source) if self.source else None!r})")
+
+    @classmethod
+    def from_file(cls, path: str, use_cache: bool = True, allow_exec: bool = False) -> 'QuestionBank':
+        """Load a bank from a questions file, through the on-disk bank cache.
+
+        Python, YAML, JSON, CSV and Markdown files are supported; see
+        QuestionFormatConverter.load_bank. Python files are only executed
+        when allow_exec is set.
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+            ValueError: If the file format is not supported
+        """
+        source = Path(path)
+        if not source.exists():
+            raise FileNotFoundError(f"Questions file not found: {path}")
+        if QuestionFormatConverter.detect_format(path) not in SUPPORTED_FORMATS:
+            raise ValueError(f"Unsupported questions file format: {source.suffix}")
+
+        loader = partial(QuestionFormatConverter.load_bank, allow_exec=allow_exec)
+        data = QuestionBankCache.load_or_build(source, loader, use_cache, allow_exec)
+        return cls(data['mcq'], data['subjective'], data['quiz_metadata'], source)
+
+    def estimated_size(self) -> int:
+        """Approximate memory held by the bank's questions and metadata, in bytes.
+
+        Large question lists are estimated from an evenly spaced sample.
+        """
+        total = _deep_size(self.quiz_metadata)
+        for questions in (self.mcq, self.subjective):
+            if len(questions) <= self.SIZE_SAMPLE:
+                total += _deep_size(questions)
+                continue
+            step = len(questions) / self.SIZE_SAMPLE
+            sample = [questions[int(i * step)] for i in range(self.SIZE_SAMPLE)]
+            per_question = sum(_deep_size(q) for q in sample) / self.SIZE_SAMPLE
+            total += sys.getsizeof(questions) + int(per_question * len(questions))
+        return total
+
+
+def _deep_size(obj: Any) -> int:
+    """Size of an object and the containers and values it references, in bytes."""
+    seen = set()
+    total = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set)):
+            stack.extend(item)
+    return total
+
+
+class QuestionBankRegistry:
+    """Thread-safe LRU cache of loaded question banks, keyed by file and mtime."""
+
+    # Defaults: keep up to 32 banks, using at most 512 MB
+    DEFAULT_MAX_BANKS = 32
+    DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+    def __init__(self, max_banks: int = DEFAULT_MAX_BANKS, max_bytes: int = DEFAULT_MAX_BYTES):
+        """Initialize the registry.
+
+        Args:
+            max_banks: Maximum number of banks kept in memory
+            max_bytes: Approximate memory limit for all kept banks
+        """
+        self.max_banks = max_banks
+        self.max_bytes = max_bytes
+        # (resolved path, mtime_ns, size, allow_exec) -> (bank, estimated bytes)
+        self._banks: 'OrderedDict[Tuple[str, int, int, bool], Tuple[QuestionBank, int]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._banks)
+
+    @property
+    def total_bytes(self) -> int:
+        """Approximate memory held by all kept banks."""
+        with self._lock:
+            return sum(size for _, size in self._banks.values())
+
+    def get(self, path: str, allow_exec: bool = False) -> QuestionBank:
+        """Return the bank for a questions file, loading it if needed.
+
+        A bank is reused while the file's modification time and size are
+        unchanged; editing the file loads it again. allow_exec is passed to
+        QuestionBank.from_file, and banks loaded with it are kept apart so
+        a static load never receives an executed bank.
+        """
+        source = Path(path).resolve()
+        stat = source.stat()
+        key = (str(source), stat.st_mtime_ns, stat.st_size, allow_exec)
+
+        with self._lock:
+            entry = self._banks.get(key)
+            if entry is not None:
+                self._banks.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        # Load outside the lock so other files can be served meanwhile
+        bank = QuestionBank.from_file(str(source), allow_exec=allow_exec)
+        size = bank.estimated_size()
+
+        with self._lock:
+            # Drop older versions of the same file
+            for old_key in [k for k in self._banks if k[0] == key[0] and k[1:3] != key[1:3]]:
+                del self._banks[old_key]
+            self._banks[key] = (bank, size)
+            self._banks.move_to_end(key)
+            self._evict()
+        return bank
+
+    def _evict(self) -> None:
+        """Drop least recently used banks until within both limits (lock held)."""
+        total = sum(size for _, size in self._banks.values())
+        # Always keep the most recent bank, even if it alone exceeds max_bytes
+        while len(self._banks) > 1 and (len(self._banks) > self.max_banks or total > self.max_bytes):
+            _, (_, size) = self._banks.popitem(last=False)
+            total -= size
+
+    def clear(self) -> None:
+        """Forget all kept banks."""
+        with self._lock:
+            self._banks.clear()
+
+
+# Registry shared by every QuizGenerator in this process
+default_registry = QuestionBankRegistry()
@@ -5,133 +5,360 @@ Question Library Management System
 Provides utilities for managing, validating, and listing question libraries.
 """
 
-import importlib.util
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
 from pathlib import Path
 from typing import List, Dict, Any, Tuple, Optional
 import sys
 from .latex_validator import LaTeXValidator, LaTeXErrorFixer
+from .bank_cache import QuestionBankCache
+from .question_bank import SUPPORTED_FORMATS
+from .formats import QuestionFormatConverter
+from .validation_cache import ValidationCache
+from .library_index import LibraryIndex, scan_question_files, search_roots
+
+
+# Questions sent to a worker process at a time when validating in parallel
+VALIDATION_CHUNK_SIZE = 500
+
+# Section labels used in validation messages
+SECTION_LABELS = {'mcq': 'MCQ', 'subjective': 'Subjective'}
+
+
+class ValidationReport:
+    """Result of validating a questions file, with every error found."""
+    
+    def __init__(self, file_path: str):
+        """Initialize an empty report.
+        
+        Args:
+            file_path: The validated questions file
+        """
+        self.file_path = file_path
+        self.mcq_count = 0
+        self.subjective_count = 0
+        # Problem with the file as a whole (missing, unreadable, wrong structure)
+        self.file_error: Optional[str] = None
+        # Per-question errors: {'section': 'mcq'|'subjective', 'index': 0-based, 'message': str}
+        self.errors: List[Dict[str, Any]] = []
+    
+    @property
+    def is_valid(self) -> bool:
+        """True if the file loaded and no question has errors."""
+        return self.file_error is None and not self.errors
+    
+    @property
+    def message(self) -> str:
+        """One-line summary: the first error, or the question counts if valid."""
+        if self.file_error is not None:
+            return self.file_error
+        if self.errors:
+            return self.errors[0]['message']
+        return (f"Valid questions file with {self.mcq_count} MCQ "
+                f"and {self.subjective_count} subjective questions")
+    
+    def add_error(self, section: str, index: int, message: str) -> None:
+        """Record an error for one question."""
+        self.errors.append({'section': section, 'index': index, 'message': message})
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the report as a JSON-serializable dictionary."""
+        return {
+            'file_path': self.file_path,
+            'valid': self.is_valid,
+            'mcq_count': self.mcq_count,
+            'subjective_count': self.subjective_count,
+            'file_error': self.file_error,
+            'errors': list(self.errors),
+        }
+
+
+def _validate_chunk(section: str, items: List[Tuple[int, Any]]) -> List[Tuple[int, Optional[str]]]:
+    """Validate questions of one section (runs in worker processes).
+    
+    Args:
+        section: 'mcq' or 'subjective'
+        items: (index, question) pairs
+        
+    Returns:
+        (index, problem) for every question, with None for valid ones
+    """
+    results = []
+    for index, question in items:
+        try:
+            problem = QuestionManager.find_problem(section, question)
+        except Exception as e:
+            problem = f"could not be validated: {e}"
+        results.append((index, problem))
+    return results
+
+
+def _describe_library(path: str, stat: os.stat_result, validate: bool = True,
+                      allow_exec: bool = False) -> Dict[str, Any]:
+    """Describe one question library for list_question_libraries (runs in worker processes)."""
+    library = {
+        'path': path,
+        'name': Path(path).stem,
+        'format': QuestionFormatConverter.detect_format(path),
+        'valid': None,
+        'info': "Not validated",
+        'errors': 0,
+        'size': stat.st_size,
+    }
+    if validate:
+        report = QuestionManager.validate_questions_report(path, jobs=1, allow_exec=allow_exec)
+        library.update(valid=report.is_valid, info=report.message, errors=len(report.errors))
+    return library
 
 
 class QuestionManager:
     """Manager for question libraries and validation."""
     
     @staticmethod
-    def validate_questions_file(file_path: str) -> Tuple[bool, str]:
-        """Validate a Python questions file format and structure (.py only).
+    def validate_questions_file(file_path: str, allow_exec: bool = False) -> Tuple[bool, str]:
+        """Validate a questions file format and structure, stopping at the first error.
         
         Args:
-            file_path: Path to the Python questions file (.py)
+            file_path: Path to the questions file (.py, .yaml, .json, .csv or .md)
+            allow_exec: Execute Python files whose questions are built by code
             
         Returns:
             Tuple of (is_valid, message)
         """
+        report = QuestionManager.validate_questions_report(file_path, jobs=1, fail_fast=True,
+                                                           allow_exec=allow_exec)
+        return report.is_valid, report.message
+    
+    @staticmethod
+    def validate_questions_report(file_path: str, jobs: Optional[int] = None,
+                                  chunk_size: int = VALIDATION_CHUNK_SIZE,
+                                  fail_fast: bool = False,
+                                  use_cache: bool = True,
+                                  allow_exec: bool = False) -> ValidationReport:
+        """Validate every question in a file and collect all errors.
+        
+        Large banks are split into chunks that are validated in parallel
+        worker processes; errors are reported in question order either way.
+        Questions unchanged since the last run reuse their cached result
+        (see ValidationCache).
+        
+        Args:
+            file_path: Path to the questions file (.py, .yaml, .json, .csv or .md)
+            jobs: Worker processes to use (default: one per CPU; 1 validates in-process)
+            chunk_size: Questions per worker task
+            fail_fast: Stop at the first question with an error
+            use_cache: Set to False to validate every question and skip the cache
+            allow_exec: Execute Python files whose questions are built by code
+                (only for trusted files; see QuestionFormatConverter.load_bank)
+            
+        Returns:
+            ValidationReport for the file
+        """
+        report = ValidationReport(file_path)
         try:
             questions_path = Path(file_path)
             if not questions_path.exists():
-                return False, f"File not found: {file_path}"
+                report.file_error = f"File not found: {file_path}"
+                return report
             
-            # Ensure it's a Python file
-            if questions_path.suffix.lower() != '.py':
-                return False, f"Only Python files (.py) are supported. Got: {questions_path.suffix}"
+            # Ensure it's a format we can load
+            if QuestionFormatConverter.detect_format(file_path) not in SUPPORTED_FORMATS:
+                report.file_error = f"Unsupported questions file format: {questions_path.suffix}"
+                return report
             
-            # Load questions from Python file
-            import importlib.util
-            spec = importlib.util.spec_from_file_location("questions", questions_path)
-            if spec is None or spec.loader is None:
-                return False, f"Could not load Python module from {questions_path}"
+            # Load questions from the file (or its cached copy if unchanged)
+            try:
+                loader = partial(QuestionFormatConverter.load_bank, allow_exec=allow_exec)
+                bank = QuestionBankCache.load_or_build(questions_path, loader, allow_exec=allow_exec)
+            except ImportError:
+                report.file_error = f"Could not load Python module from {questions_path}"
+                return report
             
-            questions_module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(questions_module)
+            # Validate structure
+            sections = {'mcq': bank['mcq'], 'subjective': bank['subjective']}
+            for section, questions in sections.items():
+                if not isinstance(questions, list):
+                    report.file_error = f"'{section}' must be a list"
+                    return report
+            report.mcq_count = len(sections['mcq'])
+            report.subjective_count = len(sections['subjective'])
             
-            # Extract questions
-            mcq = getattr(questions_module, 'mcq', [])
-            subjective = getattr(questions_module, 'subjective', [])
+            cache = ValidationCache(questions_path) if use_cache else None
+            if fail_fast:
+                try:
+                    for section, questions in sections.items():
+                        for index, question in enumerate(questions):
+                            problem = QuestionManager._cached_problem(cache, section, question)
+                            if problem is not None:
+                                report.add_error(section, index, QuestionManager._describe(section, index, problem))
+                                return report
+                finally:
+                    if cache is not None:
+                        cache.save()
+                return report
             
-            # Validate structure
-            if not isinstance(mcq, list):
-                return False, "'mcq' must be a list"
+            # Look up unchanged questions, and validate the rest
+            problems = {}
+            pending = {section: [] for section in sections}
+            keys = {}
+            for section, questions in sections.items():
+                for index, question in enumerate(questions):
+                    if cache is not None:
+                        key = keys[section, index] = ValidationCache.question_key(section, question)
+                        hit, problem = cache.get(key)
+                        if hit:
+                            problems[section, index] = problem
+                            continue
+                    pending[section].append((index, question))
             
-            if not isinstance(subjective, list):
-                return False, "'subjective' must be a list"
+            chunks = [(section, items[start:start + chunk_size])
+                      for section, items in pending.items()
+                      for start in range(0, len(items), chunk_size)]
+            if jobs is None:
+                jobs = os.cpu_count() or 1
+            if jobs <= 1 or len(chunks) <= 1:
+                checked = [_validate_chunk(*chunk) for chunk in chunks]
+            else:
+                checked = QuestionManager._validate_chunks_parallel(chunks, jobs)
             
-            if not isinstance(mcq, list):
-                return False, "'mcq' must be a list"
+            for (section, _), results in zip(chunks, checked):
+                for index, problem in results:
+                    problems[section, index] = problem
+                    if cache is not None:
+                        cache.put(keys[section, index], problem)
+            if cache is not None:
+                cache.save(prune=True)
             
-            if not isinstance(subjective, list):
-                return False, "'subjective' must be a list"
+            for section, questions in sections.items():
+                for index in range(len(questions)):
+                    problem = problems[section, index]
+                    if problem is not None:
+                        report.add_error(section, index, QuestionManager._describe(section, index, problem))
             
-            # Validate MCQ format (now supports both regular and templated questions)
-            for i, q in enumerate(mcq):
-                if not isinstance(q, dict):
-                    return False, f"MCQ question {i+1} must be a dictionary"
-                
-                # Check for either 'question' or 'template' field (like subjective questions)
-                if 'question' not in q and 'template' not in q:
-                    return False, f"MCQ question {i+1} must have either 'question' or 'template' field"
-                
-                # Required fields for all MCQ questions
-                required_fields = ['options', 'answer']
-                for field in required_fields:
-                    if field not in q:
-                        return False, f"MCQ question {i+1} missing required field: {field}"
-                
-                # If template is used, validate variables
-                if 'template' in q:
-                    if 'variables' not in q:
-                        return False, f"MCQ question {i+1} with template must have 'variables' field"
-                    
-                    if not isinstance(q['variables'], list):
-                        return False, f"MCQ question {i+1} 'variables' must be a list"
-                
-                if not isinstance(q['options'], list):
-                    return False, f"MCQ question {i+1} 'options' must be a list"
-                
-                if len(q['options']) < 2:
-                    return False, f"MCQ question {i+1} must have at least 2 options"
-                
-                # For templated questions, we can't validate answer in options at this stage
-                # (will be validated after template rendering)
-                if 'question' in q and q['answer'] not in q['options']:
-                    return False, f"MCQ question {i+1} answer must be one of the options"
-                
-                # Validate LaTeX syntax
-                is_valid, latex_errors = LaTeXValidator.validate_question_dict(q)
-                if not is_valid:
-                    return False, f"MCQ question {i+1} LaTeX errors: {'; '.join(latex_errors)}"
+        except Exception as e:
+            report.file_error = f"Error validating file: {str(e)}"
+        
+        return report
+    
+    @staticmethod
+    def _validate_chunks_parallel(chunks: List[Tuple[str, List[Tuple[int, Any]]]],
+                                  jobs: int) -> List[List[Tuple[int, Optional[str]]]]:
+        """Validate chunks across a process pool, falling back to this process.
+        
+        Banks holding values that cannot be sent to another process (such as
+        lambdas in questions.py) are validated in-process instead.
+        """
+        try:
+            with ProcessPoolExecutor(max_workers=min(jobs, len(chunks))) as executor:
+                return list(executor.map(_validate_chunk, *zip(*chunks)))
+        except (pickle.PicklingError, TypeError, AttributeError, OSError, BrokenProcessPool):
+            return [_validate_chunk(*chunk) for chunk in chunks]
+    
+    @staticmethod
+    def _cached_problem(cache: Optional[ValidationCache], section: str, question: Any) -> Optional[str]:
+        """Return a question's problem, from the validation cache when unchanged."""
+        if cache is None:
+            return QuestionManager.find_problem(section, question)
+        key = ValidationCache.question_key(section, question)
+        hit, problem = cache.get(key)
+        if not hit:
+            problem = QuestionManager.find_problem(section, question)
+            cache.put(key, problem)
+        return problem
+    
+    @staticmethod
+    def _describe(section: str, index: int, problem: str) -> str:
+        """Prefix a problem with the question it belongs to."""
+        return f"{SECTION_LABELS[section]} question {index+1} {problem}"
+    
+    @staticmethod
+    def check_question(section: str, index: int, q: Any) -> Optional[str]:
+        """Check one question's structure and LaTeX.
+        
+        Args:
+            section: 'mcq' or 'subjective'
+            index: 0-based position of the question in its section
+            q: The question
+            
+        Returns:
+            The first problem found, or None if the question is valid
+        """
+        problem = QuestionManager.find_problem(section, q)
+        if problem is None:
+            return None
+        return QuestionManager._describe(section, index, problem)
+    
+    @staticmethod
+    def find_problem(section: str, q: Any) -> Optional[str]:
+        """Return the first problem with a question, without saying which question it is.
+        
+        Args:
+            section: 'mcq' or 'subjective'
+            q: The question
+            
+        Returns:
+            Description such as "must be a dictionary", or None if the question is valid
+        """
+        if not isinstance(q, dict):
+            return "must be a dictionary"
+        
+        # Check for either 'question' or 'template' field
+        if 'question' not in q and 'template' not in q:
+            return "must have either 'question' or 'template' field"
+        
+        # Required fields for all MCQ questions
+        if section == 'mcq':
+            for field in ['options', 'answer']:
+                if field not in q:
+                    return f"missing required field: {field}"
+        
+        # If template is used, validate variables
+        if 'template' in q:
+            if 'variables' not in q:
+                return "with template must have 'variables' field"
             
-            # Validate subjective format
-            for i, q in enumerate(subjective):
-                if not isinstance(q, dict):
-                    return False, f"Subjective question {i+1} must be a dictionary"
-                
-                # Check for either 'question' or 'template' field
-                if 'question' not in q and 'template' not in q:
-                    return False, f"Subjective question {i+1} must have either 'question' or 'template' field"
-                
-                # If template is used, validate variables
-                if 'template' in q:
-                    if 'variables' not in q:
-                        return False, f"Subjective question {i+1} with template must have 'variables' field"
-                    
-                    if not isinstance(q['variables'], list):
-                        return False, f"Subjective question {i+1} 'variables' must be a list"
-                
-                # Validate LaTeX syntax
-                is_valid, latex_errors = LaTeXValidator.validate_question_dict(q)
-                if not is_valid:
-                    return False, f"Subjective question {i+1} LaTeX errors: {'; '.join(latex_errors)}"
+            if not isinstance(q['variables'], list):
+                return "'variables' must be a list"
+        
+        if section == 'mcq':
+            if not isinstance(q['options'], list):
+                return "'options' must be a list"
             
-            return True, f"Valid questions file with {len(mcq)} MCQ and {len(subjective)} subjective questions"
+            if len(q['options']) < 2:
+                return "must have at least 2 options"
             
-        except Exception as e:
-            return False, f"Error validating file: {str(e)}"
+            # For templated questions, we can't validate answer in options at this stage
+            # (will be validated after template rendering)
+            if 'question' in q and q['answer'] not in q['options']:
+                return "answer must be one of the options"
+        
+        # Validate LaTeX syntax
+        is_valid, latex_errors = LaTeXValidator.validate_question_dict(q)
+        if not is_valid:
+            return f"LaTeX errors: {'; '.join(latex_errors)}"
+        
+        return None
     
     @staticmethod
-    def list_question_libraries(search_dirs: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    def list_question_libraries(search_dirs: Optional[List[str]] = None, validate: bool = True,
+                                jobs: Optional[int] = None, use_index: bool = True,
+                                allow_exec: bool = False) -> List[Dict[str, Any]]:
         """Find and list available question libraries (supports multiple formats).
         
+        Each search directory is walked once, skipping version control,
+        virtual environment and cache directories. Libraries unchanged since
+        they were last listed are taken from the directory's LibraryIndex;
+        the others are validated, in parallel when there are several.
+        
         Args:
             search_dirs: Directories to search for question files
+            validate: Set to False to list new or changed files without loading them
+            jobs: Worker processes for validating libraries (default: one per CPU)
+            use_index: Set to False to validate every library and skip the index
+            allow_exec: Execute Python files whose questions are built by code
             
         Returns:
             List of dictionaries with library information
@@ -141,28 +368,57 @@ class QuestionManager:
         
         libraries = []
         
-        # Supported extensions
-        extensions = ['*.py', '*.yaml', '*.yml', '*.json', '*.csv', '*.md']
-        
-        for search_dir in search_dirs:
-            search_path = Path(search_dir)
-            if search_path.exists():
-                # Look for question files with supported extensions
-                for extension in extensions:
-                    for question_file in search_path.rglob(f"*questions*{extension[1:]}"):
-                        is_valid, message = QuestionManager.validate_questions_file(str(question_file))
-                    
-                        libraries.append({
-                            'path': str(question_file),
-                            'name': question_file.stem,
-                            'format': QuestionFormatConverter.detect_format(str(question_file)),
-                            'valid': is_valid,
-                            'info': message,
-                            'size': question_file.stat().st_size if question_file.exists() else 0
-                        })
+        for root in search_roots(search_dirs):
+            index = LibraryIndex(root, allow_exec) if use_index else None
+            found = []
+            for entry in scan_question_files(str(root)):
+                try:
+                    found.append((os.path.relpath(entry.path, root), str(Path(entry.path)), entry.stat()))
+                except OSError:
+                    continue
+            
+            # Reuse indexed libraries whose files are unchanged
+            listed = {}
+            pending = []
+            for key, path, stat in found:
+                library = index.lookup(key, stat) if index is not None else None
+                if library is not None:
+                    listed[key] = dict(library, path=path)
+                elif validate:
+                    pending.append((key, path, stat))
+                else:
+                    listed[key] = _describe_library(path, stat, validate=False)
+            
+            described = QuestionManager._describe_libraries(pending, jobs, allow_exec)
+            for (key, path, stat), library in zip(pending, described):
+                listed[key] = library
+                if index is not None:
+                    index.record(key, stat, library)
+            
+            if index is not None:
+                index.retain(key for key, _, _ in found)
+                index.save()
+            libraries.extend(listed[key] for key, _, _ in found)
         
         return libraries
     
+    @staticmethod
+    def _describe_libraries(pending: List[Tuple[str, str, os.stat_result]],
+                            jobs: Optional[int], allow_exec: bool = False) -> List[Dict[str, Any]]:
+        """Validate libraries across a process pool, falling back to this process."""
+        if jobs is None:
+            jobs = os.cpu_count() or 1
+        describe = partial(_describe_library, allow_exec=allow_exec)
+        paths = [path for _, path, _ in pending]
+        stats = [stat for _, _, stat in pending]
+        if jobs > 1 and len(pending) > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=min(jobs, len(pending))) as executor:
+                    return list(executor.map(describe, paths, stats))
+            except (OSError, BrokenProcessPool):
+                pass
+        return [describe(path, stat) for path, stat in zip(paths, stats)]
+    
     @staticmethod
     def create_sample_questions_file(output_path: str) -> bool:
         """Create a sample questions.py file template.
@@ -240,11 +496,12 @@ subjective = [
             return False
     
     @staticmethod
-    def get_question_stats(file_path: str) -> Dict[str, Any]:
+    def get_question_stats(file_path: str, allow_exec: bool = False) -> Dict[str, Any]:
         """Get statistics about a questions file (supports multiple formats).
         
         Args:
             file_path: Path to the questions file (.py, .yaml, .json, .csv, .md)
+            allow_exec: Execute Python files whose questions are built by code
             
         Returns:
             Dictionary with statistics
@@ -255,30 +512,20 @@ subjective = [
                 return {"error": "File not found"}
             
             # Load questions using format converter
-            mcq, subjective = QuestionFormatConverter.load_questions(file_path)
+            mcq, subjective = QuestionFormatConverter.load_questions(file_path, allow_exec)
             format_type = QuestionFormatConverter.detect_format(file_path)
             
             stats = {
                 "file_path": str(questions_path),
+                "format": format_type,
                 "file_size": questions_path.stat().st_size,
-                "mcq_count": 0,
-                "subjective_count": 0,
-                "total_mcq_marks": 0,
-                "total_subjective_marks": 0,
-                "templated_subjective": 0
+                "mcq_count": len(mcq),
+                "subjective_count": len(subjective),
+                "total_mcq_marks": sum(q.get("marks", 1) for q in mcq),
+                "total_subjective_marks": sum(q.get("marks", 5) for q in subjective),
+                "templated_subjective": sum(1 for q in subjective if "template" in q)
             }
             
-            if hasattr(questions_module, 'mcq'):
-                mcq = questions_module.mcq
-                stats["mcq_count"] = len(mcq)
-                stats["total_mcq_marks"] = sum(q.get("marks", 1) for q in mcq)
-            
-            if hasattr(questions_module, 'subjective'):
-                subjective = questions_module.subjective
-                stats["subjective_count"] = len(subjective)
-                stats["total_subjective_marks"] = sum(q.get("marks", 5) for q in subjective)
-                stats["templated_subjective"] = sum(1 for q in subjective if "template" in q)
-            
             stats["total_questions"] = stats["mcq_count"] + stats["subjective_count"]
             stats["total_marks"] = stats["total_mcq_marks"] + stats["total_subjective_marks"]
             
@@ -8,14 +8,33 @@ randomized LaTeX quiz sets with answer keys.
 
 import random
 import os
+import re
+import hashlib
 import sys
+import shutil
+import tempfile
+import time
+import signal
 import subprocess
 import argparse
-import importlib.util
-from jinja2 import Template, Environment, FileSystemLoader
+import asyncio
+import contextlib
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from jinja2 import Template, Environment, FileSystemLoader, FileSystemBytecodeCache
 from pathlib import Path
-from typing import List, Dict, Any, Tuple, Optional
+from typing import List, Dict, Any, Tuple, Optional, Callable, Iterator, Union
 from .latex_validator import LaTeXValidator
+from .build_cache import BuildCache
+from .profiling import StageTimer
+from .tex_engine import ENGINES, TexEngine, engine_version, get_engine
+from .question_bank import QuestionBank, SUPPORTED_FORMATS, default_registry
+from .formats import QuestionFormatConverter
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
 
 # Import template manager
 try:
@@ -27,72 +46,205 @@ except ImportError:
     sys.path.insert(0, str(Path(__file__).parent.parent / "templates"))
     from template_config import TemplateManager
 
+# Log messages that LaTeX and common packages emit when another pass is needed
+RERUN_PATTERN = re.compile(
+    r'Rerun to get|Label\(s\) may have changed|Please rerun|rerunfilecheck Warning'
+)
+
+# Marker written to the log at the start of each set in a bundled document
+BUNDLE_MARKER_PATTERN = re.compile(r'SETWISE-SET-START (\d+) (\d+)')
+
+# Default limits for a single LaTeX compile
+DEFAULT_LATEX_TIMEOUT = 300.0
+DEFAULT_LATEX_MEMORY_MB = 2048
+
+
+def _latex_process_options() -> Dict[str, Any]:
+    """Popen options that isolate a LaTeX process.
+    
+    On POSIX the process gets its own session, so it can be killed together
+    with anything it spawns (e.g. font generation).
+    """
+    options: Dict[str, Any] = {'stdin': subprocess.DEVNULL}
+    if os.name == 'posix':
+        options['start_new_session'] = True
+    return options
+
+
+def _limit_memory(pid: int, memory_limit_mb: Optional[int]) -> None:
+    """Cap the address space of a LaTeX process that has just started.
+    
+    The limit is applied from outside with prlimit(2) rather than in a
+    preexec_fn, which is unsafe in a process running threads (compiles run
+    on a thread pool). Platforms without prlimit compile without a limit.
+    """
+    if not memory_limit_mb or resource is None or not hasattr(resource, 'prlimit'):
+        return
+    limit = memory_limit_mb * 1024 * 1024
+    try:
+        resource.prlimit(pid, resource.RLIMIT_AS, (limit, limit))
+    except ProcessLookupError:
+        pass  # Already finished
+
+
+def _kill_process_group(pid: int) -> None:
+    """Kill a LaTeX process and everything in its process group."""
+    try:
+        if os.name == 'posix':
+            os.killpg(pid, signal.SIGKILL)
+        else:
+            os.kill(pid, signal.SIGTERM)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def _run_latex(command: List[str], timeout: Optional[float] = None,
+               memory_limit_mb: Optional[int] = None) -> subprocess.CompletedProcess:
+    """Run a LaTeX command with a wall-clock timeout and memory limit.
+    
+    Raises:
+        subprocess.TimeoutExpired: If the run exceeds timeout; the whole
+            process group has been killed by then
+    """
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                               text=True, **_latex_process_options())
+    try:
+        _limit_memory(process.pid, memory_limit_mb)
+        stdout, stderr = process.communicate(timeout=timeout)
+    except BaseException:
+        _kill_process_group(process.pid)
+        process.communicate()
+        raise
+    return subprocess.CompletedProcess(command, process.returncode, stdout, stderr)
+
+
+def _discard_output(path: Path) -> None:
+    """Remove an output file before it is written again.
+
+    Build cache hits hardlink cached PDFs into the output directory, so
+    writing over such a file in place would change the cache entry too.
+    """
+    if path.exists() or path.is_symlink():
+        path.unlink()
+
+
+@lru_cache(maxsize=4096)
+def _compile_question_template(source: str) -> Template:
+    """Compile a question-level Jinja template, reusing earlier compilations.
+    
+    Question templates, options and answers are rendered once per quiz set,
+    so the same source strings are compiled only once per process.
+    """
+    return Template(source)
+
 
 class QuizGenerator:
     """Main class for generating randomized quiz sets."""
     
     def __init__(self, template_dir: str = "templates", output_dir: str = "output", 
-                 questions_file: Optional[str] = None):
+                 questions_file: Optional[str] = None,
+                 template_cache_dir: Optional[str] = None,
+                 latex_timeout: Optional[float] = DEFAULT_LATEX_TIMEOUT,
+                 latex_memory_limit_mb: Optional[int] = DEFAULT_LATEX_MEMORY_MB,
+                 engine: Union[str, TexEngine, None] = None,
+                 engine_args: Optional[List[str]] = None,
+                 require_format: bool = False,
+                 use_bank_cache: bool = True,
+                 question_bank: Optional[QuestionBank] = None,
+                 allow_exec: bool = False):
         """Initialize the quiz generator.
         
         Args:
             template_dir: Directory containing LaTeX templates
             output_dir: Directory for generated quiz files
-            questions_file: Path to custom questions.py file (optional)
+            questions_file: Path to custom questions file (.py, .yaml, .json, .csv or .md) (optional)
+            template_cache_dir: Directory for Jinja bytecode cache (optional)
+            latex_timeout: Wall-clock seconds allowed for compiling one
+                document, across all passes (None disables the limit)
+            latex_memory_limit_mb: Address-space limit for each pdflatex
+                process in MB, Linux only (None disables the limit)
+            engine: TeX engine name ('pdflatex', 'xelatex', 'lualatex',
+                'tectonic' or 'auto' for the fastest installed one) or a
+                TexEngine instance (default: pdflatex)
+            engine_args: Extra command-line flags passed to the engine
+            require_format: With engine='auto', prefer an engine that can
+                compile against a precompiled preamble (set this when
+                generating with precompile_preamble)
+            use_bank_cache: Reuse questions_file while it is unchanged, from
+                the process-wide bank registry or the cached copy kept in
+                __setwise_cache__ beside it
+            question_bank: Preloaded QuestionBank to use instead of loading
+                questions_file (optional)
+            allow_exec: Execute a Python questions_file whose questions are
+                built by code; by default its literals are read without
+                running it (only enable for trusted files)
         """
         self.template_dir = Path(template_dir)
         self.output_dir = Path(output_dir)
         self.template_manager = TemplateManager(template_dir)
+        self.template_cache_dir = Path(template_cache_dir) if template_cache_dir else None
+        self.use_bank_cache = use_bank_cache
+        self.allow_exec = allow_exec
+        self.latex_timeout = latex_timeout
+        self.latex_memory_limit_mb = latex_memory_limit_mb
+        if isinstance(engine, TexEngine):
+            self.engine = engine.with_args(engine_args) if engine_args else engine
+        else:
+            self.engine = get_engine(engine, require_format=require_format, extra_args=engine_args)
+        
+        # Compiled LaTeX templates, keyed by (template file, mtime)
+        self._jinja_env: Optional[Environment] = None
+        self._template_cache: Dict[Tuple[str, int], Template] = {}
+        
+        # Precompiled preamble format files, keyed by preamble hash
+        self._format_cache: Dict[str, Optional[Path]] = {}
+        
+        # Per-stage timings for profiling generation runs
+        self.profiler = StageTimer()
         
         # Initialize quiz metadata (will be populated by _load_questions)
         self.quiz_metadata = {}
         
-        # Load questions from custom file or default
-        self.mcq, self.subjective = self._load_questions(questions_file)
+        # Use the preloaded bank, or load questions from custom file or default
+        with self.profiler.stage('question_loading'):
+            if question_bank is not None:
+                self.mcq, self.subjective = question_bank.mcq, question_bank.subjective
+                self.quiz_metadata = question_bank.quiz_metadata
+            else:
+                self.mcq, self.subjective = self._load_questions(questions_file)
         
         # Ensure output directory exists
         self.output_dir.mkdir(exist_ok=True)
     
     def _load_questions(self, questions_file: Optional[str] = None) -> Tuple[List[Dict], List[Dict]]:
-        """Load questions from Python file (.py only for simplicity).
+        """Load questions from any supported question file format.
         
         Args:
-            questions_file: Path to Python questions file (.py)
+            questions_file: Path to questions file (.py, .yaml, .json, .csv or .md)
             
         Returns:
             Tuple of (mcq_questions, subjective_questions)
         """
         if questions_file:
-            # Load from custom Python file only
+            # Load from custom questions file
             questions_path = Path(questions_file)
             if not questions_path.exists():
                 raise FileNotFoundError(f"Questions file not found: {questions_file}")
             
-            # Ensure it's a Python file
-            if questions_path.suffix.lower() != '.py':
-                raise ValueError(f"Only Python files (.py) are supported. Got: {questions_path.suffix}")
+            # Ensure it's a format we can load
+            if QuestionFormatConverter.detect_format(questions_file) not in SUPPORTED_FORMATS:
+                raise ValueError(f"Unsupported questions file format: {questions_path.suffix}")
             
-            # Load Python module dynamically
+            # Parse the file, unless an unchanged copy is cached
             try:
-                import importlib.util
-                spec = importlib.util.spec_from_file_location("questions", questions_path)
-                if spec is None or spec.loader is None:
-                    raise ImportError(f"Could not load module from {questions_path}")
-                
-                questions_module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(questions_module)
-                
-                # Extract questions and metadata
-                mcq = getattr(questions_module, 'mcq', [])
-                subjective = getattr(questions_module, 'subjective', [])
-                
-                # Also extract quiz metadata if present
-                if hasattr(questions_module, 'quiz_metadata'):
-                    self.quiz_metadata = questions_module.quiz_metadata
+                if self.use_bank_cache:
+                    bank = default_registry.get(questions_file, allow_exec=self.allow_exec)
                 else:
-                    self.quiz_metadata = {}
+                    bank = QuestionBank.from_file(questions_file, use_cache=False, allow_exec=self.allow_exec)
                 
-                return mcq, subjective
+                # Extract questions and metadata
+                self.quiz_metadata = bank.quiz_metadata
+                return bank.mcq, bank.subjective
                 
             except Exception as e:
                 raise RuntimeError(f"Failed to load questions from {questions_file}: {e}")
@@ -115,6 +267,46 @@ class QuizGenerator:
                 from questions import mcq, subjective
                 return mcq, subjective
     
+    def _get_jinja_env(self) -> Environment:
+        """Return the generator's Jinja environment, creating it on first use."""
+        if self._jinja_env is None:
+            bytecode_cache = None
+            if self.template_cache_dir is not None:
+                self.template_cache_dir.mkdir(parents=True, exist_ok=True)
+                bytecode_cache = FileSystemBytecodeCache(str(self.template_cache_dir))
+            
+            # The environment's own cache is disabled; _get_template caches
+            # compiled templates itself so that edits on disk are picked up.
+            self._jinja_env = Environment(
+                loader=FileSystemLoader(str(self.template_dir)),
+                autoescape=True,  # Enable autoescape for security
+                cache_size=0,
+                bytecode_cache=bytecode_cache
+            )
+        return self._jinja_env
+    
+    def _get_template(self, template_file: str) -> Template:
+        """Return a compiled template, recompiling only when the file changes.
+        
+        Args:
+            template_file: Template file name relative to the template directory
+            
+        Returns:
+            Compiled Jinja2 template
+        """
+        mtime = (self.template_dir / template_file).stat().st_mtime_ns
+        key = (template_file, mtime)
+        
+        template = self._template_cache.get(key)
+        if template is None:
+            template = self._get_jinja_env().get_template(template_file)
+            # Drop compiled versions of older revisions of this file
+            for stale_key in [k for k in self._template_cache if k[0] == template_file]:
+                del self._template_cache[stale_key]
+            self._template_cache[key] = template
+        
+        return template
+    
     def shuffle_mcq_options(self, question_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Shuffle MCQ options while tracking correct answers.
@@ -163,7 +355,7 @@ class QuizGenerator:
                 selected_vars = random.choice(q["variables"])
                 
                 # Create Jinja2 template and render the template field
-                template = Template(q["template"])
+                template = _compile_question_template(q["template"])
                 rendered_question = template.render(**selected_vars)
                 
                 # Update the question with rendered content
@@ -174,13 +366,13 @@ class QuizGenerator:
                 if "options" in q:
                     rendered_options = []
                     for option in q["options"]:
-                        option_template = Template(option)
+                        option_template = _compile_question_template(option)
                         rendered_option = option_template.render(**selected_vars)
                         rendered_options.append(rendered_option)
                     processed_q["options"] = rendered_options
                     
                     # Render the answer
-                    answer_template = Template(q["answer"])
+                    answer_template = _compile_question_template(q["answer"])
                     rendered_answer = answer_template.render(**selected_vars)
                     processed_q["answer"] = rendered_answer
                 
@@ -203,7 +395,8 @@ class QuizGenerator:
 
     def generate_quiz_set(self, set_id: int, num_mcq: Optional[int] = None, 
                          num_subjective: Optional[int] = None, 
-                         template_name: str = "default") -> Tuple[str, str]:
+                         template_name: str = "default",
+                         body_only: bool = False) -> Tuple[str, str]:
         """
         Generate a single quiz set with randomized questions and answer key.
         
@@ -212,6 +405,8 @@ class QuizGenerator:
             num_mcq: Number of MCQ questions (None for all)
             num_subjective: Number of subjective questions (None for all)
             template_name: LaTeX template to use
+            body_only: Render only the document body, without the preamble
+                and \\begin{document}/\\end{document}
             
         Returns:
             Tuple of (quiz_content, answer_key)
@@ -221,10 +416,11 @@ class QuizGenerator:
             raise ValueError("No questions available. Both mcq and subjective lists are empty.")
         
         # Process templated subjective questions first
-        try:
-            processed_subjective = self.process_templated_questions(self.subjective)
-        except Exception as e:
-            raise RuntimeError(f"Failed to process templated subjective questions: {e}") from e
+        with self.profiler.stage('template_processing'):
+            try:
+                processed_subjective = self.process_templated_questions(self.subjective)
+            except Exception as e:
+                raise RuntimeError(f"Failed to process templated subjective questions: {e}") from e
         
         # Validate processed questions
         if num_mcq is not None and num_mcq > len(self.mcq):
@@ -233,35 +429,30 @@ class QuizGenerator:
             print(f"Warning: Requested {num_subjective} subjective questions but only {len(processed_subjective)} available")
         
         # Sample questions if limits specified
-        if num_mcq is not None and len(self.mcq) > 0:
-            sampled_mcq = random.sample(self.mcq, min(num_mcq, len(self.mcq)))
-        else:
-            sampled_mcq = self.mcq.copy()
+        with self.profiler.stage('sampling'):
+            if num_mcq is not None and len(self.mcq) > 0:
+                sampled_mcq = random.sample(self.mcq, min(num_mcq, len(self.mcq)))
+            else:
+                sampled_mcq = self.mcq.copy()
             
-        if num_subjective is not None and len(processed_subjective) > 0:
-            sampled_subjective = random.sample(processed_subjective, 
-                                             min(num_subjective, len(processed_subjective)))
-        else:
-            sampled_subjective = processed_subjective
+            if num_subjective is not None and len(processed_subjective) > 0:
+                sampled_subjective = random.sample(processed_subjective, 
+                                                 min(num_subjective, len(processed_subjective)))
+            else:
+                sampled_subjective = processed_subjective
         
-        # Shuffle MCQ options and track correct answers
-        shuffled_mcq = self.shuffle_mcq_options(sampled_mcq)
+            # Shuffle MCQ options and track correct answers
+            shuffled_mcq = self.shuffle_mcq_options(sampled_mcq)
         
-        # Shuffle question order
-        random.shuffle(shuffled_mcq)
-        random.shuffle(sampled_subjective)
+            # Shuffle question order
+            random.shuffle(shuffled_mcq)
+            random.shuffle(sampled_subjective)
         
         # Calculate total marks
         mcq_marks = sum(q.get("marks", 0) for q in shuffled_mcq)
         subjective_marks = sum(q.get("marks", 0) for q in sampled_subjective)
         total_marks = mcq_marks + subjective_marks
         
-        # Load and render the LaTeX template
-        env = Environment(
-            loader=FileSystemLoader(str(self.template_dir)),
-            autoescape=True  # Enable autoescape for security
-        )
-        
         # Validate template exists
         template_file = self.template_manager.get_template_file(template_name)
         if template_file is None:
@@ -272,7 +463,9 @@ class QuizGenerator:
         if not template_path.exists():
             raise FileNotFoundError(f"Template file '{template_path}' not found")
         
-        template = env.get_template(template_file)
+        # Load the compiled LaTeX template (cached across sets)
+        with self.profiler.stage('template_loading'):
+            template = self._get_template(template_file)
         
         # Prepare template context
         template_context = {
@@ -282,16 +475,19 @@ class QuizGenerator:
             'subjective_questions': sampled_subjective,
             'total_marks': total_marks,
             'mcq_marks': mcq_marks,
-            'subjective_marks': subjective_marks
+            'subjective_marks': subjective_marks,
+            'body_only': body_only
         }
         
-        try:
-            quiz_content = template.render(**template_context)
-        except Exception as e:
-            raise RuntimeError(f"Template rendering failed for '{template_name}': {e}") from e
+        with self.profiler.stage('rendering'):
+            try:
+                quiz_content = template.render(**template_context)
+            except Exception as e:
+                raise RuntimeError(f"Template rendering failed for '{template_name}': {e}") from e
         
         # Generate answer key
-        answer_key = self._generate_answer_key(set_id, shuffled_mcq, sampled_subjective)
+        with self.profiler.stage('answer_key'):
+            answer_key = self._generate_answer_key(set_id, shuffled_mcq, sampled_subjective)
         
         return quiz_content, answer_key
 
@@ -321,57 +517,492 @@ class QuizGenerator:
         
         return "\n".join(answer_lines)
 
-    def compile_latex(self, tex_file_path: Path, output_dir: Path) -> bool:
-        """Compile LaTeX file to PDF with enhanced error handling."""
+    @staticmethod
+    def _aux_signature(aux_file: Path) -> str:
+        """Hash the parts of an .aux file that can change the typeset output.
+        
+        The trivial lines LaTeX writes for every document are ignored, so a
+        plain question list without references never triggers a rerun.
+        """
+        digest = hashlib.sha256()
+        if aux_file.exists():
+            with open(aux_file, 'r', encoding='utf-8', errors='ignore') as f:
+                for line in f:
+                    stripped = line.strip()
+                    if stripped == '\\relax' or stripped.startswith('\\gdef \\@abspage@last'):
+                        continue
+                    digest.update(line.encode('utf-8'))
+        return digest.hexdigest()
+    
+    def _needs_rerun(self, log_file: Path, aux_file: Path, aux_before: str) -> bool:
+        """Decide whether another LaTeX pass is needed, latexmk style."""
+        if log_file.exists():
+            with open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
+                if RERUN_PATTERN.search(f.read()):
+                    return True
+        return self._aux_signature(aux_file) != aux_before
+
+    @staticmethod
+    def _split_preamble(tex_content: str) -> Tuple[str, str]:
+        """Split rendered LaTeX into its preamble and document body.
+        
+        Returns:
+            Tuple of (preamble, body), where body starts at \\begin{document}
+        """
+        index = tex_content.find('\\begin{document}')
+        if index == -1:
+            raise ValueError("LaTeX document has no \\begin{document}")
+        return tex_content[:index], tex_content[index:]
+    
+    def _build_preamble_format(self, preamble: str) -> Optional[Path]:
+        """Dump a preamble into a TeX format file, once per distinct preamble.
+        
+        Args:
+            preamble: LaTeX preamble up to (not including) \\begin{document}
+            
+        Returns:
+            Path to the .fmt file, or None if the format could not be built
+        """
+        if not self.engine.supports_format:
+            if self.engine.name not in self._format_cache:
+                print(f"Warning: {self.engine.name} cannot use a precompiled preamble, compiling sets normally")
+                self._format_cache[self.engine.name] = None
+            return None
+        
+        # Formats only load in the engine build that dumped them, so an
+        # upgraded TeX installation must not reuse an older one
+        version = engine_version(self.engine.name) or ''
+        key = hashlib.sha256(f"{self.engine.name}\n{version}\n{preamble}".encode('utf-8')).hexdigest()[:16]
+        if key in self._format_cache:
+            return self._format_cache[key]
+        
+        fmt_dir = self.output_dir / ".setwise_fmt"
+        fmt_dir.mkdir(exist_ok=True)
+        name = f"setwise_{key}"
+        fmt_file = fmt_dir / f"{name}.fmt"
+        
+        if not fmt_file.exists():
+            preamble_file = fmt_dir / f"{name}.tex"
+            with open(preamble_file, 'w', encoding='utf-8') as f:
+                f.write(preamble)
+                f.write("\\dump\n")
+            
+            try:
+                with self.profiler.stage('preamble_format'):
+                    result = _run_latex(
+                        self.engine.format_command(preamble_file, fmt_dir, name),
+                        self.latex_timeout, self.latex_memory_limit_mb
+                    )
+                built = self.engine.compile_succeeded(result.returncode) and fmt_file.exists()
+            except (FileNotFoundError, subprocess.TimeoutExpired):
+                built = False
+            
+            if not built:
+                print("Warning: could not precompile the LaTeX preamble, compiling sets normally")
+                fmt_file = None
+        
+        self._format_cache[key] = fmt_file
+        return fmt_file
+
+    def _discard_format(self, fmt_file: Path) -> None:
+        """Delete a precompiled format that failed to compile a set.
+        
+        Later sets from this generator compile normally; the next run
+        builds the format again.
+        """
+        print(f"Warning: compiling against the precompiled preamble failed, discarding {fmt_file.name}")
+        for key, cached in list(self._format_cache.items()):
+            if cached == fmt_file:
+                self._format_cache[key] = None
+        with contextlib.suppress(FileNotFoundError):
+            fmt_file.unlink()
+
+    def _latex_command(self, tex_file_path: Path, output_dir: Path,
+                       fmt_file: Optional[Path] = None) -> Tuple[List[str], Optional[Path]]:
+        """Build the engine command line for a quiz set.
+        
+        Returns:
+            Tuple of (command, body_file); body_file is the temporary body-only
+            source written when compiling against a precompiled format
+        """
+        if fmt_file is None:
+            return self.engine.compile_command(tex_file_path, output_dir), None
+        
+        _, body = self._split_preamble(tex_file_path.read_text(encoding='utf-8'))
+        body_file = output_dir / f"{tex_file_path.stem}.body.tex"
+        body_file.write_text(body, encoding='utf-8')
+        command = self.engine.compile_command(body_file, output_dir, jobname=tex_file_path.stem,
+                                              fmt_file=fmt_file)
+        return command, body_file
+    
+    @staticmethod
+    def _report_latex_failure(run_num: int, log_file: Path, stderr: str) -> None:
+        """Print user-friendly help for a failed LaTeX run."""
+        print(f"LaTeX compilation failed on run {run_num + 1}")
+        
+        # Parse LaTeX log for user-friendly errors
+        if log_file.exists():
+            with open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
+                log_content = f.read()
+            
+            latex_errors = LaTeXValidator.check_compilation_errors(log_content)
+            if latex_errors:
+                print("LaTeX Error Help:")
+                for error in latex_errors:
+                    print(f"  - {error}")
+            
+            # Show raw error if no specific help available
+            if not latex_errors and stderr:
+                print(f"Raw LaTeX error: {stderr}")
+    
+    def _report_latex_missing(self) -> None:
+        """Print installation help when the TeX engine is not available."""
+        print(f"Error: {self.engine.executable} not found.")
+        print("Please install LaTeX:")
+        print("  - On Ubuntu/Debian: sudo apt-get install texlive-full")
+        print("  - On macOS: brew install --cask mactex")
+        print("  - On Windows: Download from https://miktex.org/")
+
+    def compile_latex(self, tex_file_path: Path, output_dir: Path, max_passes: int = 2,
+                      fmt_file: Optional[Path] = None) -> bool:
+        """Compile LaTeX file to PDF with enhanced error handling.
+        
+        A further pass is only run when the log asks for a rerun or the
+        cross-reference data in the .aux file changed, up to max_passes.
+        When fmt_file is given, only the document body is compiled and the
+        preamble is loaded from the precompiled format; if that compile
+        fails, the format is discarded and the full document is compiled
+        instead. The TeX engine runs in nonstop, halt-on-error mode and is
+        killed (with any processes it started) once the compile exceeds
+        latex_timeout.
+        """
+        aux_file = output_dir / f"{tex_file_path.stem}.aux"
+        log_file = output_dir / f"{tex_file_path.stem}.log"
+        deadline = self._latex_deadline()
+        body_file = None
         try:
-            # Run pdflatex twice for proper cross-references
-            for run_num in range(2):
-                result = subprocess.run(
-                    ['pdflatex', f'-output-directory={output_dir}', tex_file_path],
-                    capture_output=True,
-                    text=True,
-                    check=False  # Don't raise exception immediately
-                )
+            command, body_file = self._latex_command(tex_file_path, output_dir, fmt_file)
+            
+            for run_num in range(self._pass_limit(max_passes)):
+                aux_before = self._aux_signature(aux_file)
+                with self.profiler.stage(f'pdflatex_pass_{run_num + 1}'):
+                    result = _run_latex(command, self._time_left(deadline),
+                                        self.latex_memory_limit_mb)
                 
                 # Check for errors in the output
-                if result.returncode != 0:
-                    print(f"LaTeX compilation failed on run {run_num + 1}")
-                    
-                    # Parse LaTeX log for user-friendly errors
-                    log_file = output_dir / f"{tex_file_path.stem}.log"
-                    if log_file.exists():
-                        with open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
-                            log_content = f.read()
-                        
-                        latex_errors = LaTeXValidator.check_compilation_errors(log_content)
-                        if latex_errors:
-                            print("LaTeX Error Help:")
-                            for error in latex_errors:
-                                print(f"  - {error}")
-                        
-                        # Show raw error if no specific help available
-                        if not latex_errors and result.stderr:
-                            print(f"Raw LaTeX error: {result.stderr}")
-                    
+                if not self.engine.compile_succeeded(result.returncode):
+                    if fmt_file is not None:
+                        # The format may be stale or broken; retry without it
+                        self._discard_format(fmt_file)
+                        return self.compile_latex(tex_file_path, output_dir, max_passes)
+                    self._report_latex_failure(run_num, log_file, result.stderr)
                     return False
+                
+                if not self._needs_rerun(log_file, aux_file, aux_before):
+                    break
             
             return True
             
+        except subprocess.TimeoutExpired:
+            print(f"LaTeX compilation of {tex_file_path.name} timed out after {self.latex_timeout} seconds")
+            return False
         except FileNotFoundError:
-            print("Error: pdflatex not found.")
-            print("Please install LaTeX:")
-            print("  - On Ubuntu/Debian: sudo apt-get install texlive-full")
-            print("  - On macOS: brew install --cask mactex")
-            print("  - On Windows: Download from https://miktex.org/")
+            self._report_latex_missing()
             return False
         except Exception as e:
             print(f"Unexpected error during LaTeX compilation: {e}")
             return False
+        finally:
+            if body_file is not None and body_file.exists():
+                body_file.unlink()
+
+    def _pass_limit(self, max_passes: int) -> int:
+        """Number of engine runs allowed; engines that rerun themselves need one."""
+        return 1 if self.engine.manages_reruns else max(1, max_passes)
+    
+    def _latex_deadline(self) -> Optional[float]:
+        """Return the monotonic time by which a compile must finish, if limited."""
+        return time.monotonic() + self.latex_timeout if self.latex_timeout else None
+    
+    @staticmethod
+    def _time_left(deadline: Optional[float]) -> Optional[float]:
+        """Seconds remaining before deadline (at least a tiny positive amount)."""
+        if deadline is None:
+            return None
+        return max(deadline - time.monotonic(), 0.001)
+
+    async def async_compile_latex(self, tex_file_path: Path, output_dir: Path,
+                                  max_passes: int = 2, fmt_file: Optional[Path] = None,
+                                  timeout: Optional[float] = None,
+                                  semaphore: Optional[asyncio.Semaphore] = None) -> bool:
+        """Compile LaTeX file to PDF without blocking the event loop.
+        
+        Behaves like compile_latex, but runs the TeX engine with
+        asyncio.create_subprocess_exec. If the task is cancelled or the
+        compile exceeds its timeout, pdflatex and any processes it started
+        are killed. Time spent waiting for the semaphore does not count
+        towards the timeout.
+        
+        Args:
+            tex_file_path: LaTeX source to compile
+            output_dir: Directory for the PDF and auxiliary files
+            max_passes: Maximum number of LaTeX passes
+            fmt_file: Precompiled preamble format (optional)
+            timeout: Seconds allowed for the compile across all passes
+                (default: latex_timeout)
+            semaphore: Held while a pdflatex process runs, to bound how many
+                run at once across concurrent compiles (optional)
+        """
+        aux_file = output_dir / f"{tex_file_path.stem}.aux"
+        log_file = output_dir / f"{tex_file_path.stem}.log"
+        semaphore = semaphore or asyncio.Semaphore(1)
+        timeout = self.latex_timeout if timeout is None else timeout
+        budget = timeout or None
+        body_file = None
+        try:
+            command, body_file = self._latex_command(tex_file_path, output_dir, fmt_file)
+            
+            for run_num in range(self._pass_limit(max_passes)):
+                aux_before = self._aux_signature(aux_file)
+                async with semaphore:
+                    with self.profiler.stage(f'pdflatex_pass_{run_num + 1}'):
+                        started = time.monotonic()
+                        process = await asyncio.create_subprocess_exec(
+                            *command,
+                            stdout=asyncio.subprocess.PIPE,
+                            stderr=asyncio.subprocess.PIPE,
+                            **_latex_process_options()
+                        )
+                        try:
+                            _limit_memory(process.pid, self.latex_memory_limit_mb)
+                            _, stderr = await asyncio.wait_for(process.communicate(), budget)
+                        except BaseException:
+                            # Timed out or cancelled: don't leave pdflatex running
+                            if process.returncode is None:
+                                _kill_process_group(process.pid)
+                                await process.wait()
+                            raise
+                        if budget is not None:
+                            budget = max(budget - (time.monotonic() - started), 0.001)
+                
+                if not self.engine.compile_succeeded(process.returncode):
+                    if fmt_file is not None:
+                        # The format may be stale or broken; retry without it
+                        self._discard_format(fmt_file)
+                        return await self.async_compile_latex(tex_file_path, output_dir, max_passes,
+                                                              timeout=budget, semaphore=semaphore)
+                    self._report_latex_failure(run_num, log_file,
+                                               stderr.decode('utf-8', errors='replace'))
+                    return False
+                
+                if not self._needs_rerun(log_file, aux_file, aux_before):
+                    break
+            
+            return True
+            
+        except asyncio.TimeoutError:
+            print(f"LaTeX compilation of {tex_file_path.name} timed out after {timeout} seconds")
+            return False
+        except FileNotFoundError:
+            self._report_latex_missing()
+            return False
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Unexpected error during LaTeX compilation: {e}")
+            return False
+        finally:
+            if body_file is not None and body_file.exists():
+                body_file.unlink()
+
+    @contextlib.contextmanager
+    def _isolated_build_dir(self, tex_file_path: Path) -> Iterator[Path]:
+        """Provide a private scratch directory for compiling one LaTeX file.
+
+        Each compile gets its own output directory so that concurrent runs
+        never share ``.aux``/``.log`` files. The PDF and log are moved back
+        into the output directory afterwards.
+        """
+        build_dir = Path(tempfile.mkdtemp(prefix=f".{tex_file_path.stem}_", dir=self.output_dir))
+        try:
+            yield build_dir
+            for suffix in ('.pdf', '.log'):
+                artifact = build_dir / f"{tex_file_path.stem}{suffix}"
+                if artifact.exists():
+                    shutil.move(str(artifact), str(self.output_dir / artifact.name))
+        finally:
+            shutil.rmtree(build_dir, ignore_errors=True)
+
+    def _compile_isolated(self, tex_file_path: Path, max_passes: int = 2,
+                          fmt_file: Optional[Path] = None) -> bool:
+        """Compile a LaTeX file in its own scratch directory."""
+        with self._isolated_build_dir(tex_file_path) as build_dir:
+            return self.compile_latex(tex_file_path, build_dir, max_passes, fmt_file)
+
+    def _finish_compile(self, set_id: int, tex_file_path: Path, compiled: bool,
+                        cache: Optional[BuildCache] = None,
+                        cache_key: Optional[str] = None) -> Optional[Path]:
+        """Report a finished compile and store its PDF in the build cache.
+
+        Returns:
+            Path to the compiled PDF, or None if compilation failed
+        """
+        if not compiled:
+            print(f"✗ Failed to compile Quiz Set {set_id}")
+            return None
+        
+        pdf_file_path = tex_file_path.with_suffix('.pdf')
+        if cache is not None and cache_key is not None:
+            cache.put(cache_key, pdf_file_path)
+        print(f"✓ Compiled Quiz Set {set_id} to PDF")
+        return pdf_file_path
+
+    def _render_preamble(self, template_name: str) -> str:
+        """Render the (set-independent) preamble of a template."""
+        template_file = self.template_manager.get_template_file(template_name)
+        if template_file is None:
+            raise ValueError(f"Template '{template_name}' not found. Available templates: {list(self.template_manager.templates.keys())}")
+        
+        template = self._get_template(template_file)
+        content = template.render(
+            quiz_metadata=self.quiz_metadata, set_id=0,
+            mcq_questions=[], subjective_questions=[],
+            total_marks=0, mcq_marks=0, subjective_marks=0
+        )
+        preamble, _ = self._split_preamble(content)
+        return preamble
+    
+    def _split_bundle_pdf(self, bundle_pdf: Path, log_file: Path) -> bool:
+        """Split a compiled bundle back into one PDF per quiz set.
+        
+        Set boundaries are read from the markers the bundle writes to the log.
+        Requires the optional ``pypdf`` package.
+        """
+        try:
+            from pypdf import PdfReader, PdfWriter
+        except ImportError:
+            print("Error: splitting a bundle requires pypdf (pip install pypdf)")
+            return False
+        
+        with open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
+            starts = [(int(set_id), int(page)) for set_id, page in BUNDLE_MARKER_PATTERN.findall(f.read())]
+        if not starts:
+            print("Error: no set markers found in the bundle log "
+                  "(splitting a bundle needs LaTeX 2020-10 or later)")
+            return False
+        
+        reader = PdfReader(str(bundle_pdf))
+        for index, (set_id, start) in enumerate(starts):
+            end = starts[index + 1][1] if index + 1 < len(starts) else len(reader.pages)
+            writer = PdfWriter()
+            for page in reader.pages[start:end]:
+                writer.add_page(page)
+            set_pdf_path = self.output_dir / f"quiz_set_{set_id}.pdf"
+            _discard_output(set_pdf_path)
+            with open(set_pdf_path, 'wb') as f:
+                writer.write(f)
+        
+        return True
+    
+    def _generate_bundle(self, num_sets: int, num_mcq: Optional[int],
+                         num_subjective: Optional[int], template_name: str,
+                         compile_pdf: bool, max_passes: int, split_bundle: bool,
+                         cache: Optional[BuildCache], template_path: Optional[Path]) -> bool:
+        """Render every set into a single document and compile it once.
+        
+        Each set starts on a fresh page with its page counter reset, and
+        writes a marker to the log so the PDF can be split per set afterwards
+        (on LaTeX 2020-10 or later; older kernels compile without markers).
+        """
+        success = True
+        bodies = []
+        for set_id in range(1, num_sets + 1):
+            try:
+                body, answer_key = self.generate_quiz_set(
+                    set_id, num_mcq, num_subjective, template_name, body_only=True
+                )
+                
+                answer_file_path = self.output_dir / f"answer_key_{set_id}.txt"
+                with self.profiler.stage('file_writing'):
+                    with open(answer_file_path, 'w', encoding='utf-8') as f:
+                        f.write(answer_key)
+                
+                bodies.append(
+                    f"% Quiz Set {set_id}\n"
+                    "\\clearpage\n"
+                    "\\setcounter{page}{1}\n"
+                    # \ReadonlyShipoutCounter needs LaTeX 2020-10; older kernels skip the marker
+                    "\\ifdefined\\ReadonlyShipoutCounter"
+                    f"\\typeout{{SETWISE-SET-START {set_id} \\the\\ReadonlyShipoutCounter}}\\fi\n"
+                    f"{body}\n"
+                )
+                print(f"✓ Generated Quiz Set {set_id}")
+                
+            except Exception as e:
+                print(f"✗ Error generating Quiz Set {set_id}: {e}")
+                success = False
+        
+        if not bodies:
+            return False
+        
+        try:
+            preamble = self._render_preamble(template_name)
+        except Exception as e:
+            print(f"✗ Error rendering bundle preamble: {e}")
+            return False
+        
+        bundle_content = preamble + "\\begin{document}\n\n" + "\n".join(bodies) + "\n\\end{document}\n"
+        bundle_tex_path = self.output_dir / "quiz_bundle.tex"
+        with self.profiler.stage('file_writing'):
+            with open(bundle_tex_path, 'w', encoding='utf-8') as f:
+                f.write(bundle_content)
+        print(f"✓ Wrote bundle of {len(bodies)} quiz sets to {bundle_tex_path.name}")
+        
+        if not compile_pdf:
+            return success
+        
+        bundle_pdf_path = bundle_tex_path.with_suffix('.pdf')
+        cache_key = None
+        if cache is not None:
+            cache_key = self._build_cache_key(cache, bundle_content, template_path, max_passes)
+            # Splitting needs the set markers from a fresh compile log
+            if not split_bundle and cache.get(cache_key, bundle_pdf_path):
+                print("✓ Reused cached PDF for quiz bundle")
+                return success
+        _discard_output(bundle_pdf_path)
+        
+        if not self.compile_latex(bundle_tex_path, self.output_dir, max_passes):
+            print("✗ Failed to compile quiz bundle")
+            return False
+        if cache is not None:
+            cache.put(cache_key, bundle_pdf_path)
+        print("✓ Compiled quiz bundle to PDF")
+        
+        if split_bundle:
+            if self._split_bundle_pdf(bundle_pdf_path, bundle_tex_path.with_suffix('.log')):
+                print(f"✓ Split quiz bundle into {len(bodies)} PDFs")
+            else:
+                success = False
+        
+        return success
+    
+    def _build_cache_key(self, cache: BuildCache, tex_content: str, template_path: Optional[Path],
+                         max_passes: int) -> str:
+        """Compute the build cache key for a rendered document."""
+        return cache.compute_key(
+            tex_content, template_path,
+            BuildCache.find_assets(tex_content, Path.cwd()),
+            extra=f"max_passes={max_passes};engine={self.engine.name} {' '.join(self.engine.extra_args)}"
+        )
 
     def generate_quizzes(self, num_sets: int = 3, num_mcq: Optional[int] = None,
                         num_subjective: Optional[int] = None, 
                         template_name: str = "default",
-                        compile_pdf: bool = True, seed: Optional[int] = None) -> bool:
+                        compile_pdf: bool = True, seed: Optional[int] = None,
+                        jobs: int = 1, max_passes: int = 2,
+                        precompile_preamble: bool = False, use_cache: bool = True,
+                        cache_dir: Optional[str] = None, bundle: bool = False,
+                        split_bundle: bool = False) -> bool:
         """
         Generate multiple quiz sets with answer keys.
         
@@ -382,51 +1013,352 @@ class QuizGenerator:
             template_name: LaTeX template to use
             compile_pdf: Whether to compile LaTeX to PDF
             seed: Random seed for reproducibility
+            jobs: Number of sets to compile concurrently (0 uses all CPUs)
+            max_passes: Maximum number of LaTeX passes per set
+            precompile_preamble: Build a format file from the shared preamble
+                once and compile every set against it
+            use_cache: Reuse PDFs from the build cache when the rendered
+                LaTeX, template and included files are unchanged
+            cache_dir: Build cache directory (default: <output_dir>/.setwise_cache)
+            bundle: Render all sets into one document (quiz_bundle.tex) and
+                compile it with a single LaTeX run
+            split_bundle: Split the compiled bundle into per-set PDFs
             
         Returns:
             True if successful, False otherwise
         """
+        if bundle:
+            cache, template_path = self._start_run(num_sets, template_name, compile_pdf,
+                                                   seed, use_cache, cache_dir)
+            return self._generate_bundle(
+                num_sets, num_mcq, num_subjective, template_name,
+                compile_pdf, max_passes, split_bundle, cache, template_path
+            )
+        
+        success = True
+        generated = 0
+        for _, _, _, pdf_path in self.iter_quiz_sets(
+                num_sets, num_mcq, num_subjective, template_name, compile_pdf, seed,
+                jobs, max_passes, precompile_preamble, use_cache, cache_dir):
+            generated += 1
+            if compile_pdf and pdf_path is None:
+                success = False
+        
+        return success and generated == num_sets
+
+    def _start_run(self, num_sets: int, template_name: str, compile_pdf: bool,
+                   seed: Optional[int], use_cache: bool,
+                   cache_dir: Optional[str]) -> Tuple[Optional[BuildCache], Optional[Path]]:
+        """Seed the RNG and open the build cache for a generation run.
+
+        Returns:
+            Tuple of (build cache or None, template path used in cache keys)
+        """
         if seed is not None:
             random.seed(seed)
             print(f"Using random seed: {seed}")
         
+        cache = None
+        template_path = None
+        if compile_pdf and use_cache:
+            cache = BuildCache(cache_dir or str(self.output_dir / ".setwise_cache"))
+            if template_name in self.template_manager.templates:
+                template_path = self.template_manager.get_template_path(template_name)
+        
         print(f"Generating {num_sets} quiz sets...")
+        return cache, template_path
+
+    def _generate_and_write_set(self, set_id: int, num_mcq: Optional[int],
+                                num_subjective: Optional[int],
+                                template_name: str) -> Tuple[str, str, Path]:
+        """Generate one quiz set and write its .tex file and answer key.
+
+        Returns:
+            Tuple of (quiz_content, answer_key, tex_file_path)
+        """
+        # Generate quiz content and answer key
+        quiz_content, answer_key = self.generate_quiz_set(
+            set_id, num_mcq, num_subjective, template_name
+        )
         
-        success = True
-        for set_id in range(1, num_sets + 1):
-            try:
-                # Generate quiz content and answer key
-                quiz_content, answer_key = self.generate_quiz_set(
-                    set_id, num_mcq, num_subjective, template_name
+        with self.profiler.stage('file_writing'):
+            # Write LaTeX file
+            tex_filename = f"quiz_set_{set_id}.tex"
+            tex_file_path = self.output_dir / tex_filename
+            with open(tex_file_path, 'w', encoding='utf-8') as f:
+                f.write(quiz_content)
+            
+            # Write answer key
+            answer_filename = f"answer_key_{set_id}.txt"
+            answer_file_path = self.output_dir / answer_filename
+            with open(answer_file_path, 'w', encoding='utf-8') as f:
+                f.write(answer_key)
+        
+        print(f"✓ Generated Quiz Set {set_id}")
+        return quiz_content, answer_key, tex_file_path
+
+    def _check_build_cache(self, set_id: int, quiz_content: str, tex_file_path: Path,
+                           cache: Optional[BuildCache], template_path: Optional[Path],
+                           max_passes: int) -> Tuple[bool, Optional[str]]:
+        """Restore a set's PDF from the build cache if possible.
+
+        Returns:
+            Tuple of (cache_hit, cache_key); cache_key is None without a cache
+        """
+        pdf_file_path = tex_file_path.with_suffix('.pdf')
+        if cache is None:
+            # A PDF left by an earlier cached run may still be a hardlink into the cache
+            _discard_output(pdf_file_path)
+            return False, None
+        
+        with self.profiler.stage('cache_lookup'):
+            cache_key = self._build_cache_key(cache, quiz_content, template_path, max_passes)
+            cache_hit = cache.get(cache_key, pdf_file_path)
+        if cache_hit:
+            print(f"✓ Reused cached PDF for Quiz Set {set_id}")
+            return True, cache_key
+        _discard_output(pdf_file_path)
+        return False, cache_key
+
+    def _preamble_format_for(self, quiz_content: str, precompile_preamble: bool) -> Optional[Path]:
+        """Return the precompiled preamble format to compile a set against, if any."""
+        if precompile_preamble and '\\begin{document}' in quiz_content:
+            preamble, _ = self._split_preamble(quiz_content)
+            return self._build_preamble_format(preamble)
+        return None
+
+    def iter_quiz_sets(self, num_sets: int = 3, num_mcq: Optional[int] = None,
+                       num_subjective: Optional[int] = None,
+                       template_name: str = "default",
+                       compile_pdf: bool = True, seed: Optional[int] = None,
+                       jobs: int = 1, max_passes: int = 2,
+                       precompile_preamble: bool = False, use_cache: bool = True,
+                       cache_dir: Optional[str] = None,
+                       sink: Optional[Callable[[int, str, str, Optional[Path]], None]] = None
+                       ) -> Iterator[Tuple[int, str, str, Optional[Path]]]:
+        """
+        Generate quiz sets one at a time, yielding each as soon as it is ready.
+        
+        Each set's .tex file and answer key are written to the output directory
+        before it is yielded. When compiling with several jobs, LaTeX runs in
+        the background while later sets are still being generated, and sets
+        are yielded in the order their PDFs finish.
+        
+        Args:
+            num_sets: Number of quiz sets to generate
+            num_mcq: Number of MCQ questions per set
+            num_subjective: Number of subjective questions per set
+            template_name: LaTeX template to use
+            compile_pdf: Whether to compile LaTeX to PDF
+            seed: Random seed for reproducibility
+            jobs: Number of sets to compile concurrently (0 uses all CPUs)
+            max_passes: Maximum number of LaTeX passes per set
+            precompile_preamble: Compile every set against a precompiled preamble
+            use_cache: Reuse PDFs from the build cache when inputs are unchanged
+            cache_dir: Build cache directory (default: <output_dir>/.setwise_cache)
+            sink: Called with each result before it is yielded (optional)
+            
+        Yields:
+            Tuples of (set_id, tex_content, answer_key, pdf_path); pdf_path is
+            None when PDFs are not compiled or compilation failed. Sets that
+            fail to generate are reported and skipped.
+        """
+        if jobs <= 0:
+            jobs = os.cpu_count() or 1
+        
+        cache, template_path = self._start_run(num_sets, template_name, compile_pdf,
+                                               seed, use_cache, cache_dir)
+        
+        def emit(result):
+            if sink is not None:
+                sink(*result)
+            return result
+        
+        executor = None
+        if compile_pdf and jobs > 1:
+            print(f"Compiling quiz sets with {jobs} parallel jobs...")
+            executor = ThreadPoolExecutor(max_workers=jobs)
+        futures = {}  # Compiles running in the background
+        
+        def finished(block: bool):
+            """Yield background compiles that are done (all of them if block)."""
+            done = as_completed(list(futures)) if block else [f for f in list(futures) if f.done()]
+            for future in done:
+                set_id, tex_file_path, quiz_content, answer_key, cache_key = futures.pop(future)
+                try:
+                    compiled = future.result()
+                except Exception as e:
+                    print(f"✗ Error compiling Quiz Set {set_id}: {e}")
+                    compiled = False
+                pdf_path = self._finish_compile(set_id, tex_file_path, compiled, cache, cache_key)
+                yield emit((set_id, quiz_content, answer_key, pdf_path))
+        
+        try:
+            for set_id in range(1, num_sets + 1):
+                try:
+                    quiz_content, answer_key, tex_file_path = self._generate_and_write_set(
+                        set_id, num_mcq, num_subjective, template_name
+                    )
+                except Exception as e:
+                    print(f"✗ Error generating Quiz Set {set_id}: {e}")
+                    continue
+                
+                if not compile_pdf:
+                    yield emit((set_id, quiz_content, answer_key, None))
+                    continue
+                
+                cache_hit, cache_key = self._check_build_cache(
+                    set_id, quiz_content, tex_file_path, cache, template_path, max_passes
                 )
+                if cache_hit:
+                    yield emit((set_id, quiz_content, answer_key, tex_file_path.with_suffix('.pdf')))
+                    continue
                 
-                # Write LaTeX file
-                tex_filename = f"quiz_set_{set_id}.tex"
-                tex_file_path = self.output_dir / tex_filename
-                with open(tex_file_path, 'w', encoding='utf-8') as f:
-                    f.write(quiz_content)
+                fmt_file = self._preamble_format_for(quiz_content, precompile_preamble)
                 
-                # Write answer key
-                answer_filename = f"answer_key_{set_id}.txt"
-                answer_file_path = self.output_dir / answer_filename
-                with open(answer_file_path, 'w', encoding='utf-8') as f:
-                    f.write(answer_key)
+                if executor is not None:
+                    future = executor.submit(self._compile_isolated, tex_file_path, max_passes, fmt_file)
+                    futures[future] = (set_id, tex_file_path, quiz_content, answer_key, cache_key)
+                    yield from finished(block=False)
+                    continue
                 
-                print(f"✓ Generated Quiz Set {set_id}")
+                try:
+                    compiled = self.compile_latex(tex_file_path, self.output_dir, max_passes, fmt_file)
+                except Exception as e:
+                    print(f"✗ Error compiling Quiz Set {set_id}: {e}")
+                    compiled = False
+                pdf_path = self._finish_compile(set_id, tex_file_path, compiled, cache, cache_key)
+                yield emit((set_id, quiz_content, answer_key, pdf_path))
+            
+            yield from finished(block=True)
+        finally:
+            if executor is not None:
+                # Abandoned iteration: drop compiles that have not started yet
+                for future in futures:
+                    future.cancel()
+                executor.shutdown(wait=True)
+
+
+    async def async_generate_quizzes(self, num_sets: int = 3, num_mcq: Optional[int] = None,
+                                     num_subjective: Optional[int] = None,
+                                     template_name: str = "default",
+                                     compile_pdf: bool = True, seed: Optional[int] = None,
+                                     jobs: int = 1, max_passes: int = 2,
+                                     precompile_preamble: bool = False, use_cache: bool = True,
+                                     cache_dir: Optional[str] = None,
+                                     timeout: Optional[float] = None,
+                                     progress: Optional[Callable[[Dict[str, Any]], Any]] = None) -> bool:
+        """
+        Generate quiz sets from asyncio code without blocking the event loop.
+        
+        Sets are rendered one after another, and each is handed to an
+        asynchronous pdflatex compile as soon as it is written. At most
+        ``jobs`` pdflatex processes run at once. Cancelling the calling task
+        kills any running pdflatex processes.
+        
+        Args:
+            num_sets: Number of quiz sets to generate
+            num_mcq: Number of MCQ questions per set
+            num_subjective: Number of subjective questions per set
+            template_name: LaTeX template to use
+            compile_pdf: Whether to compile LaTeX to PDF
+            seed: Random seed for reproducibility
+            jobs: Maximum concurrent pdflatex processes (0 uses all CPUs)
+            max_passes: Maximum number of LaTeX passes per set
+            precompile_preamble: Compile every set against a precompiled preamble
+            use_cache: Reuse PDFs from the build cache when inputs are unchanged
+            cache_dir: Build cache directory (default: <output_dir>/.setwise_cache)
+            timeout: Seconds allowed for compiling each set (default: latex_timeout)
+            progress: Called with an event dictionary ('event', 'set_id',
+                'completed', 'total' and, when available, 'pdf_path') whenever
+                a set is generated, reused from cache, compiled or fails;
+                coroutine functions are awaited (optional)
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        if jobs <= 0:
+            jobs = os.cpu_count() or 1
+        
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(jobs)
+        cache, template_path = self._start_run(num_sets, template_name, compile_pdf,
+                                               seed, use_cache, cache_dir)
+        completed = 0
+        
+        async def report(event: str, set_id: int, pdf_path: Optional[Path] = None):
+            if progress is None:
+                return
+            data = {'event': event, 'set_id': set_id, 'completed': completed, 'total': num_sets}
+            if pdf_path is not None:
+                data['pdf_path'] = pdf_path
+            result = progress(data)
+            if asyncio.iscoroutine(result):
+                await result
+        
+        async def compile_set(set_id: int, tex_file_path: Path, fmt_file: Optional[Path],
+                              cache_key: Optional[str]) -> bool:
+            nonlocal completed
+            with self._isolated_build_dir(tex_file_path) as build_dir:
+                compiled = await self.async_compile_latex(
+                    tex_file_path, build_dir, max_passes, fmt_file, timeout, semaphore
+                )
+            pdf_path = self._finish_compile(set_id, tex_file_path, compiled, cache, cache_key)
+            completed += 1
+            await report('compiled' if compiled else 'failed', set_id, pdf_path)
+            return compiled
+        
+        success = True
+        tasks = []
+        try:
+            for set_id in range(1, num_sets + 1):
+                try:
+                    quiz_content, answer_key, tex_file_path = self._generate_and_write_set(
+                        set_id, num_mcq, num_subjective, template_name
+                    )
+                except Exception as e:
+                    print(f"✗ Error generating Quiz Set {set_id}: {e}")
+                    success = False
+                    completed += 1
+                    await report('failed', set_id)
+                    continue
                 
-                # Compile to PDF if requested
-                if compile_pdf:
-                    if self.compile_latex(tex_file_path, self.output_dir):
-                        print(f"✓ Compiled Quiz Set {set_id} to PDF")
-                    else:
-                        print(f"✗ Failed to compile Quiz Set {set_id}")
-                        success = False
-                        
-            except Exception as e:
-                print(f"✗ Error generating Quiz Set {set_id}: {e}")
-                success = False
+                if not compile_pdf:
+                    completed += 1
+                    await report('generated', set_id)
+                    continue
+                await report('generated', set_id)
+                
+                cache_hit, cache_key = self._check_build_cache(
+                    set_id, quiz_content, tex_file_path, cache, template_path, max_passes
+                )
+                if cache_hit:
+                    completed += 1
+                    await report('cached', set_id, tex_file_path.with_suffix('.pdf'))
+                    continue
+                
+                fmt_file = None
+                if precompile_preamble:
+                    # Building the format runs pdflatex once; keep it off the loop
+                    fmt_file = await loop.run_in_executor(
+                        None, self._preamble_format_for, quiz_content, precompile_preamble
+                    )
+                
+                tasks.append(asyncio.ensure_future(
+                    compile_set(set_id, tex_file_path, fmt_file, cache_key)
+                ))
+                # Let running compiles make progress between sets
+                await asyncio.sleep(0)
+            
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            # Cancelled (or a compile blew up): stop every outstanding compile
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
         
-        return success
+        return success and all(results)
 
 
 def main():
@@ -440,6 +1372,30 @@ def main():
     parser.add_argument("--template", default="default", help="Template to use")
     parser.add_argument("--output-dir", default="output", help="Output directory")
     parser.add_argument("--no-pdf", action="store_true", help="Skip PDF compilation")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Number of quiz sets to compile in parallel (0 uses all CPUs)")
+    parser.add_argument("--max-passes", type=int, default=2,
+                        help="Maximum LaTeX passes per set (extra passes only run when needed)")
+    parser.add_argument("--precompile-preamble", action="store_true",
+                        help="Precompile the template preamble once and reuse it for every set")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always recompile PDFs instead of reusing the build cache")
+    parser.add_argument("--cache-dir", help="Build cache directory (default: <output-dir>/.setwise_cache)")
+    parser.add_argument("--bundle", action="store_true",
+                        help="Render all sets into one document and compile it once")
+    parser.add_argument("--split-bundle", action="store_true",
+                        help="With --bundle, also split the PDF into one file per set (requires pypdf)")
+    parser.add_argument("--latex-timeout", type=float, default=DEFAULT_LATEX_TIMEOUT,
+                        help="Seconds allowed to compile one set before pdflatex is killed (0 disables)")
+    parser.add_argument("--engine", default="pdflatex", choices=["auto", *ENGINES],
+                        help="TeX engine to compile with ('auto' picks the fastest installed)")
+    parser.add_argument("--engine-arg", action="append", default=[], metavar="ARG",
+                        help="Extra flag passed to the TeX engine (repeatable)")
+    parser.add_argument("--latex-memory-limit", type=int, default=DEFAULT_LATEX_MEMORY_MB,
+                        help="Memory limit for each pdflatex process in MB (0 disables)")
+    parser.add_argument("--profile", action="store_true", help="Print time spent in each generation stage")
+    parser.add_argument("--profile-json", help="Write per-stage timings to this JSON file")
+    parser.add_argument("--cprofile", help="Write a cProfile dump of the run to this file")
     parser.add_argument("--list-templates", action="store_true", help="List available templates")
     
     args = parser.parse_args()
@@ -450,8 +1406,19 @@ def main():
         print(tm.list_templates())
         return
     
+    # Optionally profile the whole run, including question loading
+    cprofiler = None
+    if args.cprofile:
+        import cProfile
+        cprofiler = cProfile.Profile()
+        cprofiler.enable()
+    
     # Create quiz generator
-    generator = QuizGenerator(output_dir=args.output_dir)
+    generator = QuizGenerator(output_dir=args.output_dir,
+                              latex_timeout=args.latex_timeout or None,
+                              latex_memory_limit_mb=args.latex_memory_limit or None,
+                              engine=args.engine, engine_args=args.engine_arg,
+                              require_format=args.precompile_preamble)
     
     # Validate template
     is_valid, message = generator.template_manager.validate_template(args.template)
@@ -466,9 +1433,26 @@ def main():
         num_subjective=args.subjective,
         template_name=args.template,
         compile_pdf=not args.no_pdf,
-        seed=args.seed
+        seed=args.seed,
+        jobs=args.jobs,
+        max_passes=args.max_passes,
+        precompile_preamble=args.precompile_preamble,
+        use_cache=not args.no_cache,
+        cache_dir=args.cache_dir,
+        bundle=args.bundle,
+        split_bundle=args.split_bundle
     )
     
+    if cprofiler is not None:
+        cprofiler.disable()
+        cprofiler.dump_stats(args.cprofile)
+        print(f"cProfile data written to {args.cprofile}")
+    if args.profile:
+        print(f"\n{generator.profiler.summary_table()}")
+    if args.profile_json:
+        generator.profiler.write_json(args.profile_json)
+        print(f"Profile written to {args.profile_json}")
+    
     if success:
         print(f"\n✅ Successfully generated {args.sets} quiz sets in '{args.output_dir}/'")
     else:
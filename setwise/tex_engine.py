@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+TeX Engine Backends
+
+Describes the TeX engines Setwise can compile quizzes with (pdflatex,
+xelatex, lualatex and tectonic): how to invoke each one, which features
+it supports, and which of them are installed on this machine.
+"""
+
+import copy
+import shutil
+import subprocess
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Never stop to prompt on errors: a bad set must fail, not hang
+LATEX_FLAGS = ['-interaction=nonstopmode', '-halt-on-error']
+
+
+class TexEngine:
+    """A TeX engine and the command lines used to drive it.
+
+    Attributes:
+        name: Engine name used on the command line and in the Python API
+        executable: Program that is run
+        description: One-line description shown by ``setwise list-engines``
+        speed_rank: Lower is faster for typical quiz documents
+        supports_format: Whether a precompiled preamble format can be used
+        manages_reruns: Whether the engine reruns LaTeX itself, so a single
+            invocation always produces the final PDF
+        extra_args: Additional command-line flags passed on every run
+    """
+
+    def __init__(self, name: str, executable: str, description: str, speed_rank: int,
+                 supports_format: bool = False, manages_reruns: bool = False):
+        self.name = name
+        self.executable = executable
+        self.description = description
+        self.speed_rank = speed_rank
+        self.supports_format = supports_format
+        self.manages_reruns = manages_reruns
+        self.extra_args: List[str] = []
+
+    def __repr__(self) -> str:
+        return f"TexEngine({self.name!r})"
+
+    def with_args(self, extra_args: Sequence[str]) -> 'TexEngine':
+        """Return a copy of this engine that passes extra_args on every run."""
+        engine = copy.copy(self)
+        engine.extra_args = list(extra_args)
+        return engine
+
+    def is_available(self) -> bool:
+        """Return True if the engine is installed (probed once per process)."""
+        return self.name in available_engines()
+
+    def compile_command(self, source: Path, output_dir: Path, jobname: Optional[str] = None,
+                        fmt_file: Optional[Path] = None) -> List[str]:
+        """Build the command that compiles one source file into output_dir.
+
+        Args:
+            source: LaTeX file to compile
+            output_dir: Directory for the PDF, log and auxiliary files
+            jobname: Output base name, if different from the source name
+            fmt_file: Precompiled preamble format (engines with supports_format only)
+        """
+        command = [self.executable, *LATEX_FLAGS, *self.extra_args]
+        if fmt_file is not None:
+            command.append(f'-fmt={fmt_file}')
+        if jobname is not None:
+            command.append(f'-jobname={jobname}')
+        command.append(f'-output-directory={output_dir}')
+        command.append(str(source))
+        return command
+
+    def format_command(self, preamble_file: Path, output_dir: Path, jobname: str) -> List[str]:
+        """Build the command that dumps a preamble (ending in \\dump) into a format file."""
+        if not self.supports_format:
+            raise ValueError(f"{self.name} does not support precompiled formats")
+        return [self.executable, '-ini', *LATEX_FLAGS, *self.extra_args, f'-jobname={jobname}',
+                f'-output-directory={output_dir}', f'&{self.executable}', str(preamble_file)]
+
+    def compile_succeeded(self, returncode: int) -> bool:
+        """Decide from the exit status whether a run produced usable output."""
+        return returncode == 0
+
+
+class TectonicEngine(TexEngine):
+    """Tectonic: self-contained engine that fetches packages and reruns itself."""
+
+    def compile_command(self, source: Path, output_dir: Path, jobname: Optional[str] = None,
+                        fmt_file: Optional[Path] = None) -> List[str]:
+        if fmt_file is not None or jobname is not None:
+            raise ValueError("tectonic does not support precompiled formats or job names")
+        return [self.executable, '--keep-logs', '--keep-intermediates', *self.extra_args,
+                '--outdir', str(output_dir), str(source)]
+
+
+# All supported engines, keyed by name
+ENGINES: Dict[str, TexEngine] = {
+    'pdflatex': TexEngine('pdflatex', 'pdflatex', "Fastest for the bundled templates",
+                          speed_rank=0, supports_format=True),
+    'xelatex': TexEngine('xelatex', 'xelatex', "Unicode and system fonts",
+                         speed_rank=2, supports_format=True),
+    'lualatex': TexEngine('lualatex', 'lualatex', "Unicode, system fonts and Lua scripting",
+                          speed_rank=3),
+    'tectonic': TectonicEngine('tectonic', 'tectonic', "Self-contained, downloads packages on demand",
+                               speed_rank=1, manages_reruns=True),
+}
+
+# Engine used when none is requested
+DEFAULT_ENGINE = 'pdflatex'
+
+
+@lru_cache(maxsize=None)
+def available_engines() -> Tuple[str, ...]:
+    """Return the names of installed engines, fastest first.
+
+    The PATH is probed once per process; call ``available_engines.cache_clear()``
+    after installing an engine in a long-running process.
+    """
+    installed = [engine for engine in ENGINES.values() if shutil.which(engine.executable)]
+    return tuple(engine.name for engine in sorted(installed, key=lambda e: e.speed_rank))
+
+
+@lru_cache(maxsize=None)
+def engine_version(name: str) -> Optional[str]:
+    """Return the first line of an installed engine's version banner."""
+    engine = ENGINES[name]
+    if name not in available_engines():
+        return None
+    try:
+        result = subprocess.run([engine.executable, '--version'], capture_output=True,
+                                text=True, check=False, timeout=30)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    lines = result.stdout.strip().splitlines()
+    return lines[0] if lines else None
+
+
+def get_engine(name: Optional[str] = None, require_format: bool = False,
+               extra_args: Optional[Sequence[str]] = None) -> TexEngine:
+    """Look up an engine by name.
+
+    Args:
+        name: Engine name, ``"auto"`` for the fastest installed engine, or
+            None for the default (pdflatex)
+        require_format: With ``"auto"``, prefer engines that can use a
+            precompiled preamble format
+        extra_args: Additional flags passed to the engine on every run
+
+    Raises:
+        ValueError: If the name is not a known engine
+    """
+    if name is None:
+        engine = ENGINES[DEFAULT_ENGINE]
+    elif name == 'auto':
+        candidates = [ENGINES[n] for n in available_engines()]
+        if require_format:
+            candidates = [e for e in candidates if e.supports_format] or candidates
+        # Fall back to the default so the usual "not installed" help is shown
+        engine = candidates[0] if candidates else ENGINES[DEFAULT_ENGINE]
+    elif name in ENGINES:
+        engine = ENGINES[name]
+    else:
+        raise ValueError(f"Unknown TeX engine '{name}'. Choose from: auto, {', '.join(ENGINES)}")
+
+    return engine.with_args(extra_args) if extra_args else engine
+
+
+def list_engines() -> str:
+    """Return formatted string listing supported engines and whether they are installed."""
+    output = ["TeX Engines:"]
+    output.append("=" * 50)
+
+    installed = available_engines()
+    for name, engine in ENGINES.items():
+        status = (engine_version(name) or "installed") if name in installed else "not installed"
+        output.append(f"\n{name}: {engine.description}")
+        output.append(f"  Status: {status}")
+        features = []
+        if engine.supports_format:
+            features.append("precompiled preamble")
+        if engine.manages_reruns:
+            features.append("automatic reruns")
+        output.append(f"  Features: {', '.join(features) or 'standard'}")
+
+    if installed:
+        output.append(f"\nFastest installed engine ('auto'): {installed[0]}")
+    return "\n".join(output)
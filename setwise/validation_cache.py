@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Question Validation Cache
+
+Remembers the validation result of every question in a bank, keyed by a
+hash of the question's content, so that re-validating a file after editing
+a few questions only checks the questions that changed. Results are stored
+beside the question file, next to the cached bank.
+
+Invalidation policy: an entry is reused only while the question's content
+hash matches and the validation rules are unchanged. The whole cache is
+discarded when VALIDATION_RULES_VERSION or the Setwise version differs from
+the ones it was written with, so VALIDATION_RULES_VERSION must be bumped
+whenever QuestionManager or LaTeXValidator change what they report. A full
+validation run drops entries for questions that are no longer in the bank.
+"""
+
+import hashlib
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from . import __version__
+from .bank_cache import CACHE_DIR_NAME, read_cache_file, write_cache_file
+
+# Bump when question checks or LaTeX validation rules change their results
+VALIDATION_RULES_VERSION = 1
+
+
+class ValidationCache:
+    """Per-question validation results for one question file."""
+
+    def __init__(self, source: Path):
+        """Load the cached results for a question file, if any.
+
+        Args:
+            source: Question file being validated
+        """
+        self.source = Path(source)
+        self.entries: Dict[str, Optional[str]] = self._read()
+        self.seen = set()
+        self.changed = False
+
+    @staticmethod
+    def rules_key() -> str:
+        """Identify the validation rules the cached results were produced by."""
+        return f"{VALIDATION_RULES_VERSION}:{__version__}"
+
+    @staticmethod
+    def cache_path(source: Path) -> Path:
+        """Return where the validation results for a question file are stored."""
+        return source.parent / CACHE_DIR_NAME / f"{source.name}.validation.marshal"
+
+    @staticmethod
+    def question_key(section: str, question: Any) -> str:
+        """Hash a question's content.
+
+        The repr is hashed so that types the checks tell apart (a tuple of
+        options versus a list) get different keys. Values whose repr changes
+        between runs, such as functions in questions.py, simply never hit.
+        """
+        content = repr((section, question)).encode('utf-8', 'surrogatepass')
+        return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+    def _read(self) -> Dict[str, Optional[str]]:
+        """Return the stored results, or nothing if missing or from other rules."""
+        cached = read_cache_file(self.cache_path(self.source))
+        if cached is None:
+            return {}
+        header, entries = cached
+        if header.get('rules') != self.rules_key() or not isinstance(entries, dict):
+            return {}
+        return entries
+
+    def get(self, key: str) -> Tuple[bool, Optional[str]]:
+        """Return (hit, problem) for a question key."""
+        if key not in self.entries:
+            return False, None
+        self.seen.add(key)
+        return True, self.entries[key]
+
+    def put(self, key: str, problem: Optional[str]) -> None:
+        """Record the validation result for a question key."""
+        self.entries[key] = problem
+        self.seen.add(key)
+        self.changed = True
+
+    def save(self, prune: bool = False) -> bool:
+        """Write the results back beside the question file.
+
+        Failures (such as read-only directories) are not errors: the
+        questions are simply validated again next time.
+
+        Args:
+            prune: Drop results for questions not looked up since loading
+
+        Returns:
+            True if the results were written, False otherwise
+        """
+        if prune and len(self.seen) != len(self.entries):
+            self.entries = {key: self.entries[key] for key in self.seen}
+            self.changed = True
+        if not self.changed:
+            return True
+
+        if not write_cache_file(self.cache_path(self.source), {'rules': self.rules_key()}, self.entries):
+            return False
+        self.changed = False
+        return True
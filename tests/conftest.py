@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Shared fixtures for the Setwise tests
+"""
+
+import pytest
+import tempfile
+import os
+import shutil
+from pathlib import Path
+
+
+TEMPLATES_DIR = Path(__file__).parent.parent / "setwise" / "templates"
+
+
+@pytest.fixture
+def quiz_workspace(request):
+    """Temporary directory with a copy of the quiz templates, for test classes.
+
+    Sets temp_dir, template_dir and output_dir on the test instance. The
+    templates copied are those matching the class's `templates` glob
+    (default: the minimal template).
+    """
+    instance = request.instance
+    instance.temp_dir = tempfile.mkdtemp()
+    instance.template_dir = os.path.join(instance.temp_dir, "templates")
+    instance.output_dir = os.path.join(instance.temp_dir, "output")
+    os.makedirs(instance.template_dir, exist_ok=True)
+
+    for template in TEMPLATES_DIR.glob(getattr(instance, "templates", "quiz_template_minimal.tex.jinja")):
+        shutil.copy(template, instance.template_dir)
+
+    yield
+    shutil.rmtree(instance.temp_dir, ignore_errors=True)
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Tests for the question bank cache
+"""
+
+import pytest
+import tempfile
+import os
+import pickle
+import shutil
+from pathlib import Path
+from unittest.mock import patch
+
+from setwise.bank_cache import (QuestionBankCache, exec_questions_module, load_questions_module,
+                                parse_questions_module, read_cache_file)
+from setwise.formats import QuestionFormatConverter
+from setwise.question_bank import QuestionBank, QuestionBankRegistry
+from setwise.validation_cache import ValidationCache
+from setwise.question_manager import QuestionManager
+from setwise.quiz_generator import QuizGenerator
+
+
+QUESTIONS = '''
+quiz_metadata = {"title": "Cached Quiz"}
+mcq = [{"question": r"What is $2+2$?", "options": ["3", "4"], "answer": "4", "marks": 1}]
+subjective = [{"question": "Explain caching", "answer": "It avoids work", "marks": 5}]
+'''
+
+
+class TestQuestionBankCache:
+    """Test storing, reusing and invalidating cached banks"""
+
+    def setup_method(self):
+        """Setup for each test method"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.source = self.temp_dir / "questions.py"
+        self.source.write_text(QUESTIONS)
+
+    def teardown_method(self):
+        """Cleanup after each test method"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _load(self):
+        """Load through the cache, recording whether the module was executed"""
+        calls = []
+
+        def loader(source):
+            calls.append(source)
+            return exec_questions_module(source)
+
+        return QuestionBankCache.load_or_build(self.source, loader), calls
+
+    def test_second_load_uses_cache(self):
+        """The module is executed once; later loads read the cached copy"""
+        first, calls = self._load()
+        assert len(calls) == 1
+        assert QuestionBankCache.cache_path(self.source).exists()
+
+        second, calls = self._load()
+        assert calls == []
+        assert second == first
+        assert second['quiz_metadata'] == {"title": "Cached Quiz"}
+
+    def test_edit_invalidates_cache(self):
+        """Changing the source reloads it"""
+        self._load()
+        self.source.write_text(QUESTIONS.replace("Cached Quiz", "Edited Quiz"))
+
+        bank, calls = self._load()
+        assert len(calls) == 1
+        assert bank['quiz_metadata']['title'] == "Edited Quiz"
+
+    def test_touch_without_change_reuses_cache(self):
+        """A new mtime with identical content is resolved by the content hash"""
+        self._load()
+        stat = self.source.stat()
+        os.utime(self.source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        _, calls = self._load()
+        assert calls == []
+
+    def test_corrupt_cache_is_ignored(self):
+        """An unreadable cache file falls back to loading the source"""
+        self._load()
+        QuestionBankCache.cache_path(self.source).write_bytes(b"not a cache file")
+
+        bank, calls = self._load()
+        assert len(calls) == 1
+        assert len(bank['mcq']) == 1
+
+    def test_unpicklable_bank_is_not_cached(self):
+        """Banks holding values that are not plain literals are simply loaded every time"""
+        self.source.write_text(QUESTIONS + "\nmcq[0]['check'] = lambda x: x\n")
+
+        bank, _ = self._load()
+        assert callable(bank['mcq'][0]['check'])
+        assert not QuestionBankCache.cache_path(self.source).exists()
+        assert not list(self.source.parent.glob("__setwise_cache__/*.tmp"))
+
+
+class TestStaticLoading:
+    """Test reading questions.py files without executing them"""
+
+    def setup_method(self):
+        """Setup for each test method"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.marker = self.temp_dir / "executed"
+
+    def teardown_method(self):
+        """Cleanup after each test method"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _write(self, body):
+        source = self.temp_dir / "questions.py"
+        source.write_text(f"open({str(self.marker)!r}, 'w').close()\n" + body)
+        return source
+
+    def test_literals_are_read_without_executing(self):
+        """Literal banks load identically, and nothing in the file runs"""
+        source = self._write(QUESTIONS + "example_questions = {'mcq': mcq, 'subjective': subjective}\n")
+        bank = QuestionFormatConverter.load_bank(source)
+        assert not self.marker.exists()
+        assert bank == exec_questions_module(source)
+        assert bank['quiz_metadata'] == {"title": "Cached Quiz"}
+
+    @pytest.mark.parametrize("code", [
+        "mcq = [{'question': f'Q{i}?', 'options': ['a', 'b'], 'answer': 'a'} for i in range(3)]",
+        QUESTIONS + "mcq.append(mcq[0])",
+        QUESTIONS + "mcq += mcq",
+        QUESTIONS + "from os import *",
+        QUESTIONS + "for q in mcq:\n    q['marks'] = 2",
+    ])
+    def test_code_requires_allow_exec(self, code):
+        """Banks built or changed by code only load when executing is allowed"""
+        source = self._write(code + "\n")
+        with pytest.raises(ValueError, match="allow_exec"):
+            QuestionFormatConverter.load_bank(source)
+        assert not self.marker.exists()
+
+        bank = QuestionFormatConverter.load_bank(source, allow_exec=True)
+        assert self.marker.exists()
+        assert len(bank['mcq']) >= 1
+
+    def test_parse_reports_line(self):
+        """The offending assignment is named in the error"""
+        source = self._write("subjective = []\nmcq = list(range(3))\n")
+        with pytest.raises(ValueError, match="line 3: 'mcq' is not a literal"):
+            parse_questions_module(source)
+
+    def test_generator_and_validation_honour_allow_exec(self):
+        """QuizGenerator and validation refuse to execute files unless asked"""
+        source = self._write("mcq = [dict(question='Q?', options=['a', 'b'], answer='a', marks=1)]\nsubjective = []\n")
+        output_dir = str(self.temp_dir / "output")
+
+        with pytest.raises(RuntimeError, match="allow_exec"):
+            QuizGenerator(output_dir=output_dir, questions_file=str(source), use_bank_cache=False)
+        is_valid, message = QuestionManager.validate_questions_file(str(source))
+        assert not is_valid and "allow_exec" in message
+        assert not self.marker.exists()
+
+        generator = QuizGenerator(output_dir=output_dir, questions_file=str(source),
+                                  use_bank_cache=False, allow_exec=True)
+        assert generator.mcq[0]['question'] == "Q?"
+
+
+    def test_executed_bank_is_not_served_to_static_loads(self):
+        """Banks loaded with allow_exec stay out of reach of static loads"""
+        source = self._write("mcq = [dict(question='Q?', options=['a', 'b'], answer='a', marks=1)]\nsubjective = []\n")
+        registry = QuestionBankRegistry()
+
+        assert len(registry.get(str(source), allow_exec=True).mcq) == 1
+        assert len(QuestionBank.from_file(str(source), allow_exec=True).mcq) == 1
+        assert QuestionBankCache.cache_path(source, allow_exec=True).exists()
+        assert not QuestionBankCache.cache_path(source).exists()
+
+        with pytest.raises(ValueError, match="allow_exec"):
+            registry.get(str(source))
+        with pytest.raises(ValueError, match="allow_exec"):
+            QuestionBank.from_file(str(source))
+
+    def test_cache_files_are_never_unpickled(self):
+        """A pickle planted in the cache directory is ignored, not loaded"""
+        source = self._write(QUESTIONS)
+        QuestionFormatConverter.load_bank(source)
+        payload = pickle.dumps(Path(str(self.marker)))
+        for cache_file in (QuestionBankCache.cache_path(source), ValidationCache.cache_path(source)):
+            cache_file.parent.mkdir(exist_ok=True)
+            cache_file.write_bytes(payload)
+
+        assert read_cache_file(QuestionBankCache.cache_path(source)) is None
+        assert QuestionBankCache.load(source) is None
+        assert ValidationCache(source).entries == {}
+
+
+class TestCachedLoading:
+    """Test that QuizGenerator and QuestionManager use the cache"""
+
+    def setup_method(self):
+        """Setup for each test method"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.source = os.path.join(self.temp_dir, "questions.py")
+        Path(self.source).write_text(QUESTIONS)
+        self.output_dir = os.path.join(self.temp_dir, "output")
+
+    def teardown_method(self):
+        """Cleanup after each test method"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_generators_share_cached_bank(self):
+        """Only the first generator reads the questions module"""
+        with patch('setwise.formats.load_questions_module',
+                   wraps=load_questions_module) as loader:
+            first = QuizGenerator(output_dir=self.output_dir, questions_file=self.source)
+            second = QuizGenerator(output_dir=self.output_dir, questions_file=self.source)
+        assert loader.call_count == 1
+        assert second.mcq == first.mcq
+        assert second.quiz_metadata["title"] == "Cached Quiz"
+
+    def test_bank_cache_can_be_disabled(self):
+        """use_bank_cache=False always executes the module and writes no cache"""
+        QuizGenerator(output_dir=self.output_dir, questions_file=self.source, use_bank_cache=False)
+        assert not QuestionBankCache.cache_path(Path(self.source)).exists()
+
+    def test_validation_uses_cache(self):
+        """Validating a file caches the bank for later generators"""
+        is_valid, _ = QuestionManager.validate_questions_file(self.source)
+        assert is_valid
+        assert QuestionBankCache.cache_path(Path(self.source)).exists()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Tests for the content-addressed PDF build cache
+"""
+
+import pytest
+import tempfile
+import os
+import shutil
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+
+from setwise.build_cache import BuildCache
+from setwise.quiz_generator import QuizGenerator
+
+
+class TestBuildCache:
+    """Test BuildCache storage, keys and eviction"""
+
+    def setup_method(self):
+        """Setup for each test method"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.cache = BuildCache(str(self.temp_dir / "cache"))
+
+    def teardown_method(self):
+        """Cleanup after each test method"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_key_depends_on_content_template_and_assets(self):
+        """Any input that changes the PDF changes the key"""
+        template = self.temp_dir / "template.tex.jinja"
+        template.write_text("v1")
+        asset = self.temp_dir / "figure.png"
+        asset.write_bytes(b"png-1")
+
+        base = BuildCache.compute_key("tex", template, [asset])
+        assert base == BuildCache.compute_key("tex", template, [asset])
+        assert base != BuildCache.compute_key("tex2", template, [asset])
+        assert base != BuildCache.compute_key("tex", template, [asset], extra="max_passes=3")
+
+        template.write_text("v2")
+        assert base != BuildCache.compute_key("tex", template, [asset])
+        template.write_text("v1")
+
+        asset.write_bytes(b"png-2")
+        assert base != BuildCache.compute_key("tex", template, [asset])
+
+    def test_find_assets(self):
+        """Included files that exist on disk are detected"""
+        (self.temp_dir / "figures").mkdir()
+        (self.temp_dir / "figures" / "plot.png").write_bytes(b"png")
+        tex = "\\includegraphics[width=3cm]{figures/plot} \\input{missing}"
+
+        assets = BuildCache.find_assets(tex, self.temp_dir)
+        assert assets == [self.temp_dir / "figures" / "plot.png"]
+
+    def test_put_and_get_roundtrip(self):
+        """A stored PDF is restored at the requested destination"""
+        pdf = self.temp_dir / "quiz.pdf"
+        pdf.write_bytes(b"%PDF-1")
+
+        assert self.cache.get("ab" * 32, self.temp_dir / "out.pdf") is False
+        self.cache.put("ab" * 32, pdf)
+
+        destination = self.temp_dir / "out.pdf"
+        destination.write_bytes(b"stale")
+        assert self.cache.get("ab" * 32, destination) is True
+        assert destination.read_bytes() == b"%PDF-1"
+
+    def test_eviction_removes_least_recently_used(self):
+        """Entries beyond max_bytes are evicted oldest first"""
+        cache = BuildCache(str(self.temp_dir / "small"), max_bytes=20)
+        pdf = self.temp_dir / "quiz.pdf"
+        pdf.write_bytes(b"x" * 8)
+
+        keys = [f"{i:02d}" * 32 for i in range(3)]
+        for age, key in enumerate(keys):
+            cache.put(key, pdf)
+            entry = cache._entry_path(key)
+            os.utime(entry, (1000 + age, 1000 + age))
+        cache.evict()
+
+        remaining = [key for key in keys if cache._entry_path(key).exists()]
+        assert remaining == keys[1:]
+
+    def test_put_scans_cache_only_when_over_limit(self):
+        """Storing entries keeps a running total instead of statting every entry"""
+        cache = BuildCache(str(self.temp_dir / "small"), max_bytes=20)
+        pdf = self.temp_dir / "quiz.pdf"
+        pdf.write_bytes(b"x" * 8)
+
+        keys = [f"{i:02d}" * 32 for i in range(4)]
+        with patch.object(BuildCache, '_scan', autospec=True, side_effect=BuildCache._scan) as scan:
+            for key in keys[:2]:
+                cache.put(key, pdf)
+            cache.put(keys[0], pdf)
+            assert scan.call_count == 1
+            for age, key in enumerate(keys[:2]):
+                os.utime(cache._entry_path(key), (1000 + age, 1000 + age))
+
+            cache.put(keys[2], pdf)
+            assert scan.call_count == 2
+            cache.put(keys[3], pdf)
+            assert scan.call_count == 3
+
+        remaining = [key for key in keys if cache._entry_path(key).exists()]
+        assert remaining == keys[2:]
+
+
+@pytest.mark.usefixtures("quiz_workspace")
+class TestGenerateWithCache:
+    """Test generate_quizzes reuse of cached PDFs"""
+
+    def _fake_run(self, command, *args, **kwargs):
+        """Pretend to be pdflatex by writing a PDF next to the .tex file"""
+        output_dir = next(a for a in command if str(a).startswith('-output-directory='))
+        tex_file = Path(command[-1])
+        Path(output_dir.split('=', 1)[1], f"{tex_file.stem}.pdf").write_bytes(b"%PDF")
+        return MagicMock(returncode=0)
+
+    def test_rerun_with_same_seed_uses_cache(self):
+        """Identical reruns do not invoke LaTeX again"""
+        generator = QuizGenerator(template_dir=self.template_dir, output_dir=self.output_dir)
+        with patch('setwise.quiz_generator._run_latex', side_effect=self._fake_run) as mock_run:
+            assert generator.generate_quizzes(num_sets=2, template_name="minimal", seed=7) is True
+            assert mock_run.call_count == 2
+
+            mock_run.reset_mock()
+            assert generator.generate_quizzes(num_sets=2, template_name="minimal", seed=7) is True
+            assert mock_run.call_count == 0
+
+        assert len(list(Path(self.output_dir).glob("quiz_set_*.pdf"))) == 2
+
+    def test_no_cache_always_compiles(self):
+        """use_cache=False bypasses the build cache"""
+        generator = QuizGenerator(template_dir=self.template_dir, output_dir=self.output_dir)
+        with patch('setwise.quiz_generator._run_latex', side_effect=self._fake_run) as mock_run:
+            generator.generate_quizzes(num_sets=2, template_name="minimal", seed=7)
+            mock_run.reset_mock()
+            generator.generate_quizzes(num_sets=2, template_name="minimal", seed=7, use_cache=False)
+            assert mock_run.call_count == 2
+
+    def test_recompiling_never_writes_into_cache(self):
+        """Compiling over a PDF hardlinked from the cache leaves the entry intact"""
+        compiles = []
+
+        def counting_run(command, *args, **kwargs):
+            compiles.append(command)
+            output_dir = next(a for a in command if str(a).startswith('-output-directory='))
+            pdf = Path(output_dir.split('=', 1)[1], f"{Path(command[-1]).stem}.pdf")
+            pdf.write_bytes(f"compile #{len(compiles)}".encode())
+            return MagicMock(returncode=0)
+
+        generator = QuizGenerator(template_dir=self.template_dir, output_dir=self.output_dir)
+        cache_dir = Path(self.output_dir) / ".setwise_cache"
+        with patch('setwise.quiz_generator._run_latex', side_effect=counting_run):
+            generator.generate_quizzes(num_sets=1, template_name="minimal", seed=7)
+            generator.generate_quizzes(num_sets=1, template_name="minimal", seed=7)
+            generator.generate_quizzes(num_sets=1, template_name="minimal", seed=7, use_cache=False)
+
+        assert len(compiles) == 2
+        assert [entry.read_bytes() for entry in cache_dir.glob("*/*.pdf")] == [b"compile #1"]
+        assert (Path(self.output_dir) / "quiz_set_1.pdf").read_bytes() == b"compile #2"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
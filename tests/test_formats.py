@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Tests for question file format loading
+"""
+
+import pytest
+import io
+import random
+import re
+import tempfile
+import shutil
+import tracemalloc
+import yaml
+from pathlib import Path
+from unittest.mock import patch
+
+from setwise import formats
+from setwise.formats import MarkdownQuestionParser, QuestionFormatConverter
+
+
+class TestStreamingCsv:
+    """Test the streaming CSV question reader"""
+
+    def setup_method(self):
+        """Setup for each test method"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.path = self.temp_dir / "questions.csv"
+
+    def teardown_method(self):
+        """Cleanup after each test method"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_yields_typed_questions_in_order(self):
+        """Rows are yielded one at a time with their question type"""
+        self.path.write_text(
+            "type,question,optionA,optionB,optionC,answer,marks\n"
+            "MCQ,What is 2+2?,3,4,,4,2\n"
+            "Subjective,Explain caching,,,,It avoids work,\n"
+            ",,,,,,\n"
+            "mcq,Pick one,x,y,z,x,\n"
+        )
+        stream = QuestionFormatConverter.iter_questions_csv(self.path)
+        assert next(stream) == ('mcq', {'question': 'What is 2+2?', 'options': ['3', '4'],
+                                        'answer': '4', 'marks': 2})
+        assert list(stream) == [
+            ('subjective', {'question': 'Explain caching', 'answer': 'It avoids work', 'marks': 5}),
+            ('mcq', {'question': 'Pick one', 'options': ['x', 'y', 'z'], 'answer': 'x', 'marks': 1}),
+        ]
+
+    def test_matches_load_questions(self):
+        """Streaming yields the same questions load_questions returns"""
+        mcq = [{'question': f'Q{i}?', 'options': ['a', 'b'], 'answer': 'a', 'marks': 1} for i in range(20)]
+        subjective = [{'question': 'Why?', 'answer': 'Because', 'marks': 5}]
+        QuestionFormatConverter.save_questions(mcq, subjective, str(self.path))
+
+        streamed = list(QuestionFormatConverter.iter_questions_csv(self.path))
+        assert [q for t, q in streamed if t == 'mcq'] == mcq
+        assert [q for t, q in streamed if t == 'subjective'] == subjective
+        assert QuestionFormatConverter.load_questions(str(self.path)) == (mcq, subjective)
+
+    def test_dialect_detected_beyond_first_kilobyte(self):
+        """Semicolon files whose first row is longer than 1 KB are still parsed"""
+        long_question = "Explain " + "x" * 2000
+        self.path.write_text(
+            "type;question;option1;option2;answer;marks\n"
+            f"Subjective;{long_question};;;Because;5\n"
+            "MCQ;Pick one;a;b;a;1\n"
+        )
+        _, subjective = QuestionFormatConverter.load_questions(str(self.path))
+        assert subjective[0]['question'] == long_question
+
+    def test_constant_memory(self):
+        """Memory use does not grow with the number of rows consumed"""
+        with open(self.path, 'w', encoding='utf-8', newline='') as f:
+            f.write("type,question,option1,option2,answer,marks\n")
+            for i in range(5000):
+                f.write(f"MCQ,Question {i} with some padding text?,yes,no,yes,1\n")
+
+        tracemalloc.start()
+        try:
+            count = 0
+            for _ in QuestionFormatConverter.iter_questions_csv(self.path):
+                count += 1
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert count == 5000
+        assert peak < 1024 * 1024
+
+
+YAML_BACKENDS = [(yaml.SafeLoader, yaml.SafeDumper)]
+if yaml.__with_libyaml__:
+    YAML_BACKENDS.append((yaml.CSafeLoader, yaml.CSafeDumper))
+
+
+class TestStreamingWriters:
+    """Test writing question files from iterators"""
+
+    MCQ = [{'question': f'What is {i} + 1?', 'options': [str(i), str(i + 1)], 'answer': str(i + 1), 'marks': 1}
+           for i in range(5)]
+    SUBJECTIVE = [{'question': 'Explain \\textbf{caching}', 'answer': 'It avoids work, é', 'marks': 5}]
+
+    def setup_method(self):
+        """Setup for each test method"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def teardown_method(self):
+        """Cleanup after each test method"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    @pytest.mark.parametrize("suffix", ['.py', '.yaml', '.json', '.csv', '.md'])
+    def test_iterators_write_same_file_as_lists(self, suffix):
+        """Generators of questions produce the same file as lists"""
+        from_lists = self.temp_dir / f"lists{suffix}"
+        from_iterators = self.temp_dir / f"iterators{suffix}"
+        assert QuestionFormatConverter.save_questions(self.MCQ, self.SUBJECTIVE, str(from_lists))
+        assert QuestionFormatConverter.save_questions((q for q in self.MCQ), iter(self.SUBJECTIVE),
+                                                      str(from_iterators))
+        assert from_lists.read_text(encoding='utf-8') == from_iterators.read_text(encoding='utf-8')
+
+    @pytest.mark.parametrize("suffix", ['.py', '.yaml', '.json', '.csv'])
+    def test_round_trip(self, suffix):
+        """Written files load back to the same questions, across YAML chunks too"""
+        path = self.temp_dir / f"questions{suffix}"
+        with patch.object(formats, 'YAML_CHUNK_SIZE', 2):
+            assert QuestionFormatConverter.save_questions(iter(self.MCQ), iter(self.SUBJECTIVE), str(path))
+        assert QuestionFormatConverter.load_questions(str(path)) == (self.MCQ, self.SUBJECTIVE)
+
+    def test_yaml_shared_objects_across_chunks(self):
+        """Objects shared between questions are written out in full, not as clashing anchors"""
+        variables = [{'name': 'x', 'min': 1, 'max': 9}]
+        mcq = [dict(q, variables=variables) for q in self.MCQ]
+        subjective = [dict(q, variables=variables) for q in self.SUBJECTIVE]
+        path = self.temp_dir / "questions.yaml"
+        with patch.object(formats, 'YAML_CHUNK_SIZE', 2):
+            assert QuestionFormatConverter.save_questions(mcq, subjective, str(path))
+        assert '&id' not in path.read_text(encoding='utf-8')
+        assert QuestionFormatConverter.load_questions(str(path)) == (mcq, subjective)
+
+    @pytest.mark.parametrize("dumper", [dumper for _, dumper in YAML_BACKENDS])
+    def test_yaml_non_ascii_round_trip(self, dumper):
+        """Non-ASCII text written by either YAML backend loads back the same with both"""
+        mcq = [{'question': 'Solve $𝑥^2 = 4$ for $𝑥 ∈ ℝ$ — naïve?', 'options': ['±2', '２', '😀'],
+                'answer': '±2', 'marks': 1}]
+        subjective = [{'question': 'Résumé ' + 'très long ' * 20, 'answer': '∫₀¹ 𝑥 d𝑥 = ½', 'marks': 5}]
+        path = self.temp_dir / "questions.yaml"
+        backend = type('Dumper', (dumper,), {'ignore_aliases': formats._QuestionDumper.ignore_aliases})
+        with patch.object(formats, '_QuestionDumper', backend):
+            assert QuestionFormatConverter.save_questions(mcq, subjective, str(path))
+        for loader, _ in YAML_BACKENDS:
+            with patch.object(formats, 'YamlLoader', loader):
+                assert QuestionFormatConverter.load_questions(str(path)) == (mcq, subjective)
+
+    def test_empty_lists(self):
+        """Banks without questions are still valid files"""
+        for suffix in ('.py', '.yaml', '.json'):
+            path = self.temp_dir / f"empty{suffix}"
+            assert QuestionFormatConverter.save_questions(iter([]), iter([]), str(path))
+            assert QuestionFormatConverter.load_questions(str(path)) == ([], [])
+
+    def test_convert_streams_csv(self):
+        """CSV files are converted row by row and the question counts reported"""
+        source = self.temp_dir / "questions.csv"
+        QuestionFormatConverter.save_questions(self.MCQ, self.SUBJECTIVE, str(source))
+        target = self.temp_dir / "questions.json"
+
+        with patch.object(QuestionFormatConverter, 'load_questions') as load:
+            counts = QuestionFormatConverter.convert_file(str(source), str(target))
+        load.assert_not_called()
+        assert counts == (5, 1)
+        assert QuestionFormatConverter.load_questions(str(target)) == (self.MCQ, self.SUBJECTIVE)
+
+    def test_convert_refuses_to_overwrite_input(self):
+        """Streaming into the file being read would destroy it"""
+        source = self.temp_dir / "questions.csv"
+        QuestionFormatConverter.save_questions(self.MCQ, self.SUBJECTIVE, str(source))
+        with pytest.raises(ValueError):
+            QuestionFormatConverter.convert_file(str(source), str(source), 'csv')
+
+
+def regex_load_markdown(content):
+    """Reference: the regular-expression Markdown loader the parser replaced"""
+    mcq = []
+    subjective = []
+
+    mcq_match = re.search(r'## MCQ\s*\n(.*?)(?=## |$)', content, re.DOTALL)
+    if mcq_match:
+        question_pattern = r'\*\*(.*?)\*\*\n((?:- .*\n)*)\*Answer:\* (.*?)(?:\n|$)'
+        for match in re.finditer(question_pattern, mcq_match.group(1)):
+            question = match.group(1).strip()
+            answer = match.group(3).strip()
+            options = [line.strip()[2:] for line in match.group(2).strip().split('\n')
+                       if line.strip().startswith('- ')]
+            if question and options and answer:
+                mcq.append({'question': question, 'options': options, 'answer': answer, 'marks': 1})
+
+    subj_match = re.search(r'## Subjective\s*\n(.*?)(?=## |$)', content, re.DOTALL)
+    if subj_match:
+        question_pattern = r'\*\*(.*?)\*\*\n(.*?)(?=\*\*|$)'
+        for match in re.finditer(question_pattern, subj_match.group(1), re.DOTALL):
+            question = match.group(1).strip()
+            if question:
+                subjective.append({'question': question, 'answer': match.group(2).strip(), 'marks': 5})
+
+    return mcq, subjective
+
+
+def parse_markdown(content):
+    """Parse a Markdown string with MarkdownQuestionParser"""
+    return MarkdownQuestionParser().parse(io.StringIO(content))
+
+
+class TestMarkdownParser:
+    """Test the single-pass Markdown question parser"""
+
+    DOCUMENT = (
+        "# Quiz\n\n"
+        "## MCQ\n\n"
+        "**What is $2 + 2$?**\n- 3\n- 4\n*Answer:* 4\n\n"
+        "1. **Pick a **bold** option**\n- **yes**\n-  no\n- \n*Answer:* **yes**\n\n"
+        "**No answer line**\n- a\n\n"
+        "## Subjective\n\n"
+        "**Explain gravity.**\nIt attracts objects with mass.\n\n"
+        "**A question\nover two lines**\nThe answer\nalso spans lines.\n"
+    )
+
+    def test_parses_documented_layout(self):
+        """MCQ blocks and multi-line subjective questions are read"""
+        mcq, subjective = parse_markdown(self.DOCUMENT)
+        assert mcq == [
+            {'question': 'What is $2 + 2$?', 'options': ['3', '4'], 'answer': '4', 'marks': 1},
+            {'question': 'Pick a **bold** option', 'options': ['**yes**', ' no'], 'answer': '**yes**', 'marks': 1},
+        ]
+        assert subjective == [
+            {'question': 'Explain gravity.', 'answer': 'It attracts objects with mass.', 'marks': 5},
+            {'question': 'A question\nover two lines', 'answer': 'The answer\nalso spans lines.', 'marks': 5},
+        ]
+
+    def test_sections_end_at_next_heading(self):
+        """A section stops at the next '## ', even mid-line, and only the first one counts"""
+        content = ("## Subjective\n**Q1**\nA1 ## cut\n**Q2**\nA2\n"
+                   "## MCQ\n**M**\n- a\n*Answer:* a\n## Subjective\n**Q3**\nA3\n")
+        mcq, subjective = parse_markdown(content)
+        assert [q['question'] for q in mcq] == ['M']
+        assert subjective == [{'question': 'Q1', 'answer': 'A1', 'marks': 5}]
+
+    def test_matches_regex_loader(self):
+        """The parser returns what the regex loader returned on documented and edge-case input"""
+        assert parse_markdown(self.DOCUMENT) == regex_load_markdown(self.DOCUMENT)
+
+        lines = ['## MCQ\n', '## Subjective\n', '### MCQ \n', '**Q**\n', 'x **Q** y**\n',
+                 '- o\n', '- \n', '-  p\n', '*Answer:* o\n', '*Answer:* \n', '\n', 'text\n',
+                 '**\n', 'more**\n', 'A ** B\n', 'c ## d\n']
+        rng = random.Random(0)
+        for _ in range(2000):
+            content = ''.join(rng.choice(lines) for _ in range(rng.randint(0, 25)))
+            if rng.random() < 0.5:
+                content = content.rstrip('\n')
+            assert parse_markdown(content) == regex_load_markdown(content), repr(content)
+
+    def test_load_questions_uses_parser(self):
+        """QuestionFormatConverter reads .md files with the parser"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "questions.md"
+            path.write_text(self.DOCUMENT, encoding='utf-8')
+            assert QuestionFormatConverter.load_questions(str(path)) == parse_markdown(self.DOCUMENT)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
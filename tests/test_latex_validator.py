@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Tests for LaTeX validation
+"""
+
+import pytest
+import random
+import re
+
+from setwise.latex_validator import LaTeXValidator
+
+
+def regex_validate(text):
+    """Reference: the multi-pass validator the single-pass one replaced"""
+    errors = []
+    if text.count('$') % 2 != 0:
+        errors.append("Unmatched $ delimiters - every $ must have a closing $")
+
+    brace_depth = 0
+    for i, char in enumerate(text):
+        if char == '{':
+            brace_depth += 1
+        elif char == '}':
+            brace_depth -= 1
+            if brace_depth < 0:
+                errors.append(f"Unmatched closing brace at position {i}")
+                break
+    if brace_depth > 0:
+        errors.append(f"Unmatched opening braces - missing {brace_depth} closing braces")
+
+    begin_envs = re.findall(r'\\begin\{([^}]+)\}', text)
+    end_envs = re.findall(r'\\end\{([^}]+)\}', text)
+    for env in begin_envs:
+        if begin_envs.count(env) != end_envs.count(env):
+            errors.append(f"Unmatched \\begin{{{env}}} environment")
+
+    if re.search(r'\\frac\{[^}]*\}\{?\}?$', text):
+        errors.append("Incomplete \\frac command - needs both numerator and denominator")
+    if re.search(r'\\sqrt\{\}', text):
+        errors.append("Empty \\sqrt command")
+
+    for math in re.findall(r'\$([^$]+)\$', text):
+        if re.search(r'[&%#]', math):
+            errors.append(f"Invalid characters (&, %, #) in math mode: {math}")
+
+    if not LaTeXValidator._is_in_math_environment(text):
+        math_patterns = [
+            (r'\b[a-zA-Z]\^[0-9+]', "variable with superscript"),
+            (r'\b[a-zA-Z]_[0-9+]', "variable with subscript"),
+            (r'\\frac\{[^}]*\}\{[^}]*\}', "fraction"),
+            (r'\\sqrt\{[^}]*\}', "square root"),
+            (r'\\sum|\\int|\\lim', "mathematical operator"),
+        ]
+        for pattern, description in math_patterns:
+            for match in re.findall(pattern, text):
+                if not LaTeXValidator._is_in_math_mode(text, match):
+                    errors.append(f"Math expression '{match}' ({description}) should be in math mode: ${match}$")
+
+    return len(errors) == 0, errors
+
+
+class TestValidateLatexSyntax:
+    """Test the single-pass LaTeX syntax validator"""
+
+    def test_valid_text(self):
+        """Plain text and well-formed math pass"""
+        assert LaTeXValidator.validate_latex_syntax("What is 2 + 2?") == (True, [])
+        assert LaTeXValidator.validate_latex_syntax(r"Compute $\frac{1}{2} + x^{2}$") == (True, [])
+
+    def test_braces_and_dollars(self):
+        """Unbalanced delimiters are reported in order"""
+        is_valid, errors = LaTeXValidator.validate_latex_syntax("$x} {")
+        assert not is_valid
+        assert errors == ["Unmatched $ delimiters - every $ must have a closing $",
+                          "Unmatched closing brace at position 2"]
+
+        _, errors = LaTeXValidator.validate_latex_syntax("{{a}")
+        assert errors == ["Unmatched opening braces - missing 1 closing braces"]
+
+    def test_environments(self):
+        """Every unmatched \\begin is reported, including repeats"""
+        text = r"\begin{align}a\end{align}\begin{cases}\begin{cases}\end{cases}"
+        _, errors = LaTeXValidator.validate_latex_syntax(text)
+        assert errors == [r"Unmatched \begin{cases} environment"] * 2
+
+    def test_math_checks(self):
+        """Invalid characters in math and math outside $ are found"""
+        _, errors = LaTeXValidator.validate_latex_syntax(r"Is $a & b$ or x^2 or $y_1$ or \sqrt{}?")
+        assert errors == [
+            "Empty \\sqrt command",
+            "Invalid characters (&, %, #) in math mode: a & b",
+            "Math expression 'x^2' (variable with superscript) should be in math mode: $x^2$",
+            "Math expression '\\sqrt{}' (square root) should be in math mode: $\\sqrt{}$",
+        ]
+
+    def test_matches_reference(self):
+        """Results are identical to the multi-pass validator on random LaTeX fragments"""
+        tokens = ['$', '$$', '{', '}', '\\begin{', '\\end{', '\\begin{equation}', 'align', 'x', 'x^2', 'y_1',
+                  'a^+', '\\frac{1}{2}', '\\frac{', '\\sqrt{}', '\\sqrt{x}', '\\sum', '\\lim', '&', '%', '#',
+                  ' ', '\n', 'eq}', '\\\\', '_', '^']
+        rng = random.Random(0)
+        for _ in range(5000):
+            text = ''.join(rng.choice(tokens) for _ in range(rng.randint(0, 20)))
+            assert LaTeXValidator.validate_latex_syntax(text) == regex_validate(text), repr(text)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Tests for question library discovery and the library index
+"""
+
+import pytest
+import tempfile
+import json
+import shutil
+from pathlib import Path
+from unittest.mock import patch
+
+from setwise.library_index import LibraryIndex, scan_question_files, search_roots
+from setwise.question_manager import QuestionManager
+
+
+BANK = {
+    "mcq": [{"question": "What is 2 + 2?", "options": ["3", "4"], "answer": "4", "marks": 1}],
+    "subjective": [{"question": "Explain caching", "answer": "It avoids work", "marks": 5}],
+}
+
+
+class TestLibraryDiscovery:
+    """Test the single-walk scanner and cached library listings"""
+
+    def setup_method(self):
+        """Setup for each test method"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        for relative in ["questions.json", "data/algebra_questions.yaml", "data/deep/more_questions.csv",
+                         ".git/questions.json", "node_modules/pkg/questions.json",
+                         "myenv/lib/questions.json", "__setwise_cache__/questions.json"]:
+            self._write(relative)
+        (self.temp_dir / "myenv" / "pyvenv.cfg").write_text("home = /usr/bin\n")
+        (self.temp_dir / "data" / "notes.json").write_text("{}")
+
+    def teardown_method(self):
+        """Cleanup after each test method"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _write(self, relative, bank=BANK):
+        path = self.temp_dir / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.suffix == '.csv':
+            path.write_text("type,question,answer,marks\nsubjective,Explain caching,It avoids work,5\n")
+        else:
+            path.write_text(json.dumps(bank))
+        return path
+
+    def _list(self, **kwargs):
+        """List libraries under the temp dir, recording which files were validated"""
+        validated = []
+        validate = QuestionManager.validate_questions_report
+
+        def recording_validate(path, **validate_kwargs):
+            validated.append(Path(path).name)
+            return validate(path, **validate_kwargs)
+
+        with patch.object(QuestionManager, 'validate_questions_report', side_effect=recording_validate):
+            libraries = QuestionManager.list_question_libraries([str(self.temp_dir)], jobs=1, **kwargs)
+        return libraries, validated
+
+    def test_scan_prunes_ignored_directories(self):
+        """Only question files outside ignored directories are found"""
+        found = [Path(entry.path).relative_to(self.temp_dir).as_posix()
+                 for entry in scan_question_files(str(self.temp_dir))]
+        assert found == ["questions.json", "data/algebra_questions.yaml", "data/deep/more_questions.csv"]
+
+    def test_nested_search_dirs_are_walked_once(self):
+        """A search directory inside another is covered by the outer walk"""
+        roots = search_roots([str(self.temp_dir), str(self.temp_dir / "data"), str(self.temp_dir / "missing")])
+        assert roots == [self.temp_dir]
+        # ...unless the outer walk prunes it
+        roots = search_roots([str(self.temp_dir), str(self.temp_dir / "node_modules")])
+        assert roots == [self.temp_dir, self.temp_dir / "node_modules"]
+
+    def test_unchanged_libraries_come_from_index(self):
+        """Listing again validates only new or changed files"""
+        first, validated = self._list()
+        assert sorted(validated) == ["algebra_questions.yaml", "more_questions.csv", "questions.json"]
+        assert all(library['valid'] for library in first)
+        assert LibraryIndex.index_path(self.temp_dir).exists()
+
+        second, validated = self._list()
+        assert validated == []
+        assert second == first
+
+        bad = dict(BANK, mcq=[{"question": "Broken?", "options": ["3"], "answer": "4"}])
+        self._write("data/algebra_questions.yaml", bad)
+        third, validated = self._list()
+        assert validated == ["algebra_questions.yaml"]
+        assert [library['valid'] for library in third] == [True, False, True]
+        assert third[1]['info'] == "MCQ question 1 must have at least 2 options"
+
+    def test_deferred_validation(self):
+        """validate=False lists files without loading them"""
+        libraries, validated = self._list(validate=False)
+        assert validated == []
+        assert [library['valid'] for library in libraries] == [None, None, None]
+        assert libraries[0]['format'] == 'json'
+
+    def test_removed_files_leave_index(self):
+        """Files no longer found are dropped from the index"""
+        self._list()
+        (self.temp_dir / "questions.json").unlink()
+        libraries, validated = self._list()
+        assert validated == []
+        assert len(libraries) == 2
+        assert len(LibraryIndex(self.temp_dir).entries) == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
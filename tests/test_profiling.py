@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Tests for per-stage generation profiling
+"""
+
+import pytest
+import tempfile
+import os
+import json
+import shutil
+from pathlib import Path
+
+from setwise.profiling import StageTimer
+from setwise.quiz_generator import QuizGenerator
+
+
+class TestStageTimer:
+    """Test StageTimer accounting and reporting"""
+
+    def test_records_counts_and_totals(self):
+        """Repeated stages accumulate count, total and max"""
+        timer = StageTimer()
+        timer.record("rendering", 0.5)
+        timer.record("rendering", 1.5)
+        with timer.stage("sampling"):
+            pass
+
+        stages = timer.to_dict()["stages"]
+        assert stages["rendering"]["count"] == 2
+        assert stages["rendering"]["total_seconds"] == pytest.approx(2.0)
+        assert stages["rendering"]["mean_seconds"] == pytest.approx(1.0)
+        assert stages["rendering"]["max_seconds"] == pytest.approx(1.5)
+        assert stages["sampling"]["count"] == 1
+
+    def test_stage_recorded_when_block_raises(self):
+        """Time is recorded even if the timed block fails"""
+        timer = StageTimer()
+        with pytest.raises(ValueError):
+            with timer.stage("rendering"):
+                raise ValueError("boom")
+
+        assert timer.to_dict()["stages"]["rendering"]["count"] == 1
+
+    def test_summary_table_and_json(self):
+        """The summary lists slowest stages first and JSON round-trips"""
+        timer = StageTimer()
+        timer.record("fast", 0.1)
+        timer.record("slow", 0.9)
+
+        table = timer.summary_table()
+        assert table.index("slow") < table.index("fast")
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "profile.json")
+            timer.write_json(path)
+            with open(path) as f:
+                data = json.load(f)
+        assert data["total_seconds"] == pytest.approx(1.0)
+
+
+class TestGenerationProfile:
+    """Test that generation runs are instrumented"""
+
+    def test_generation_stages_recorded(self):
+        """A generation run reports each stage it went through"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            template_dir = os.path.join(temp_dir, "templates")
+            os.makedirs(template_dir)
+            setwise_root = Path(__file__).parent.parent
+            shutil.copy(setwise_root / "setwise" / "templates" / "quiz_template_minimal.tex.jinja",
+                        template_dir)
+
+            generator = QuizGenerator(template_dir=template_dir,
+                                      output_dir=os.path.join(temp_dir, "output"))
+            generator.generate_quizzes(num_sets=2, template_name="minimal", compile_pdf=False)
+
+        stages = generator.profiler.to_dict()["stages"]
+        assert stages["question_loading"]["count"] == 1
+        for name in ["template_processing", "sampling", "rendering", "file_writing"]:
+            assert stages[name]["count"] == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Tests for shared question banks and the in-process bank registry
+"""
+
+import pytest
+import tempfile
+import os
+import shutil
+from pathlib import Path
+from unittest.mock import patch
+
+import yaml
+
+from setwise import formats
+from setwise.formats import QuestionFormatConverter
+from setwise.question_bank import QuestionBank, QuestionBankRegistry
+from setwise.quiz_generator import QuizGenerator
+
+
+def write_bank(path, title, count=1):
+    """Write a small questions.py file"""
+    mcq = ",".join(
+        f'{{"question": "Q{i}?", "options": ["a", "b"], "answer": "a", "marks": 1}}'
+        for i in range(count)
+    )
+    Path(path).write_text(f'quiz_metadata = {{"title": "{title}"}}\nmcq = [{mcq}]\nsubjective = []\n')
+
+
+class TestQuestionBankRegistry:
+    """Test reuse, invalidation and eviction of registered banks"""
+
+    def setup_method(self):
+        """Setup for each test method"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def teardown_method(self):
+        """Cleanup after each test method"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_same_file_returns_same_bank(self):
+        """Repeated lookups of an unchanged file share one bank object"""
+        path = self.temp_dir / "questions.py"
+        write_bank(path, "Course A")
+        registry = QuestionBankRegistry()
+
+        first = registry.get(str(path))
+        assert registry.get(str(path)) is first
+        assert (registry.hits, registry.misses) == (1, 1)
+        assert first.quiz_metadata["title"] == "Course A"
+
+    def test_modified_file_is_reloaded(self):
+        """A new mtime loads the file again and replaces the old version"""
+        path = self.temp_dir / "questions.py"
+        write_bank(path, "Old")
+        registry = QuestionBankRegistry()
+        registry.get(str(path))
+
+        write_bank(path, "New title")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        assert registry.get(str(path)).quiz_metadata["title"] == "New title"
+        assert len(registry) == 1
+
+    def test_lru_eviction_by_count(self):
+        """The least recently used bank is dropped beyond max_banks"""
+        paths = [self.temp_dir / f"q{i}.py" for i in range(3)]
+        for i, path in enumerate(paths):
+            write_bank(path, f"Course {i}")
+
+        registry = QuestionBankRegistry(max_banks=2)
+        first = registry.get(str(paths[0]))
+        registry.get(str(paths[1]))
+        registry.get(str(paths[0]))  # paths[1] is now least recently used
+        registry.get(str(paths[2]))
+
+        assert len(registry) == 2
+        assert registry.get(str(paths[0])) is first
+        assert registry.misses == 3
+
+    def test_memory_cap(self):
+        """Banks are evicted to stay under max_bytes, always keeping the newest"""
+        small, large = self.temp_dir / "small.py", self.temp_dir / "large.py"
+        write_bank(small, "Small")
+        write_bank(large, "Large", count=300)
+
+        roomy = QuestionBankRegistry()
+        roomy.get(str(small))
+        roomy.get(str(large))
+        assert len(roomy) == 2
+
+        tight = QuestionBankRegistry(max_bytes=1)
+        tight.get(str(small))
+        newest = tight.get(str(large))
+        assert len(tight) == 1
+        assert tight.get(str(large)) is newest
+
+
+class TestPreloadedBank:
+    """Test passing a QuestionBank to QuizGenerator"""
+
+    def test_generator_uses_preloaded_bank(self):
+        """A preloaded bank is used without touching any questions file"""
+        bank = QuestionBank(
+            mcq=[{"question": "Preloaded?", "options": ["yes", "no"], "answer": "yes", "marks": 2}],
+            subjective=[],
+            quiz_metadata={"title": "Preloaded"}
+        )
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with patch.object(QuizGenerator, '_load_questions') as load:
+                generator = QuizGenerator(output_dir=temp_dir, question_bank=bank)
+            load.assert_not_called()
+
+        assert generator.mcq is bank.mcq
+        assert generator.quiz_metadata["title"] == "Preloaded"
+
+    def test_from_file_rejects_unsupported_format(self):
+        """Files in formats without a loader are rejected"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "questions.txt"
+            path.write_text("mcq: []")
+            with pytest.raises(ValueError):
+                QuestionBank.from_file(str(path))
+
+
+MCQ = [{"question": "What is $2+2$?", "options": ["3", "4"], "answer": "4", "marks": 1}]
+SUBJECTIVE = [{"question": "Explain caching", "answer": "It avoids work", "marks": 5}]
+
+
+class TestQuestionFileFormats:
+    """Test loading banks from every supported question file format"""
+
+    def setup_method(self):
+        """Setup for each test method"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+
+    def teardown_method(self):
+        """Cleanup after each test method"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    @pytest.mark.parametrize("suffix", ['.py', '.yaml', '.json', '.csv'])
+    def test_formats_load_to_same_representation(self, suffix):
+        """Every format yields the same mcq and subjective lists"""
+        path = self.temp_dir / f"questions{suffix}"
+        assert QuestionFormatConverter.save_questions(MCQ, SUBJECTIVE, str(path))
+
+        bank = QuestionBank.from_file(str(path), use_cache=False)
+        assert bank.mcq == MCQ
+        assert bank.subjective == SUBJECTIVE
+        assert bank.quiz_metadata == {}
+
+    def test_markdown(self):
+        """Markdown files load into the same representation"""
+        path = self.temp_dir / "questions.md"
+        path.write_text("## MCQ\n\n**What is $2+2$?**\n- 3\n- 4\n*Answer:* 4\n")
+
+        bank = QuestionBank.from_file(str(path), use_cache=False)
+        assert bank.mcq == MCQ
+        assert bank.subjective == []
+        assert bank.quiz_metadata == {}
+
+    def test_yaml_and_json_metadata(self):
+        """quiz_metadata is read from YAML and JSON files"""
+        yaml_path = self.temp_dir / "questions.yaml"
+        yaml_path.write_text("quiz_metadata:\n  title: YAML Quiz\nmultiple_choice: []\n")
+        json_path = self.temp_dir / "questions.json"
+        json_path.write_text('{"quiz_metadata": {"title": "JSON Quiz"}, "mcq": []}')
+
+        assert QuestionBank.from_file(str(yaml_path)).quiz_metadata == {"title": "YAML Quiz"}
+        json_bank = QuestionBank.from_file(str(json_path))
+        assert json_bank.quiz_metadata == {"title": "JSON Quiz"}
+        assert json_bank.subjective == []
+
+    def test_json_without_orjson(self):
+        """The standard library parser is used when orjson is not installed"""
+        path = self.temp_dir / "questions.json"
+        QuestionFormatConverter.save_questions(MCQ, SUBJECTIVE, str(path))
+        with patch.object(formats, 'orjson', None):
+            assert QuestionFormatConverter.load_bank(path)['mcq'] == MCQ
+
+    @pytest.mark.skipif(not yaml.__with_libyaml__, reason="PyYAML built without libyaml")
+    def test_yaml_backends_write_identical_files(self):
+        """The libyaml and pure-Python dumpers produce the same file"""
+        mcq = MCQ + [{"question": r"Long \textbf{é} " * 30, "options": ["yes", "null", "a: b", 1],
+                      "answer": "yes", "marks": 2}]
+        paths = []
+        for dumper in (yaml.CSafeDumper, yaml.SafeDumper):
+            path = self.temp_dir / f"{dumper.__name__}.yaml"
+            with patch.object(formats, 'YamlDumper', dumper):
+                assert QuestionFormatConverter.save_questions(mcq, SUBJECTIVE, str(path))
+            paths.append(path)
+
+        assert paths[0].read_bytes() == paths[1].read_bytes()
+        with patch.object(formats, 'YamlLoader', yaml.SafeLoader):
+            assert QuestionFormatConverter.load_bank(paths[0])['mcq'] == mcq
+
+    def test_non_mapping_rejected(self):
+        """A YAML document that is not a mapping is not a question bank"""
+        path = self.temp_dir / "questions.yaml"
+        path.write_text("- just\n- a list\n")
+        with pytest.raises(ValueError):
+            QuestionFormatConverter.load_bank(path)
+
+    def test_generator_loads_yaml(self):
+        """QuizGenerator accepts YAML question files"""
+        path = self.temp_dir / "questions.yaml"
+        QuestionFormatConverter.save_questions(MCQ, SUBJECTIVE, str(path))
+
+        generator = QuizGenerator(output_dir=str(self.temp_dir / "output"), questions_file=str(path))
+        assert generator.mcq == MCQ
+        assert generator.subjective == SUBJECTIVE
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
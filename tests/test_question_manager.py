@@ -6,9 +6,10 @@ Comprehensive tests for QuestionManager class
 import pytest
 import tempfile
 import os
+import json
 from pathlib import Path
 
-from setwise.question_manager import QuestionManager
+from setwise.question_manager import QuestionManager, ValidationReport
 
 
 class TestQuestionManagerInitialization:
@@ -438,5 +439,97 @@ subjective = [
             assert len(selected_subj) == 1
 
 
+class TestQuestionStats:
+    """Test statistics computed from loaded questions"""
+    
+    def test_stats_from_json_bank(self):
+        """Counts and marks come from the loaded questions"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "questions.json")
+            with open(path, 'w') as f:
+                json.dump({"mcq": [{"question": "Q?", "options": ["A", "B"], "answer": "A", "marks": 2},
+                                   {"question": "R?", "options": ["A", "B"], "answer": "B"}],
+                           "subjective": [{"template": "{{ x }}", "variables": [{"x": 1}], "marks": 4}]}, f)
+            
+            stats = QuestionManager.get_question_stats(path)
+            
+            assert "error" not in stats
+            assert (stats["mcq_count"], stats["total_mcq_marks"]) == (2, 3)
+            assert (stats["subjective_count"], stats["total_subjective_marks"]) == (1, 4)
+            assert stats["templated_subjective"] == 1
+            assert (stats["total_questions"], stats["total_marks"]) == (3, 7)
+    
+    def test_stats_honour_allow_exec(self):
+        """Computed Python banks need allow_exec"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "questions.py")
+            with open(path, 'w') as f:
+                f.write("mcq = []\nsubjective = [dict(question=f'Q{i}', answer='A') for i in range(3)]\n")
+            
+            assert "allow_exec" in QuestionManager.get_question_stats(path)["error"]
+            stats = QuestionManager.get_question_stats(path, allow_exec=True)
+            assert (stats["subjective_count"], stats["total_marks"]) == (3, 15)
+
+
+class TestValidationReport:
+    """Test collecting every validation error into a ValidationReport"""
+    
+    def write_bank(self, directory, mcq, subjective=()):
+        path = os.path.join(directory, "questions.json")
+        with open(path, 'w') as f:
+            json.dump({"mcq": list(mcq), "subjective": list(subjective)}, f)
+        return path
+    
+    def make_mcq(self, i, valid=True):
+        return {"question": f"Question {i}?", "options": ["A", "B"],
+                "answer": "A" if valid else "C", "marks": 1}
+    
+    def test_collects_all_errors_with_indices(self):
+        """Every invalid question is reported, not just the first"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            mcq = [self.make_mcq(i, valid=i % 3 != 1) for i in range(7)]
+            path = self.write_bank(temp_dir, mcq, [{"answer": "no question"}])
+            
+            report = QuestionManager.validate_questions_report(path, jobs=1)
+            
+            assert isinstance(report, ValidationReport)
+            assert not report.is_valid
+            assert (report.mcq_count, report.subjective_count) == (7, 1)
+            assert [(e['section'], e['index']) for e in report.errors] == [
+                ('mcq', 1), ('mcq', 4), ('subjective', 0)]
+            assert report.errors[0]['message'] == "MCQ question 2 answer must be one of the options"
+            assert report.to_dict()['valid'] is False
+    
+    def test_parallel_matches_serial(self):
+        """Chunks validated across processes give the same report in order"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            mcq = [self.make_mcq(i, valid=i % 7 != 0) for i in range(50)]
+            path = self.write_bank(temp_dir, mcq, [{"question": "Why?", "answer": "x^2 "}] * 5)
+            
+            serial = QuestionManager.validate_questions_report(path, jobs=1)
+            parallel = QuestionManager.validate_questions_report(path, jobs=2, chunk_size=8)
+            
+            assert len(serial.errors) == 13
+            assert parallel.to_dict() == serial.to_dict()
+    
+    def test_validate_questions_file_stops_at_first_error(self):
+        """The (bool, message) API keeps its fail-fast behaviour"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = self.write_bank(temp_dir, [self.make_mcq(0), self.make_mcq(1, valid=False)])
+            assert QuestionManager.validate_questions_file(path) == (
+                False, "MCQ question 2 answer must be one of the options")
+            
+            path = self.write_bank(temp_dir, [self.make_mcq(0)])
+            assert QuestionManager.validate_questions_file(path) == (
+                True, "Valid questions file with 1 MCQ and 0 subjective questions")
+    
+    def test_file_errors(self):
+        """Problems with the file itself are reported separately from question errors"""
+        report = QuestionManager.validate_questions_report("/path/that/does/not/exist.json")
+        assert not report.is_valid
+        assert report.errors == []
+        assert report.message == "File not found: /path/that/does/not/exist.json"
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
@@ -4,13 +4,16 @@ Comprehensive tests for QuizGenerator class
 """
 
 import pytest
+import asyncio
 import tempfile
 import os
+import sys
+import time
 import shutil
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
-from setwise.quiz_generator import QuizGenerator
+from setwise.quiz_generator import QuizGenerator, _compile_question_template
 
 
 class TestQuizGeneratorInitialization:
@@ -183,7 +186,7 @@ class TestLatexCompilation:
             result = generator.compile_latex(missing_file, Path(temp_dir))
             assert result is False
     
-    @patch('subprocess.run')
+    @patch('setwise.quiz_generator._run_latex')
     def test_compile_latex_success(self, mock_run):
         """Test successful LaTeX compilation"""
         mock_run.return_value.returncode = 0
@@ -197,7 +200,7 @@ class TestLatexCompilation:
             assert result is True
             mock_run.assert_called_once()
     
-    @patch('subprocess.run')
+    @patch('setwise.quiz_generator._run_latex')
     def test_compile_latex_failure(self, mock_run):
         """Test failed LaTeX compilation"""
         mock_run.return_value.returncode = 1
@@ -209,6 +212,43 @@ class TestLatexCompilation:
             
             result = generator.compile_latex(tex_file, Path(temp_dir))
             assert result is False
+    
+    def test_compile_latex_reruns_when_aux_changes(self):
+        """A second pass runs when cross-reference data appears in the .aux file"""
+        generator = QuizGenerator()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            tex_file = Path(temp_dir) / "test.tex"
+            tex_file.write_text("\\documentclass{article}\\begin{document}\\label{a}\\end{document}")
+            aux_file = Path(temp_dir) / "test.aux"
+            
+            def fake_run(*args, **kwargs):
+                aux_file.write_text("\\relax\n\\newlabel{a}{{1}{1}}\n")
+                return MagicMock(returncode=0)
+            
+            with patch('setwise.quiz_generator._run_latex', side_effect=fake_run) as mock_run:
+                assert generator.compile_latex(tex_file, Path(temp_dir)) is True
+                assert mock_run.call_count == 2
+                
+                # Unchanged references on a rebuild need only one pass
+                mock_run.reset_mock()
+                assert generator.compile_latex(tex_file, Path(temp_dir), max_passes=3) is True
+                assert mock_run.call_count == 1
+    
+    def test_compile_latex_reruns_when_log_requests_it(self):
+        """A rerun request in the log triggers another pass up to max_passes"""
+        generator = QuizGenerator()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            tex_file = Path(temp_dir) / "test.tex"
+            tex_file.write_text("content")
+            log_file = Path(temp_dir) / "test.log"
+            
+            def fake_run(*args, **kwargs):
+                log_file.write_text("LaTeX Warning: Label(s) may have changed. Rerun to get cross-references right.")
+                return MagicMock(returncode=0)
+            
+            with patch('setwise.quiz_generator._run_latex', side_effect=fake_run) as mock_run:
+                assert generator.compile_latex(tex_file, Path(temp_dir), max_passes=3) is True
+                assert mock_run.call_count == 3
 
 
 class TestErrorHandling:
@@ -363,5 +403,487 @@ subjective = [
                 assert len(content) > 50  # Should have actual answers
 
 
+@pytest.mark.usefixtures("quiz_workspace")
+class TestParallelCompilation:
+    """Test the parallel PDF compilation stage"""
+    
+    def test_parallel_jobs_use_isolated_build_dirs(self):
+        """Each set compiles in its own directory and PDFs land in output_dir"""
+        build_dirs = []
+        
+        def fake_compile(tex_file_path, output_dir, *args):
+            build_dirs.append(Path(output_dir))
+            (Path(output_dir) / f"{tex_file_path.stem}.pdf").write_bytes(b"%PDF")
+            return True
+        
+        generator = QuizGenerator(template_dir=self.template_dir, output_dir=self.output_dir)
+        with patch.object(generator, 'compile_latex', side_effect=fake_compile):
+            result = generator.generate_quizzes(num_sets=4, template_name="minimal", jobs=3)
+        
+        assert result is True
+        assert len(set(build_dirs)) == 4
+        assert all(d != Path(self.output_dir) and not d.exists() for d in build_dirs)
+        pdfs = sorted(p.name for p in Path(self.output_dir).glob("*.pdf"))
+        assert pdfs == [f"quiz_set_{i}.pdf" for i in range(1, 5)]
+    
+    def test_parallel_failure_is_reported(self):
+        """A failing set makes the whole run unsuccessful"""
+        def fake_compile(tex_file_path, output_dir, *args):
+            return tex_file_path.stem != "quiz_set_2"
+        
+        generator = QuizGenerator(template_dir=self.template_dir, output_dir=self.output_dir)
+        with patch.object(generator, 'compile_latex', side_effect=fake_compile):
+            result = generator.generate_quizzes(num_sets=3, template_name="minimal", jobs=2)
+        
+        assert result is False
+
+
+
+@pytest.mark.usefixtures("quiz_workspace")
+class TestStreamingGeneration:
+    """Test the iter_quiz_sets streaming API"""
+    
+    def test_yields_each_set_and_calls_sink(self):
+        """Every set is yielded with its content and passed to the sink"""
+        generator = QuizGenerator(template_dir=self.template_dir, output_dir=self.output_dir)
+        received = []
+        
+        results = list(generator.iter_quiz_sets(
+            num_sets=3, template_name="minimal", compile_pdf=False,
+            sink=lambda *result: received.append(result)
+        ))
+        
+        assert [r[0] for r in results] == [1, 2, 3]
+        assert received == results
+        for set_id, tex, answer_key, pdf_path in results:
+            assert "Set " + str(set_id) in tex
+            assert pdf_path is None
+            assert (Path(self.output_dir) / f"answer_key_{set_id}.txt").read_text() == answer_key
+    
+    def test_sets_are_produced_lazily(self):
+        """Later sets are not generated until the caller asks for them"""
+        generator = QuizGenerator(template_dir=self.template_dir, output_dir=self.output_dir)
+        iterator = generator.iter_quiz_sets(num_sets=3, template_name="minimal", compile_pdf=False)
+        
+        first = next(iterator)
+        assert first[0] == 1
+        assert not (Path(self.output_dir) / "quiz_set_2.tex").exists()
+        iterator.close()
+    
+    def test_parallel_compile_yields_pdf_paths(self):
+        """With several jobs, compiled sets are yielded with their PDF paths"""
+        def fake_compile(tex_file_path, output_dir, *args):
+            (Path(output_dir) / f"{tex_file_path.stem}.pdf").write_bytes(b"%PDF")
+            return tex_file_path.stem != "quiz_set_2"
+        
+        generator = QuizGenerator(template_dir=self.template_dir, output_dir=self.output_dir)
+        with patch.object(generator, 'compile_latex', side_effect=fake_compile):
+            results = list(generator.iter_quiz_sets(num_sets=3, template_name="minimal",
+                                                    jobs=2, use_cache=False))
+        
+        pdfs = {set_id: pdf_path for set_id, _, _, pdf_path in results}
+        assert sorted(pdfs) == [1, 2, 3]
+        assert pdfs[2] is None
+        assert pdfs[1] == Path(self.output_dir) / "quiz_set_1.pdf"
+
+
+
+FAKE_PDFLATEX = """#!{python}
+import os, sys, time
+args = sys.argv[1:]
+out_dir = next(a.split('=', 1)[1] for a in args if a.startswith('-output-directory='))
+stem = os.path.splitext(os.path.basename(args[-1]))[0]
+with open(os.path.join({log_dir!r}, 'runs.log'), 'a') as f:
+    f.write('%s start %f\\n' % (os.getpid(), time.time()))
+time.sleep(float(os.environ.get('FAKE_PDFLATEX_SLEEP', '0')))
+open(os.path.join(out_dir, stem + '.pdf'), 'wb').write(b'%PDF')
+with open(os.path.join({log_dir!r}, 'runs.log'), 'a') as f:
+    f.write('%s end %f\\n' % (os.getpid(), time.time()))
+"""
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="stand-in pdflatex is a POSIX script")
+class TestAsyncGeneration:
+    """Test the asyncio generation engine against a stand-in pdflatex"""
+    
+    @pytest.fixture(autouse=True)
+    def fake_pdflatex(self, quiz_workspace):
+        """Put the stand-in pdflatex first on PATH"""
+        self.bin_dir = os.path.join(self.temp_dir, "bin")
+        os.makedirs(self.bin_dir, exist_ok=True)
+        fake = Path(self.bin_dir) / "pdflatex"
+        fake.write_text(FAKE_PDFLATEX.format(python=sys.executable, log_dir=self.temp_dir))
+        fake.chmod(0o755)
+        with patch.dict(os.environ, {"PATH": self.bin_dir + os.pathsep + os.environ["PATH"]}):
+            yield
+    
+    def _runs(self):
+        """Return (pid, event, timestamp) tuples logged by the fake pdflatex"""
+        log = Path(self.temp_dir) / "runs.log"
+        if not log.exists():
+            return []
+        return [(int(pid), event, float(ts))
+                for pid, event, ts in (line.split() for line in log.read_text().splitlines())]
+    
+    def test_generates_pdfs_and_reports_progress(self):
+        """Every set is compiled and progress events are reported"""
+        generator = QuizGenerator(template_dir=self.template_dir, output_dir=self.output_dir)
+        events = []
+        
+        result = asyncio.run(generator.async_generate_quizzes(
+            num_sets=3, template_name="minimal", jobs=2, use_cache=False,
+            progress=events.append
+        ))
+        
+        assert result is True
+        pdfs = sorted(p.name for p in Path(self.output_dir).glob("*.pdf"))
+        assert pdfs == [f"quiz_set_{i}.pdf" for i in range(1, 4)]
+        compiled = [e for e in events if e['event'] == 'compiled']
+        assert sorted(e['set_id'] for e in compiled) == [1, 2, 3]
+        assert compiled[-1]['completed'] == 3 and compiled[-1]['total'] == 3
+    
+    def test_concurrency_is_bounded(self):
+        """No more than `jobs` pdflatex processes run at once"""
+        generator = QuizGenerator(template_dir=self.template_dir, output_dir=self.output_dir)
+        with patch.dict(os.environ, {"FAKE_PDFLATEX_SLEEP": "0.3"}):
+            assert asyncio.run(generator.async_generate_quizzes(
+                num_sets=4, template_name="minimal", jobs=2, use_cache=False
+            )) is True
+        
+        running = peak = 0
+        for _, event, _ in sorted(self._runs(), key=lambda run: run[2]):
+            running += 1 if event == 'start' else -1
+            peak = max(peak, running)
+        assert peak == 2
+    
+    def test_timeout_fails_the_set(self):
+        """A LaTeX run exceeding the timeout is killed and reported as failed"""
+        generator = QuizGenerator(template_dir=self.template_dir, output_dir=self.output_dir)
+        start = time.monotonic()
+        with patch.dict(os.environ, {"FAKE_PDFLATEX_SLEEP": "30"}):
+            result = asyncio.run(generator.async_generate_quizzes(
+                num_sets=1, template_name="minimal", use_cache=False, timeout=0.5
+            ))
+        
+        assert result is False
+        assert time.monotonic() - start < 10
+        assert not (Path(self.output_dir) / "quiz_set_1.pdf").exists()
+    
+    def test_cancellation_kills_pdflatex(self):
+        """Cancelling the generation task terminates running LaTeX processes"""
+        generator = QuizGenerator(template_dir=self.template_dir, output_dir=self.output_dir)
+        
+        async def run_and_cancel():
+            task = asyncio.ensure_future(generator.async_generate_quizzes(
+                num_sets=2, template_name="minimal", jobs=2, use_cache=False
+            ))
+            while len(self._runs()) < 2:
+                await asyncio.sleep(0.05)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+        
+        with patch.dict(os.environ, {"FAKE_PDFLATEX_SLEEP": "30"}):
+            asyncio.run(run_and_cancel())
+        
+        for pid, _, _ in self._runs():
+            with pytest.raises(ProcessLookupError):
+                os.kill(pid, 0)
+
+
+
+HANGING_PDFLATEX = """#!{python}
+import os, subprocess, sys, time
+child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])
+with open(os.path.join({log_dir!r}, 'pids'), 'w') as f:
+    f.write('%d %d' % (os.getpid(), child.pid))
+time.sleep(60)
+"""
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="stand-in pdflatex is a POSIX script")
+class TestLatexLimits:
+    """Test non-interactive mode, timeouts and resource limits for pdflatex"""
+    
+    def setup_method(self):
+        """Setup for each test method"""
+        self.temp_dir = tempfile.mkdtemp()
+        bin_dir = os.path.join(self.temp_dir, "bin")
+        os.makedirs(bin_dir)
+        fake = Path(bin_dir) / "pdflatex"
+        fake.write_text(HANGING_PDFLATEX.format(python=sys.executable, log_dir=self.temp_dir))
+        fake.chmod(0o755)
+        self.env = patch.dict(os.environ, {"PATH": bin_dir + os.pathsep + os.environ["PATH"]})
+        self.env.start()
+        
+        self.tex_file = Path(self.temp_dir) / "test.tex"
+        self.tex_file.write_text("\\documentclass{article}\\begin{document}\\input{}\\end{document}")
+    
+    def teardown_method(self):
+        """Cleanup after each test method"""
+        self.env.stop()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_runs_nonstop_and_halts_on_error(self):
+        """pdflatex never waits for input and stops at the first error"""
+        generator = QuizGenerator(output_dir=self.temp_dir)
+        with patch('setwise.quiz_generator._run_latex') as mock_run:
+            mock_run.return_value.returncode = 0
+            generator.compile_latex(self.tex_file, Path(self.temp_dir))
+        
+        command = mock_run.call_args[0][0]
+        assert '-interaction=nonstopmode' in command
+        assert '-halt-on-error' in command
+        assert mock_run.call_args[0][1:] == (pytest.approx(generator.latex_timeout, abs=1),
+                                             generator.latex_memory_limit_mb)
+    
+    def test_timeout_kills_process_group(self):
+        """A hanging compile is abandoned and everything it started is killed"""
+        generator = QuizGenerator(output_dir=self.temp_dir, latex_timeout=1)
+        start = time.monotonic()
+        assert generator.compile_latex(self.tex_file, Path(self.temp_dir)) is False
+        assert time.monotonic() - start < 10
+        
+        for pid in map(int, (Path(self.temp_dir) / "pids").read_text().split()):
+            deadline = time.monotonic() + 5
+            while time.monotonic() < deadline:
+                try:
+                    os.kill(pid, 0)
+                except ProcessLookupError:
+                    break
+                # The grandchild is reaped by init once it dies
+                time.sleep(0.05)
+            else:
+                pytest.fail(f"process {pid} still running")
+    
+    def test_memory_limit_applied(self):
+        """The address-space limit is set in the LaTeX process"""
+        from setwise.quiz_generator import _run_latex
+        
+        pytest.importorskip("resource")
+        result = _run_latex([sys.executable, '-c',
+                             'import resource; print(resource.getrlimit(resource.RLIMIT_AS)[0])'],
+                            timeout=30, memory_limit_mb=4096)
+        assert int(result.stdout) == 4096 * 1024 * 1024
+    
+    def test_memory_limit_set_without_preexec_fn(self):
+        """The limit is applied after spawning, which is safe from worker threads"""
+        from setwise.quiz_generator import _run_latex
+        
+        with patch('setwise.quiz_generator.subprocess.Popen') as mock_popen, \
+                patch('setwise.quiz_generator._limit_memory') as mock_limit:
+            mock_popen.return_value.pid = 4321
+            mock_popen.return_value.communicate.return_value = ("", "")
+            _run_latex(['pdflatex', 'test.tex'], timeout=30, memory_limit_mb=512)
+        
+        assert 'preexec_fn' not in mock_popen.call_args[1]
+        mock_limit.assert_called_once_with(4321, 512)
+
+
+@pytest.mark.usefixtures("quiz_workspace")
+class TestTemplateCache:
+    """Test caching of compiled LaTeX templates"""
+    
+    def test_template_compiled_once_across_sets(self):
+        """Repeated sets reuse the same compiled template"""
+        generator = QuizGenerator(template_dir=self.template_dir, output_dir=self.output_dir)
+        env = generator._get_jinja_env()
+        with patch.object(env, 'get_template', wraps=env.get_template) as get_template:
+            for set_id in range(1, 4):
+                generator.generate_quiz_set(set_id, template_name="minimal")
+        
+        assert get_template.call_count == 1
+    
+    def test_template_reloaded_when_file_changes(self):
+        """Editing the template on disk invalidates the cached version"""
+        generator = QuizGenerator(template_dir=self.template_dir, output_dir=self.output_dir)
+        generator.generate_quiz_set(1, template_name="minimal")
+        
+        template_path = Path(self.template_dir) / "quiz_template_minimal.tex.jinja"
+        template_path.write_text("Edited set {{ set_id }}")
+        stat = template_path.stat()
+        os.utime(template_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        
+        content, _ = generator.generate_quiz_set(2, template_name="minimal")
+        assert content == "Edited set 2"
+        assert len(generator._template_cache) == 1
+    
+    def test_bytecode_cache_written(self):
+        """Bytecode cache directory is populated when configured"""
+        cache_dir = os.path.join(self.temp_dir, "jinja_cache")
+        generator = QuizGenerator(template_dir=self.template_dir, output_dir=self.output_dir,
+                                  template_cache_dir=cache_dir)
+        generator.generate_quiz_set(1, template_name="minimal")
+        
+        assert len(os.listdir(cache_dir)) == 1
+    
+    def test_question_templates_compiled_once(self):
+        """Templated questions are compiled once and only rendered per set"""
+        generator = QuizGenerator(template_dir=self.template_dir, output_dir=self.output_dir)
+        questions = [{
+            "template": "What is {{ a }} + {{ b }}?",
+            "options": ["{{ a + b }}", "{{ a - b }}"],
+            "answer": "{{ a + b }}",
+            "variables": [{"a": 1, "b": 2}, {"a": 3, "b": 4}]
+        }]
+        
+        _compile_question_template.cache_clear()
+        for _ in range(5):
+            processed = generator.process_templated_questions(questions)
+        
+        info = _compile_question_template.cache_info()
+        assert info.misses == 3
+        assert processed[0]["answer"] in processed[0]["options"]
+
+
+@pytest.mark.usefixtures("quiz_workspace")
+class TestPreambleFormat:
+    """Test compiling sets against a precompiled preamble format"""
+    
+    templates = "*.tex.jinja"
+    
+    @pytest.mark.parametrize("template_name", ["compact", "academic", "minimal"])
+    def test_preamble_identical_across_sets(self, template_name):
+        """Set-specific content stays out of the template preamble"""
+        generator = QuizGenerator(template_dir=self.template_dir, output_dir=self.output_dir)
+        first, _ = generator.generate_quiz_set(1, template_name=template_name)
+        second, _ = generator.generate_quiz_set(2, template_name=template_name)
+        
+        assert generator._split_preamble(first)[0] == generator._split_preamble(second)[0]
+    
+    def test_format_built_once_and_used_for_every_set(self):
+        """One format is dumped and each set compiles only its body against it"""
+        commands = []
+        
+        def fake_run(command, *args, **kwargs):
+            commands.append([str(arg) for arg in command])
+            if '-ini' in command:
+                fmt_dir = Path(self.output_dir) / ".setwise_fmt"
+                jobname = next(a for a in command if str(a).startswith('-jobname='))
+                (fmt_dir / f"{jobname.split('=', 1)[1]}.fmt").write_bytes(b"fmt")
+            return MagicMock(returncode=0)
+        
+        generator = QuizGenerator(template_dir=self.template_dir, output_dir=self.output_dir)
+        with patch('setwise.quiz_generator._run_latex', side_effect=fake_run):
+            result = generator.generate_quizzes(num_sets=3, template_name="minimal",
+                                                precompile_preamble=True)
+        
+        assert result is True
+        ini_runs = [c for c in commands if '-ini' in c]
+        set_runs = [c for c in commands if '-ini' not in c]
+        assert len(ini_runs) == 1
+        assert len(set_runs) == 3
+        assert all(any(a.startswith('-fmt=') for a in c) for c in set_runs)
+        assert all(c[-1].endswith('.body.tex') for c in set_runs)
+        assert not list(Path(self.output_dir).glob("*.body.tex"))
+    
+    def test_falls_back_when_format_cannot_be_built(self):
+        """Sets still compile normally if the format dump fails"""
+        commands = []
+        
+        def fake_run(command, *args, **kwargs):
+            commands.append([str(arg) for arg in command])
+            return MagicMock(returncode=1 if '-ini' in command else 0)
+        
+        generator = QuizGenerator(template_dir=self.template_dir, output_dir=self.output_dir)
+        with patch('setwise.quiz_generator._run_latex', side_effect=fake_run):
+            result = generator.generate_quizzes(num_sets=2, template_name="minimal",
+                                                precompile_preamble=True)
+        
+        assert result is True
+        set_runs = [c for c in commands if '-ini' not in c]
+        assert len(set_runs) == 2
+        assert not any(a.startswith('-fmt=') for c in set_runs for a in c)
+    
+    def test_failing_format_is_discarded_and_set_recompiled(self):
+        """A format that no longer loads is deleted and the sets compile in full"""
+        commands = []
+        fmt_dir = Path(self.output_dir) / ".setwise_fmt"
+        
+        def fake_run(command, *args, **kwargs):
+            command = [str(arg) for arg in command]
+            commands.append(command)
+            if '-ini' in command:
+                jobname = next(a for a in command if a.startswith('-jobname='))
+                (fmt_dir / f"{jobname.split('=', 1)[1]}.fmt").write_bytes(b"fmt")
+            # Like a format dumped by an older TeX installation
+            return MagicMock(returncode=1 if any(a.startswith('-fmt=') for a in command) else 0)
+        
+        generator = QuizGenerator(template_dir=self.template_dir, output_dir=self.output_dir)
+        with patch('setwise.quiz_generator._run_latex', side_effect=fake_run):
+            result = generator.generate_quizzes(num_sets=2, template_name="minimal",
+                                                precompile_preamble=True, use_cache=False)
+        
+        assert result is True
+        assert not list(fmt_dir.glob("*.fmt"))
+        set_runs = [c for c in commands if '-ini' not in c]
+        assert [any(a.startswith('-fmt=') for a in c) for c in set_runs] == [True, False, False]
+        assert [c[-1].endswith('.body.tex') for c in set_runs] == [True, False, False]
+    
+    def test_format_key_includes_engine_version(self):
+        """Upgrading the TeX installation builds a new format"""
+        generator = QuizGenerator(template_dir=self.template_dir, output_dir=self.output_dir)
+        with patch('setwise.quiz_generator._run_latex') as mock_run, \
+                patch('setwise.quiz_generator.engine_version', side_effect=["pdfTeX 3.14 (TeX Live 2022)",
+                                                                             "pdfTeX 3.14 (TeX Live 2024)"]):
+            mock_run.return_value.returncode = 1
+            generator._build_preamble_format("\\documentclass{article}\n")
+            generator._build_preamble_format("\\documentclass{article}\n")
+        
+        assert mock_run.call_count == 2
+        jobnames = {next(str(a) for a in call[0][0] if str(a).startswith('-jobname='))
+                    for call in mock_run.call_args_list}
+        assert len(jobnames) == 2
+
+
+@pytest.mark.usefixtures("quiz_workspace")
+class TestBundleMode:
+    """Test rendering all sets into a single bundled document"""
+    
+    templates = "*.tex.jinja"
+    
+    @pytest.mark.parametrize("template_name", ["compact", "academic", "minimal"])
+    def test_body_only_render(self, template_name):
+        """Body-only rendering omits the preamble and document environment"""
+        generator = QuizGenerator(template_dir=self.template_dir, output_dir=self.output_dir)
+        body, _ = generator.generate_quiz_set(1, template_name=template_name, body_only=True)
+        
+        assert "\\documentclass" not in body
+        assert "\\begin{document}" not in body
+        assert "\\end{document}" not in body
+        assert "Set 1" in body
+    
+    def test_bundle_without_compilation(self):
+        """All sets end up in one document with per-set page resets"""
+        generator = QuizGenerator(template_dir=self.template_dir, output_dir=self.output_dir)
+        result = generator.generate_quizzes(num_sets=3, template_name="minimal",
+                                            compile_pdf=False, bundle=True)
+        
+        assert result is True
+        bundle = (Path(self.output_dir) / "quiz_bundle.tex").read_text()
+        assert bundle.count("\\documentclass") == 1
+        assert bundle.count("\\begin{document}") == 1
+        assert bundle.count("\\end{document}") == 1
+        assert bundle.count("\\setcounter{page}{1}") == 3
+        assert bundle.index("SETWISE-SET-START 1") < bundle.index("SETWISE-SET-START 3")
+        # Older LaTeX kernels without the shipout counter must not halt on the marker
+        assert bundle.count("\\ifdefined\\ReadonlyShipoutCounter\\typeout{SETWISE-SET-START") == 3
+        assert len(list(Path(self.output_dir).glob("answer_key_*.txt"))) == 3
+        assert not list(Path(self.output_dir).glob("quiz_set_*.tex"))
+    
+    @patch('setwise.quiz_generator._run_latex')
+    def test_bundle_compiles_once(self, mock_run):
+        """The bundle needs a single LaTeX invocation for every set"""
+        mock_run.return_value.returncode = 0
+        
+        generator = QuizGenerator(template_dir=self.template_dir, output_dir=self.output_dir)
+        result = generator.generate_quizzes(num_sets=5, template_name="minimal",
+                                            bundle=True, use_cache=False)
+        
+        assert result is True
+        assert mock_run.call_count == 1
+        assert str(mock_run.call_args[0][0][-1]).endswith("quiz_bundle.tex")
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
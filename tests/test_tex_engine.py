@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Tests for the pluggable TeX engine backends
+"""
+
+import pytest
+import tempfile
+import shutil
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+
+from setwise import tex_engine
+from setwise.tex_engine import ENGINES, available_engines, get_engine
+from setwise.quiz_generator import QuizGenerator
+
+
+@pytest.fixture(autouse=True)
+def fresh_probe():
+    """Each test probes the PATH from scratch"""
+    available_engines.cache_clear()
+    yield
+    available_engines.cache_clear()
+
+
+def fake_which(*installed):
+    """Return a shutil.which replacement that only finds the given programs"""
+    return lambda program: f"/usr/bin/{program}" if program in installed else None
+
+
+class TestEngineSelection:
+    """Test engine lookup and capability probing"""
+
+    def test_probe_runs_once_and_orders_by_speed(self):
+        """Installed engines are probed once and listed fastest first"""
+        with patch.object(tex_engine.shutil, 'which',
+                          side_effect=fake_which('lualatex', 'tectonic', 'pdflatex')) as which:
+            assert available_engines() == ('pdflatex', 'tectonic', 'lualatex')
+            calls = which.call_count
+            available_engines()
+            assert which.call_count == calls
+
+    def test_auto_picks_fastest_installed(self):
+        """'auto' chooses the fastest installed engine, optionally one with format support"""
+        with patch.object(tex_engine.shutil, 'which', side_effect=fake_which('tectonic', 'xelatex')):
+            assert get_engine('auto').name == 'tectonic'
+            assert get_engine('auto', require_format=True).name == 'xelatex'
+
+    def test_auto_without_engines_falls_back_to_default(self):
+        """With nothing installed, 'auto' still returns pdflatex"""
+        with patch.object(tex_engine.shutil, 'which', side_effect=fake_which()):
+            assert get_engine('auto').name == 'pdflatex'
+
+    def test_unknown_engine_rejected(self):
+        """Unknown names raise a helpful ValueError"""
+        with pytest.raises(ValueError, match="Unknown TeX engine"):
+            get_engine('troff')
+
+    def test_extra_args_do_not_modify_shared_engine(self):
+        """Extra flags apply to a copy, not to the registered engine"""
+        engine = get_engine('xelatex', extra_args=['-shell-escape'])
+        assert '-shell-escape' in engine.compile_command(Path('a.tex'), Path('out'))
+        assert ENGINES['xelatex'].extra_args == []
+
+
+class TestEngineCommands:
+    """Test the command lines built for each engine"""
+
+    @pytest.mark.parametrize("name", ['pdflatex', 'xelatex', 'lualatex'])
+    def test_latex_engines_run_nonstop(self, name):
+        """LaTeX engines run non-interactively into the output directory"""
+        command = get_engine(name).compile_command(Path('quiz.tex'), Path('out'))
+        assert command[0] == name
+        assert '-interaction=nonstopmode' in command
+        assert '-output-directory=out' in command
+        assert command[-1] == 'quiz.tex'
+
+    def test_tectonic_command(self):
+        """Tectonic uses its own flags and keeps the log for error reporting"""
+        command = get_engine('tectonic').compile_command(Path('quiz.tex'), Path('out'))
+        assert command[0] == 'tectonic'
+        assert '--keep-logs' in command
+        assert command[-3:] == ['--outdir', 'out', 'quiz.tex']
+
+    def test_format_command_requires_support(self):
+        """Only engines that can load formats can dump them"""
+        command = get_engine('xelatex').format_command(Path('pre.tex'), Path('fmt'), 'pre')
+        assert command[:2] == ['xelatex', '-ini']
+        assert '&xelatex' in command
+        with pytest.raises(ValueError):
+            get_engine('lualatex').format_command(Path('pre.tex'), Path('fmt'), 'pre')
+
+
+class TestGeneratorEngines:
+    """Test that QuizGenerator compiles through the selected engine"""
+
+    def setup_method(self):
+        """Setup for each test method"""
+        self.temp_dir = tempfile.mkdtemp()
+        self.tex_file = Path(self.temp_dir) / "quiz.tex"
+        self.tex_file.write_text("\\documentclass{article}\\begin{document}x\\end{document}")
+
+    def teardown_method(self):
+        """Cleanup after each test method"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_default_engine_is_pdflatex(self):
+        """Existing callers keep compiling with pdflatex"""
+        generator = QuizGenerator(output_dir=self.temp_dir)
+        assert generator.engine.name == 'pdflatex'
+
+    def test_auto_engine_for_precompiled_preambles(self):
+        """require_format makes 'auto' pick an engine that can load a format"""
+        with patch.object(tex_engine.shutil, 'which', side_effect=fake_which('tectonic', 'xelatex')):
+            assert QuizGenerator(output_dir=self.temp_dir, engine='auto').engine.name == 'tectonic'
+            generator = QuizGenerator(output_dir=self.temp_dir, engine='auto', require_format=True)
+        assert generator.engine.name == 'xelatex'
+
+    def test_compile_uses_selected_engine(self):
+        """The chosen engine and its extra flags are used for every run"""
+        generator = QuizGenerator(output_dir=self.temp_dir, engine='xelatex',
+                                  engine_args=['-synctex=1'])
+        with patch('setwise.quiz_generator._run_latex') as mock_run:
+            mock_run.return_value.returncode = 0
+            assert generator.compile_latex(self.tex_file, Path(self.temp_dir)) is True
+
+        command = mock_run.call_args[0][0]
+        assert command[0] == 'xelatex'
+        assert '-synctex=1' in command
+
+    def test_engine_that_reruns_itself_runs_once(self):
+        """Tectonic is invoked once even when the log asks for a rerun"""
+        log_file = Path(self.temp_dir) / "quiz.log"
+
+        def fake_run(*args, **kwargs):
+            log_file.write_text("Rerun to get cross-references right.")
+            return MagicMock(returncode=0)
+
+        generator = QuizGenerator(output_dir=self.temp_dir, engine='tectonic')
+        with patch('setwise.quiz_generator._run_latex', side_effect=fake_run) as mock_run:
+            assert generator.compile_latex(self.tex_file, Path(self.temp_dir), max_passes=3) is True
+            assert mock_run.call_count == 1
+
+    def test_no_format_built_for_engines_without_support(self):
+        """Precompiled preambles are skipped for engines that cannot load them"""
+        generator = QuizGenerator(output_dir=self.temp_dir, engine='lualatex')
+        with patch('setwise.quiz_generator._run_latex') as mock_run:
+            assert generator._build_preamble_format("\\documentclass{article}\n") is None
+            mock_run.assert_not_called()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Tests for the per-question validation cache
+"""
+
+import pytest
+import tempfile
+import json
+import shutil
+from pathlib import Path
+from unittest.mock import patch
+
+from setwise import validation_cache
+from setwise.question_manager import QuestionManager
+from setwise.validation_cache import ValidationCache
+
+
+def make_mcq(i, answer="A"):
+    return {"question": f"Question {i}?", "options": ["A", "B"], "answer": answer, "marks": 1}
+
+
+class TestValidationCache:
+    """Test that only new or changed questions are validated again"""
+
+    def setup_method(self):
+        """Setup for each test method"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.source = self.temp_dir / "questions.json"
+        self.mcq = [make_mcq(i) for i in range(20)]
+        self.subjective = [{"question": "Explain caching", "answer": "It avoids work", "marks": 5}]
+        self._write()
+
+    def teardown_method(self):
+        """Cleanup after each test method"""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _write(self):
+        with open(self.source, 'w') as f:
+            json.dump({"mcq": self.mcq, "subjective": self.subjective}, f)
+
+    def _validate(self, **kwargs):
+        """Validate the bank, returning the report and the questions that were checked"""
+        checked = []
+        find_problem = QuestionManager.find_problem
+
+        def recording_find_problem(section, q):
+            checked.append(q)
+            return find_problem(section, q)
+
+        with patch.object(QuestionManager, 'find_problem', side_effect=recording_find_problem):
+            report = QuestionManager.validate_questions_report(str(self.source), jobs=1, **kwargs)
+        return report, checked
+
+    def test_only_changed_questions_are_validated(self):
+        """A second run checks nothing; an edit checks just the edited question"""
+        first, checked = self._validate()
+        assert first.is_valid
+        assert len(checked) == 21
+        assert ValidationCache.cache_path(self.source).exists()
+
+        _, checked = self._validate()
+        assert checked == []
+
+        self.mcq[3] = make_mcq(3, answer="C")
+        self._write()
+        report, checked = self._validate()
+        assert checked == [self.mcq[3]]
+        assert [e['message'] for e in report.errors] == ["MCQ question 4 answer must be one of the options"]
+
+    def test_cached_errors_keep_question_positions(self):
+        """Cached problems are reported at the question's current index"""
+        self.mcq[0] = make_mcq(0, answer="C")
+        self._write()
+        self._validate()
+
+        self.mcq.insert(0, make_mcq(99))
+        self._write()
+        report, checked = self._validate()
+        assert checked == [self.mcq[0]]
+        assert [(e['index'], e['message']) for e in report.errors] == [
+            (1, "MCQ question 2 answer must be one of the options")]
+
+    def test_matches_uncached_validation(self):
+        """Reports are identical with and without the cache, fail-fast included"""
+        self.mcq[5]['options'] = "A,B"
+        self.subjective.append({"answer": "no question"})
+        self._write()
+
+        uncached, _ = self._validate(use_cache=False)
+        self._validate()
+        cached, checked = self._validate()
+        assert checked == []
+        assert cached.to_dict() == uncached.to_dict()
+        assert len(cached.errors) == 2
+        assert QuestionManager.validate_questions_file(str(self.source)) == (
+            False, "MCQ question 6 'options' must be a list")
+
+    def test_rules_change_discards_cache(self):
+        """Bumping the rules version validates every question again"""
+        self._validate()
+        with patch.object(validation_cache, 'VALIDATION_RULES_VERSION', validation_cache.VALIDATION_RULES_VERSION + 1):
+            _, checked = self._validate()
+        assert len(checked) == 21
+
+    def test_removed_questions_are_pruned(self):
+        """A full run keeps results only for questions still in the bank"""
+        self._validate()
+        del self.mcq[10:]
+        self._write()
+        self._validate()
+        assert len(ValidationCache(self.source).entries) == 11
+
+    def test_corrupt_cache_is_ignored(self):
+        """An unreadable cache file is treated as empty"""
+        self._validate()
+        ValidationCache.cache_path(self.source).write_bytes(b"not a cache file")
+        report, checked = self._validate()
+        assert report.is_valid
+        assert len(checked) == 21
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])